@@ -0,0 +1,110 @@
+"""
+Benchmark: persistent FileIndex lookups vs. the old per-call scandir + fuzzy match.
+
+  python bench_file_index.py                 # 20k files on disk, 1M synthetic entries
+  python bench_file_index.py --disk 50000 --synthetic 0
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rapidfuzz import process, fuzz, utils
+from src.tools.file_index import FileIndex, FILE, FOLDER
+
+WORDS = ["project", "report", "resume", "invoice", "holiday", "photo", "music", "song", "final",
+         "draft", "budget", "notes", "lecture", "assignment", "nepal", "trip", "video", "backup",
+         "meeting", "design", "thesis", "janakpur", "wedding", "tax", "scan", "letter", "movie"]
+EXTS = [".pdf", ".docx", ".mp4", ".mp3", ".jpg", ".xlsx", ".txt", ".pptx"]
+
+
+def random_name(rng: random.Random) -> str:
+    words = rng.sample(WORDS, rng.randint(1, 3))
+    return "_".join(words) + f"_{rng.randint(1, 9999)}" + rng.choice(EXTS)
+
+
+def make_tree(root: str, count: int, rng: random.Random):
+    folders = [os.path.join(root, f"{rng.choice(WORDS)}_{i}") for i in range(max(1, count // 200))]
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+    for i in range(count):
+        # Half at the top level (what the old scan sees), half one level down
+        parent = root if i % 2 else rng.choice(folders)
+        open(os.path.join(parent, random_name(rng)), "w").close()
+
+
+def legacy_lookup(root: str, query: str):
+    """What Play_file did per call: scan the top level, then fuzzy match all names"""
+    index = []
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_file():
+                index.append({"name": entry.name, "path": entry.path, "type": "file"})
+    choices = [item["name"] for item in index]
+    return process.extractOne(query, choices, scorer=fuzz.WRatio, processor=utils.default_process)
+
+
+def timeit(fn, queries, repeat=1):
+    samples = []
+    for _ in range(repeat):
+        for q in queries:
+            start = time.perf_counter()
+            fn(q)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), sorted(samples)[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--disk", type=int, default=20000, help="files created on disk for the scan comparison")
+    parser.add_argument("--synthetic", type=int, default=1_000_000, help="in-memory entries for the lookup test")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    queries = [" ".join(rng.sample(WORDS, rng.randint(1, 2))) for _ in range(args.queries)]
+
+    if args.disk:
+        root = tempfile.mkdtemp(prefix="jarvis_files_")
+        try:
+            make_tree(root, args.disk, rng)
+            index = FileIndex([root], depth=3)
+            started = time.perf_counter()
+            index._scan()
+            build = time.perf_counter() - started
+
+            legacy = timeit(lambda q: legacy_lookup(root, q), queries[:20])
+            indexed = timeit(lambda q: index.search(q, kind=FILE, limit=1), queries, repeat=3)
+            print(f"\n📁 {args.disk} files on disk ({len(index)} indexed, build {build:.2f}s once)")
+            print(f"   per-call scan + match : median {legacy[0]:8.3f} ms   p95 {legacy[1]:8.3f} ms")
+            print(f"   FileIndex.search      : median {indexed[0]:8.3f} ms   p95 {indexed[1]:8.3f} ms")
+            index.close()
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if args.synthetic:
+        index = FileIndex([], depth=3)
+        started = time.perf_counter()
+        batch = []
+        for i in range(args.synthetic):
+            name = random_name(rng)
+            batch.append((f"D:\\data\\{i // 1000}\\{name}", name, FOLDER if i % 20 == 0 else FILE))
+            if len(batch) >= 50000:
+                index.add_many(batch)
+                batch = []
+        index.add_many(batch)
+        build = time.perf_counter() - started
+        indexed = timeit(lambda q: index.search(q, limit=1), queries, repeat=3)
+        print(f"\n🗂️ {len(index)} synthetic entries (insert {build:.1f}s)")
+        print(f"   FileIndex.search      : median {indexed[0]:8.3f} ms   p95 {indexed[1]:8.3f} ms")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
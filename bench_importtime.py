@@ -0,0 +1,77 @@
+"""
+Benchmark: agent cold-start imports, eager (old agent.py) vs. lazy tool registry.
+
+Each case runs in a fresh interpreter under `python -X importtime`:
+
+  eager  - imports every tool module, vision and the Groq client (what agent.py did)
+  lazy   - import src.core.agent (tools are stand-ins; modules load on first call)
+  schema - only the registry building all tool stand-ins from source (no livekit needed)
+
+  python bench_importtime.py --top 8
+
+asyncio (~60 ms) is part of every case: livekit needs it regardless.
+Modules that fail to import (dependency not installed) are listed; their
+partial cost up to the failure is still counted.
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+
+from src.tools.registry import TOOL_MODULES
+
+EAGER_MODULES = list(dict.fromkeys([*TOOL_MODULES.values(), "src.vision.screen_capture", "src.core.groq_client"]))
+
+CASES = {
+    "eager": [f"import {m}" for m in EAGER_MODULES],
+    "lazy": ["import src.core.agent"],
+    "schema": ["from src.tools.registry import TOOL_MODULES, lazy_tools", "lazy_tools(TOOL_MODULES)"],
+}
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_case(statements):
+    # Each statement on its own so one missing dependency doesn't hide the rest
+    code = "\n".join(f"try:\n    {s}\nexcept Exception as e:\n    print('FAILED', {s!r}, repr(e))"
+                     for s in statements)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True)
+    top_level = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match and len(match.group(3)) == 1:  # Indent of 1: imported directly, not a dependency
+            top_level[match.group(4)] = int(match.group(2)) / 1000
+    failures = [line for line in proc.stdout.splitlines() if line.startswith("FAILED")]
+    return top_level, failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level imports to list per case")
+    args = parser.parse_args()
+
+    # Interpreter startup (site, encodings...) shows up in every run: leave it out
+    startup, _ = run_case(["pass"])
+    totals = {}
+    for name, statements in CASES.items():
+        top_level, failures = run_case(statements)
+        top_level = {m: ms for m, ms in top_level.items() if m not in startup}
+        totals[name] = sum(top_level.values())
+        print(f"\n== {name}: {totals[name]:.0f} ms in top-level imports")
+        for module, ms in sorted(top_level.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"   {ms:>8.1f} ms  {module}")
+        for failure in failures:
+            print(f"   ⚠️ {failure}")
+
+    print(f"\n{'case':>8} | {'import ms':>9}")
+    for name, total in totals.items():
+        print(f"{name:>8} | {total:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: old per-char typing loop vs. InputEngine (recording backends, no display needed).
+
+  old: press/release + await asyncio.sleep(0.01) per char (SafeController.type_text before)
+  new: InputEngine.type_text in auto mode (paste above the threshold, one bulk send below)
+
+  python bench_input_engine.py --chars 64 512 2048
+
+The old loop is measured on at most --legacy-chars characters and scaled up,
+so the 2 KB case doesn't take 20+ seconds per run. The paste timing includes
+the clipboard restore delay; the real OS calls are not in either number.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.tools.input_engine import BULK, KEYS, ClipboardBackend, InputEngine, RecordingBackend
+
+
+def sample_text(n: int) -> str:
+    code = "def handler(event):\n\tif event.get('type') == \"click\":\n\t\treturn {'ok': True}  # ✓\n"
+    return (code * (n // len(code) + 1))[:n]
+
+
+async def legacy_type(keyboard: RecordingBackend, text: str):
+    for char in text:
+        if not char.isprintable() and char not in ['\n', '\t', '\r']:
+            continue
+        keyboard.tap(char)
+        await asyncio.sleep(0.01)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chars", nargs="+", type=int, default=[64, 512, 2048])
+    parser.add_argument("--legacy-chars", type=int, default=256)
+    args = parser.parse_args()
+
+    clipboard = {"value": "user clipboard"}
+    keys = RecordingBackend(name=KEYS)
+    bulk = RecordingBackend(name=BULK)
+    engine = InputEngine(
+        keys=keys,
+        bulk=bulk,
+        clipboard=ClipboardBackend(keys, copy=lambda t: clipboard.update(value=t), read=lambda: clipboard["value"]),
+    )
+
+    print(f"{'chars':>6} | {'old ms':>9} | {'new ms':>8} | {'method':>9} | {'speedup':>8}")
+    for n in args.chars:
+        text = sample_text(n)
+        measured = min(n, args.legacy_chars)
+        start = time.perf_counter()
+        await legacy_type(RecordingBackend(), text[:measured])
+        old_ms = (time.perf_counter() - start) * 1000 * n / measured
+
+        start = time.perf_counter()
+        method = await engine.type_text(text)
+        new_ms = (time.perf_counter() - start) * 1000
+        print(f"{n:>6} | {old_ms:>9.0f} | {new_ms:>8.1f} | {method:>9} | {old_ms / new_ms:>7.0f}x")
+
+    assert clipboard["value"] == "user clipboard", "clipboard not restored"
+    assert bulk.typed() == sample_text(args.chars[0]), "bulk text mismatch"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
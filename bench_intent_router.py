@@ -0,0 +1,143 @@
+"""
+Precision / coverage / latency of the local intent router over a labeled corpus.
+
+Each entry is (utterance, expected call). None means the utterance must fall
+through to Groq. "this" resolves to ACTIVE_TITLE, the foreground window the
+agent would pass in. Exits non-zero if any utterance is misrouted.
+
+Usage: python bench_intent_router.py [--threshold 0.9]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.intent_router import route_intent
+
+ACTIVE_TITLE = "notes.txt - Notepad"
+
+CORPUS = [
+    # Open (English / Nepali / Hindi / Devanagari)
+    ("open notepad", 'open_app("Notepad")'),
+    ("Open Chrome please", 'open_app("Chrome")'),
+    ("launch spotify", 'open_app("Spotify")'),
+    ("Notepad kholo", 'open_app("Notepad")'),
+    ("calculator khol na", 'open_app("Calculator")'),
+    ("vs code kholdeu", 'open_app("Vs Code")'),
+    ("chrome kholo jarvis", 'open_app("Chrome")'),
+    ("नोटप्याड खोल", None),
+    ("settings kholo", 'open_app("Settings")'),
+    ("google chrome kholo", 'open_app("Google Chrome")'),
+    ("open youtube", 'open_url("https://www.youtube.com")'),
+    ("facebook kholo", 'open_url("https://www.facebook.com")'),
+    ("open gmail", 'open_url("https://mail.google.com")'),
+    ("open antigravity", None),
+    ("open my projects folder", None),
+    ("open notepad and type hello", None),
+    ("chrome kholo ani youtube ma gana bajau", None),
+    # Close / minimize / maximize
+    ("close notepad", 'close_app("notepad")'),
+    ("Close VLC", 'close_app("VLC")'),
+    ("yo banda gara", 'close_app("notes.txt - Notepad")'),
+    ("close this", 'close_app("notes.txt - Notepad")'),
+    ("chrome banda gara", 'close_app("chrome")'),
+    ("spotify band karo", 'close_app("spotify")'),
+    ("yo gana banda gara", None),
+    ("close the door", None),
+    ("minimize chrome", 'minimize_window("chrome")'),
+    ("hide vs code", 'minimize_window("vs code")'),
+    ("chrome lukau", 'minimize_window("chrome")'),
+    ("minimize this", 'minimize_window("notes.txt - Notepad")'),
+    ("maximize notepad", 'maximize_window("notepad")'),
+    ("minimize antigravity agent", None),
+    # Volume
+    ("volume 50", 'system_control_tool("volume 50")'),
+    ("set volume to 80", 'system_control_tool("volume 80")'),
+    ("volume 100 karo", 'system_control_tool("volume 100")'),
+    ("awaz 30 gara", 'system_control_tool("volume 30")'),
+    ("volume 40 percent", 'system_control_tool("volume 40")'),
+    ("mute", 'system_control_tool("mute")'),
+    ("unmute", 'system_control_tool("unmute")'),
+    ("mute gara", 'system_control_tool("mute")'),
+    ("volume up", 'system_control_tool("volume up")'),
+    ("volume badhau", 'system_control_tool("volume up")'),
+    ("volume kam karo", 'system_control_tool("volume down")'),
+    ("turn down the volume", 'system_control_tool("volume down")'),
+    ("volume 500", None),
+    ("volume thik cha?", None),
+    # YouTube
+    ("play despacito on youtube", 'play_youtube_tool("despacito")'),
+    ("Play funny cats video on YouTube", 'play_youtube_tool("funny cats video")'),
+    ("youtube ma arijit singh ko gana bajau", 'play_youtube_tool("arijit singh ko gana")'),
+    ("youtube par lofi music chalao", 'play_youtube_tool("lofi music")'),
+    ("arijit singh youtube ma bajau", 'play_youtube_tool("arijit singh")'),
+    ("how many subscribers does mrbeast have on youtube", None),
+    ("search cats on youtube", None),
+    ("despacito on youtube", None),
+    ("gana bajau", None),
+    ("play arijit singh", None),
+    # Search / realtime
+    ("search python decorators", 'google_search("python decorators")'),
+    ("google elon musk net worth", 'google_search("elon musk net worth")'),
+    ("bitcoin price search gara", 'google_search("bitcoin price")'),
+    ("google it", None),
+    ("search for that", None),
+    ("google chrome", None),
+    ("google translate", None),
+    ("google maps", None),
+    ("google translate hello in nepali", None),
+    ("elon musk net worth?", None),
+    ("aaj ko mausam kasto cha?", None),
+    ("who won the match", None),
+    # Speed test
+    ("internet speed check gara", 'open_url("https://fast.com")'),
+    ("speed test", 'open_url("https://fast.com")'),
+    # Ambiguous / chat / automation that needs the planner
+    ("code lekha", None),
+    ("type hello world", None),
+    ("what is this error", None),
+    ("tell me a joke", None),
+    ("resume.pdf kholo", None),
+    ("Projects folder banau", None),
+    ("shut down the computer", None),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    routed = correct = 0
+    misroutes = []
+    for utterance, expected in CORPUS:
+        match = route_intent(utterance, ACTIVE_TITLE)
+        got = match.to_call() if match and match.confidence >= args.threshold else None
+        if got is not None:
+            routed += 1
+            if got == expected:
+                correct += 1
+        if got != expected:
+            misroutes.append((utterance, expected, got))
+
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        for utterance, _ in CORPUS:
+            route_intent(utterance, ACTIVE_TITLE)
+    per_call_us = (time.perf_counter() - t0) / (args.repeat * len(CORPUS)) * 1e6
+
+    routable = sum(1 for _, expected in CORPUS if expected is not None)
+    print(f"Corpus: {len(CORPUS)} utterances ({routable} routable)")
+    print(f"Routed locally: {routed}  Precision: {correct / routed if routed else 1:.3f}  "
+          f"Coverage: {correct / routable if routable else 0:.3f}")
+    print(f"Latency: {per_call_us:.1f} µs/utterance (vs ~300-800 ms for a Groq round-trip)")
+    for utterance, expected, got in misroutes:
+        print(f"  ✗ {utterance!r}: expected {expected}, got {got}")
+    sys.exit(1 if misroutes else 0)
+
+
+if __name__ == "__main__":
+    main()
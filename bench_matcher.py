@@ -0,0 +1,77 @@
+"""
+Benchmark: shared RapidFuzz Matcher vs. the old fuzzywuzzy extractOne + second scan.
+
+  python bench_matcher.py --sizes 20 200 2000 50000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.tools.matcher import Matcher
+
+try:
+    from fuzzywuzzy import process as fw_process
+except ImportError:
+    fw_process = None
+
+WORDS = ["visual", "studio", "code", "google", "chrome", "notepad", "untitled", "project", "report",
+         "resume", "final", "music", "youtube", "whatsapp", "telegram", "settings", "explorer",
+         "downloads", "spotify", "discord", "postman", "excel", "budget", "photo", "holiday"]
+
+
+def make_choices(n: int, rng: random.Random):
+    return [" - ".join(" ".join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(2)) + f" {i}"
+            for i in range(n)]
+
+
+def legacy(query, items):
+    """Old tool pattern: build choices, extractOne, then scan again for the item"""
+    choices = [item["name"] for item in items]
+    best, score = fw_process.extractOne(query, choices)
+    for item in items:
+        if item["name"] == best:
+            return item, score
+
+
+def median_ms(fn, queries):
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000, 50000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    queries = [" ".join(rng.sample(WORDS, 2)) for _ in range(args.queries)]
+    if fw_process is None:
+        print("ℹ️ fuzzywuzzy not installed: legacy column skipped")
+
+    print(f"{'choices':>8} | {'fuzzywuzzy':>12} | {'Matcher.best':>12} | {'top-5':>10} | {'build':>8}")
+    for n in args.sizes:
+        choices = make_choices(n, rng)
+        items = [{"name": c, "path": f"/x/{i}"} for i, c in enumerate(choices)]
+
+        start = time.perf_counter()
+        matcher = Matcher(choices)
+        build = (time.perf_counter() - start) * 1000
+
+        old = median_ms(lambda q: legacy(q, items), queries[:10]) if fw_process else float("nan")
+        new = median_ms(lambda q: items[matcher.best(q).index], queries)
+        top = median_ms(lambda q: matcher.extract(q, limit=5, cutoff=60), queries)
+        print(f"{n:>8} | {old:>9.3f} ms | {new:>9.3f} ms | {top:>7.3f} ms | {build:>5.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Recall latency of the semantic memory index at different history sizes.
+
+Usage: python bench_semantic_memory.py [--sizes 10000 100000 1000000] [--dim 384]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.memory.semantic import BruteForceIndex, HashingEmbedder
+
+
+def fill(index, size, dim, batch=50000):
+    rng = np.random.default_rng(0)
+    for start in range(0, size, batch):
+        n = min(batch, size - start)
+        vectors = rng.standard_normal((n, dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index.add(vectors, [{"id": str(start + i)} for i in range(n)])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    embedder = HashingEmbedder(args.dim)
+    t0 = time.perf_counter()
+    for _ in range(100):
+        embedder.embed(["what did I ask about the Nepal weather last week"])
+    print(f"Query embedding (hashing): {(time.perf_counter() - t0) * 10:.3f} ms")
+
+    print(f"{'messages':>10} {'build s':>9} {'p50 ms':>8} {'p95 ms':>8} {'disk MB':>8}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = BruteForceIndex(tmp, args.dim)
+            t0 = time.perf_counter()
+            fill(index, size, args.dim)
+            build = time.perf_counter() - t0
+
+            queries = embedder.embed([f"query number {i}" for i in range(args.queries)])
+            timings = []
+            for q in queries:
+                t0 = time.perf_counter()
+                index.search(q, args.k)
+                timings.append((time.perf_counter() - t0) * 1000)
+            timings.sort()
+            disk = os.path.getsize(index.vectors_path) / 1e6
+            print(f"{size:>10} {build:>9.2f} {timings[len(timings) // 2]:>8.2f} "
+                  f"{timings[int(len(timings) * 0.95) - 1]:>8.2f} {disk:>8.1f}")
+            index._matrix = None  # Release the mapping before the directory is removed
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: time-to-answer for realtime questions, serial vs. speculative search (simulated latencies).
+
+  serial      - transcript -> Gemini "Checking..." + tool call -> Groq plan -> google_search -> answer
+  speculative - same, but the search starts from the transcript (router prediction)
+                and google_search claims the prefetched results
+
+  python bench_speculative.py --gemini 0.8 --planner 0.5 --search 0.7
+
+Each utterance comes with the query the planner would emit for it (phrased
+differently, like Groq does), so the fuzzy claim is exercised too. Utterances
+the router doesn't predict, or whose planner query doesn't match, fall back
+to a normal search and show up as "miss". NEGATIVES are small talk and
+local questions that must never start a (paid, quota-limited) search.
+DIFFERENT_QUESTIONS are (prefetched, planner) query pairs that must never
+share results: same words in another order, or another number.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.speculative import SearchSpeculator, predict_search, same_question
+
+# (utterance, query the planner emits)
+CORPUS = [
+    ("elon musk net worth?", "Elon Musk Net Worth live 2025"),
+    ("bitcoin price today", "bitcoin price today"),
+    ("who won the match", "who won the match today"),
+    ("gold ko bhau kati cha", "gold ko bhau"),
+    ("latest nepal news", "latest news Nepal"),
+    ("search everest height", "everest height"),
+    ("aaj ko mausam kasto cha?", "Weather today in Kathmandu"),
+    ("what is the dollar rate", "USD to NPR rate today"),
+]
+
+NEGATIVES = [
+    "how are you today",
+    "what is the current time",
+    "current volume kati ho",
+    "aaj ko din kasto cha",
+    "remind me what we talked about today",
+    "what is the result of 2+2",
+    "what date is it today",
+    "tell me a joke",
+]
+
+DIFFERENT_QUESTIONS = [
+    ("iphone 15 price", "iphone 16 price"),
+    ("usd to npr", "npr to usd"),
+    ("nepal vs india score", "india vs nepal score"),
+    ("weather 5 days", "weather 10 days"),
+]
+
+
+async def run(utterance: str, planner_query: str, args, speculate: bool):
+    searches = []
+
+    async def search(query):
+        searches.append(query)
+        await asyncio.sleep(args.search)
+        return [{"title": query, "snippet": "..."}]
+
+    speculator = SearchSpeculator(search)
+    start = time.perf_counter()
+    if speculate:
+        speculator.speculate(utterance, source="transcript")
+    await asyncio.sleep(args.gemini)   # "Checking..." + ask_groq_planner call
+    await asyncio.sleep(args.planner)  # Groq decides google_search(planner_query)
+    results = await speculator.take(planner_query) if speculate else None
+    claimed = bool(results)
+    if not claimed:
+        await search(planner_query)
+    return time.perf_counter() - start, claimed, len(searches)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gemini", type=float, default=0.8, help="filler speech until Gemini calls the planner (s)")
+    parser.add_argument("--planner", type=float, default=0.5, help="Groq planner latency (s)")
+    parser.add_argument("--search", type=float, default=0.7, help="search HTTP latency (s)")
+    args = parser.parse_args()
+
+    print(f"{'utterance':>28} | {'serial ms':>9} | {'spec ms':>8} | {'claim':>5} | {'requests':>8}")
+    serial_times, spec_times = [], []
+    for utterance, planner_query in CORPUS:
+        serial, _, _ = await run(utterance, planner_query, args, speculate=False)
+        spec, claimed, requests = await run(utterance, planner_query, args, speculate=True)
+        serial_times.append(serial)
+        spec_times.append(spec)
+        print(f"{utterance:>28} | {serial * 1000:>9.0f} | {spec * 1000:>8.0f} | "
+              f"{'hit' if claimed else 'miss':>5} | {requests:>8}")
+
+    prefetched = [(u, predict_search(u)) for u in NEGATIVES if predict_search(u)]
+    for utterance, query in prefetched:
+        print(f"⚠️ would prefetch '{query}' for small talk: '{utterance}'")
+    print(f"\nnegatives: {len(NEGATIVES) - len(prefetched)}/{len(NEGATIVES)} started no search")
+    shared = [(a, b) for a, b in DIFFERENT_QUESTIONS if same_question(a, b)]
+    for prefetched_query, planner_query in shared:
+        print(f"⚠️ '{planner_query}' would claim results prefetched for '{prefetched_query}'")
+    print(f"different questions: {len(DIFFERENT_QUESTIONS) - len(shared)}/{len(DIFFERENT_QUESTIONS)} kept apart")
+    print(f"median time to search result: serial {statistics.median(serial_times) * 1000:.0f} ms, "
+          f"speculative {statistics.median(spec_times) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Benchmark: time until the session can start, old vs. new startup context (simulated network).
+
+  old: get_system_prompts() -> blocking ipinfo, then get_weather (ipinfo again + OpenWeather), serial
+  new: StartupPipeline -> placeholder from the disk cache right away, async fetches in the background
+
+  python bench_startup.py --latency 0.3
+
+"ready" is when instructions exist and session.start can run; "fresh" is when
+real city/weather are in. "loop lag" is the longest the event loop was blocked.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.startup import DiskTTLCache, StartupPipeline
+
+
+class LagMonitor:
+    """Ticks every 5 ms and records the worst delay (blocking calls on the loop show up here)"""
+
+    def __init__(self):
+        self.worst = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(0.005)
+            self.worst = max(self.worst, time.perf_counter() - before - 0.005)
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+async def legacy_startup(latency: float):
+    time.sleep(latency)            # requests.get("https://ipinfo.io") in get_current_city
+    time.sleep(latency)            # detect_city_by_ip() again inside get_weather
+    time.sleep(latency)            # requests.get(openweathermap) without timeout
+    return "Kathmandu", "Weather in Kathmandu: ..."
+
+
+async def run_legacy(latency: float):
+    with LagMonitor() as lag:
+        await asyncio.sleep(0.01)  # Let the monitor start ticking
+        start = time.perf_counter()
+        await legacy_startup(latency)
+        ready = time.perf_counter() - start
+        await asyncio.sleep(0.01)
+    return ready, ready, lag.worst
+
+
+async def run_new(latency: float, cache: DiskTTLCache):
+    async def fetch_city():
+        await asyncio.sleep(latency)
+        return "Kathmandu"
+
+    async def fetch_weather(city):
+        await asyncio.sleep(latency)
+        return f"Weather in {city}: ..."
+
+    pipeline = StartupPipeline(cache, fetch_city, fetch_weather)
+    with LagMonitor() as lag:
+        await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        pipeline.start()
+        pipeline.placeholder()
+        ready = time.perf_counter() - start
+        info = await pipeline.wait(10)
+        fresh = time.perf_counter() - start
+        assert info.fresh and info.city == "Kathmandu"
+    return ready, fresh, lag.worst
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per simulated HTTP call")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "startup_cache.json")
+        rows = [("old (serial, blocking)", await run_legacy(args.latency))]
+        rows.append(("new, cold cache", await run_new(args.latency, DiskTTLCache(path))))
+        rows.append(("new, warm cache", await run_new(args.latency, DiskTTLCache(path))))
+        # Expire everything: stale city lets weather and city refresh run side by side
+        stale = DiskTTLCache(path)
+        stale._entries = {k: (v, 0) for k, (v, _) in stale._entries.items()}
+        rows.append(("new, stale cache", await run_new(args.latency, stale)))
+
+    print(f"{'startup':>24} | {'ready ms':>9} | {'fresh ms':>9} | {'loop lag ms':>11}")
+    for name, (ready, fresh, lag) in rows:
+        print(f"{name:>24} | {ready * 1000:>9.1f} | {fresh * 1000:>9.1f} | {lag * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
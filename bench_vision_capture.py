@@ -0,0 +1,95 @@
+"""
+Benchmark: old vs. new frame processing for vision (synthetic BGRA frames, no display needed).
+
+  old: Image.frombytes(BGRX) -> LANCZOS thumbnail(1280) -> new BytesIO -> JPEG q85
+  new: FrameEncoder (mapped buffer -> reduce/BOX -> reused BytesIO)
+
+  python bench_vision_capture.py --size 1920x1080 2560x1440 --frames 30
+
+allocs/frame counts Python-visible allocations (tracemalloc: bytes objects,
+numpy arrays); PIL's own image buffers are malloc'd in C and not included.
+"""
+import os
+import io
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from PIL import Image
+from src.vision.screen_capture import FrameEncoder
+
+
+def synthetic_frame(width: int, height: int, seed: int) -> np.ndarray:
+    """Desktop-like frame: flat panels, a gradient and some 'text' noise"""
+    rng = np.random.default_rng(seed)
+    frame = np.full((height, width, 4), 235, dtype=np.uint8)
+    frame[: height // 12] = (60, 40, 30, 255)
+    frame[:, : width // 6] = (45, 45, 45, 255)
+    frame[height // 5: height // 2, width // 4:] = np.linspace(0, 255, width - width // 4, dtype=np.uint8)[None, :, None]
+    text = rng.integers(0, 2, size=(height // 3, width // 2), dtype=np.uint8) * 200
+    frame[height // 2: height // 2 + text.shape[0], width // 3: width // 3 + text.shape[1], :3] = text[..., None]
+    frame[..., 3] = 0  # mss leaves the padding byte 0 on real captures
+    return frame
+
+
+def mean_rgb(jpeg: bytes):
+    return np.asarray(Image.open(io.BytesIO(jpeg)).convert("RGB"), dtype=np.float32).mean(axis=(0, 1))
+
+
+def legacy_process(raw: bytes, size):
+    img = Image.frombytes("RGB", size, raw, "raw", "BGRX")
+    img.thumbnail((1280, 1280), Image.Resampling.LANCZOS)
+    out = io.BytesIO()
+    img.save(out, format='JPEG', quality=85)
+    return out.getvalue()
+
+
+def measure(fn, frames):
+    fn(frames[0])  # Warm-up
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    ms = (time.perf_counter() - start) * 1000 / len(frames)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for frame in frames:
+        fn(frame)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "lineno")
+    allocations = sum(max(s.count_diff, 0) for s in stats) / len(frames)
+    return ms, allocations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", nargs="+", default=["1920x1080", "2560x1440"])
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{'frame':>10} | {'pipeline':>8} | {'ms/frame':>9} | {'allocs/frame':>12} | {'JPEG KB':>8}")
+    for size in args.size:
+        width, height = map(int, size.lower().split("x"))
+        frames = [synthetic_frame(width, height, i) for i in range(4)]
+        frames = (frames * (args.frames // len(frames) + 1))[:args.frames]
+        raws = [f.tobytes() for f in frames]
+
+        encoder = FrameEncoder()
+        old = measure(lambda raw: legacy_process(raw, (width, height)), raws)
+        new = measure(encoder.encode, frames)
+        old_jpeg, new_jpeg = legacy_process(raws[0], (width, height)), encoder.encode(frames[0])
+        old_kb, new_kb = len(old_jpeg) / 1024, len(new_jpeg) / 1024
+        # Same picture either way (a 0 padding byte must not be read as transparency)
+        drift = np.abs(mean_rgb(old_jpeg) - mean_rgb(new_jpeg)).max()
+        assert drift < 4, f"new pipeline output differs from old (mean RGB off by {drift:.1f})"
+        print(f"{size:>10} | {'old':>8} | {old[0]:>9.2f} | {old[1]:>12.1f} | {old_kb:>8.1f}")
+        print(f"{size:>10} | {'new':>8} | {new[0]:>9.2f} | {new[1]:>12.1f} | {new_kb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
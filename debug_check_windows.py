@@ -1,5 +1,9 @@
+import os
+import sys
 import pygetwindow as gw
-from fuzzywuzzy import process
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from src.tools.matcher import best_match
 
 def check_windows():
     print("--- RAW WINDOW LIST ---")
@@ -14,8 +18,9 @@ def check_windows():
     print(f"Searching for: '{target}'")
     
     # Fuzzy match logic clone
-    match_title, match_score = process.extractOne(target, titles)
-    print(f"Best Fuzzy Match: '{match_title}' (Score: {match_score})")
+    match = best_match(target, titles)
+    if match:
+        print(f"Best Fuzzy Match: '{match.choice}' (Score: {match.score:.0f})")
     
     # Substring logic clone
     for t in titles:
@@ -6,25 +6,19 @@ from livekit import agents
 from livekit.agents import AgentSession, Agent, RoomInputOptions, ChatContext, ChatMessage
 from livekit.plugins import google, noise_cancellation, silero
 from google.genai import types # Required for Vision Payload
-from src.vision.screen_capture import ScreenCapture
+from src.vision.rate_control import POLICIES, VisionPolicy, RateController, subscribe_input, unsubscribe_input
 from livekit.agents import function_tool # Required for vision_tool
 
 # Import your custom modules
-from src.core.gemini_prompts import get_system_prompts
-from src.tools.google_search import google_search, get_current_datetime
-from src.tools.weather import get_weather
-from src.tools.window_ctrl import open_app, close_app, folder_file, minimize_window, maximize_window, list_open_windows, open_url
-from src.tools.window_ctrl import play_file as Play_file 
-from src.tools.inputs import (
-    move_cursor_tool, mouse_click_tool, scroll_cursor_tool, 
-    type_text_tool, press_key_tool, swipe_gesture_tool, 
-    press_hotkey_tool, mouse_move_to_coords
-)
-from src.tools.content import generate_content_tool
-from src.tools.media import play_youtube_tool, search_youtube_tool
-from src.tools.system_ctrl import system_control_tool, get_battery_status
-from src.core.groq_brain import ask_groq_planner
+from src.core.gemini_prompts import build_system_prompts
+from src.core.startup import STARTUP_GREETING_WAIT, get_startup
+# Tool modules (pyautogui, pywhatkit, pycaw, Groq SDK...) load on first use or in prewarm
+from src.tools.registry import TOOL_MODULES, import_module, lazy_tools, warm_up
 from src.memory.loop import MemoryExtractor
+from src.memory.store import get_memory
+from src.memory.records import message_text
+from src.tools.tool_cache import cache_stats
+from src.core import speculative
 
 load_dotenv()
 
@@ -32,18 +26,48 @@ load_dotenv()
 class VisionManager:
     def __init__(self, agent_llm):
         self.llm = agent_llm
-        self.capturer = ScreenCapture()
+        self._capturer = None
         self.active_task = None
         self.is_active = False
 
-    async def _stream_loop(self, duration: int):
+    @property
+    def capturer(self):
+        # mss/PIL/numpy only load once vision is actually used
+        if self._capturer is None:
+            from src.vision.screen_capture import ScreenCapture
+            self._capturer = ScreenCapture()
+        return self._capturer
+
+    async def _stream_loop(self, policy: VisionPolicy):
+        duration = policy.duration
         self.is_active = True
-        print(f"👀 Vision Enabled for {duration}s")
+        print(f"👀 Vision Enabled for {duration}s ({policy.name}: {policy.min_fps}-{policy.max_fps} fps)")
         start_time = asyncio.get_event_loop().time()
         
-        async for frame_bytes in self.capturer.start_capture(interval=1.0):
-            if asyncio.get_event_loop().time() - start_time > duration:
-                break
+        # Input tools (click, type, scroll) make the next frame worth taking right away
+        controller = RateController(policy)
+        def on_input(action):
+            controller.on_input(action)
+            self.capturer.wake()
+        subscribe_input(on_input)
+        try:
+            await self._send_frames(controller, start_time, duration)
+        finally:
+            unsubscribe_input(on_input)
+
+        self.is_active = False
+        stats = self.capturer.stats.summary()
+        rates = controller.metrics()
+        self.capturer.stop_capture()
+        print(f"🙈 Vision Auto-Disabled ({stats['sent']}/{stats['frames']} frames sent, "
+              f"{stats['bytes_saved'] // 1024} KB saved by diffing, "
+              f"{rates['fps_min']}-{rates['fps_max']} fps, {rates['bytes_per_s'] // 1024} KB/s)")
+
+    async def _send_frames(self, controller: RateController, start_time: float, duration: float):
+        remaining = duration - (asyncio.get_event_loop().time() - start_time)
+        # The capture stream enforces the limit itself: unchanged frames never arrive here
+        async for frame_bytes in self.capturer.start_capture(interval=controller.interval, controller=controller,
+                                                             duration=remaining):
                 
             # Inject Frame into Active Session
             sessions = list(self.llm._sessions)
@@ -65,20 +89,28 @@ class VisionManager:
             else:
                 print("⚠️ No Active Session for Vision (Sessions list empty)")
 
-        self.is_active = False
-        self.capturer.stop_capture()
-        print("🙈 Vision Auto-Disabled")
+    def enable(self, mode="on", target="", monitor=1):
+        # A window target beats downscaling the whole desktop: smaller, sharper frames
+        if target:
+            window = self.capturer.target_window(target)
+            if window is None:
+                return f"No window matching '{target}'"
+            where = f"window '{window.title}'"
+        elif self.capturer.select_monitor(monitor):
+            where = f"monitor {monitor}"
+        else:
+            return f"No monitor {monitor} (found {len(self.capturer.monitors) - 1})"
 
-    def enable(self, duration=15):
         if self.active_task and not self.active_task.done():
             self.active_task.cancel()
-        self.active_task = asyncio.create_task(self._stream_loop(duration))
-        return "Vision Enabled"
+        self.active_task = asyncio.create_task(self._stream_loop(POLICIES.get(mode, POLICIES["on"])))
+        return where
 
     def disable(self):
         if self.active_task:
             self.active_task.cancel()
-        self.capturer.stop_capture()
+        if self._capturer is not None:
+            self._capturer.stop_capture()
         self.is_active = False
         return "Vision Disabled"
 
@@ -86,37 +118,48 @@ class VisionManager:
 vision_manager = None # Global reference
 
 @function_tool()
-async def vision_tool(action: str) -> str:
+async def vision_tool(action: str, target: str = "", monitor: int = 1) -> str:
     """
     Control Jarvis Vision ('Eyes').
     Use this when you need to see the screen (e.g. "read error", "what is this", "check app").
+    When the question is about one app, pass target so only that window is captured.
     
     Args:
-        action: "on" (active for 15s) or "off"
+        action: "on" (active for 15s, adapts to screen activity), "burst" (8s of fast
+            frames, for watching something happen), "low" (30s, cheap and slow) or "off"
+        target: "" for the whole screen, "focused" for the active window, or part of a
+            window title (e.g. "visual studio code", "chrome")
+        monitor: display to capture when no target is given (1 = primary, 2+ = others, 0 = all)
     """
     global vision_manager
     if not vision_manager:
         return "❌ Vision Manager not initialized."
     
-    if action.lower() == "on":
-        vision_manager.enable()
-        return "✅ Vision Enabled (Eyes Open)"
+    mode = action.lower().strip()
+    if mode in POLICIES:
+        result = vision_manager.enable(mode, target=target, monitor=monitor)
+        if result.startswith("No "):
+            return f"❌ {result}"
+        return f"✅ Vision Enabled (Eyes Open on {result}, {mode} for {POLICIES[mode].duration:.0f}s)"
     else:
         vision_manager.disable()
         return "✅ Vision Disabled"
 
 # Common Tools List
-TOOLS = [
-    google_search, get_current_datetime, get_weather,
-    open_app, close_app, folder_file, 
-    move_cursor_tool, mouse_click_tool, scroll_cursor_tool, 
-    type_text_tool, press_key_tool, press_hotkey_tool, 
-    swipe_gesture_tool, mouse_move_to_coords,
-    generate_content_tool, play_youtube_tool, search_youtube_tool,
-    system_control_tool, vision_tool, get_battery_status,
-    minimize_window, maximize_window, ask_groq_planner, list_open_windows,
-    open_url
-]
+# Schemas come from the tool sources; implementations import on first call
+TOOLS = lazy_tools([
+    "google_search", "get_current_datetime", "get_weather",
+    "open_app", "close_app", "folder_file", 
+    "move_cursor_tool", "mouse_click_tool", "scroll_cursor_tool", 
+    "type_text_tool", "press_key_tool", "press_hotkey_tool", 
+    "swipe_gesture_tool", "mouse_move_to_coords",
+    "generate_content_tool", "play_youtube_tool", "search_youtube_tool",
+    "system_control_tool",
+], function_tool) + [vision_tool] + lazy_tools([
+    "get_battery_status",
+    "minimize_window", "maximize_window", "ask_groq_planner", "list_open_windows",
+    "open_url", "recall_memory"
+], function_tool)
 
 class APIKeyManager:
     def __init__(self):
@@ -173,9 +216,79 @@ class NativeAssistant(Agent):
             tools=TOOLS
         )
 
+async def load_chat_context(max_messages: int = 30) -> ChatContext:
+    """Seed a ChatContext with the tail of the saved conversation history"""
+    chat_ctx = ChatContext.empty()
+    try:
+        memory = await asyncio.to_thread(get_memory)
+        recent = await memory.aget_recent_context(max_messages)
+    except Exception as e:
+        logging.error(f"Could not load past context: {e}")
+        return chat_ctx
+
+    for message in recent:
+        if message.get("type", "message") != "message" or message.get("role") not in ("user", "assistant"):
+            continue
+        text = message_text(message)
+        if text:
+            chat_ctx.add_message(role=message["role"], content=text)
+    return chat_ctx
+
+async def apply_startup_info(agent: Agent, placeholder, info):
+    if (info.city, info.weather) == (placeholder.city, placeholder.weather):
+        return
+    try:
+        await agent.update_instructions(build_system_prompts(info)[0])
+        print(f"🌆 Startup context patched in (city: {info.city})")
+    except Exception as e:
+        logging.warning(f"⚠️ Could not update instructions: {e}")
+
 async def entrypoint(ctx: agents.JobContext):
     key_manager = APIKeyManager()
-    instructions_prompt, reply_prompts = await get_system_prompts()
+
+    # City/weather load in the background; the session starts on cached values
+    startup = get_startup()
+    startup.start(refresh=True)
+    placeholder = startup.placeholder()
+    instructions_prompt, reply_prompts = build_system_prompts(placeholder)
+
+    # Prefetch past context off the event loop while the rest of startup runs
+    history_task = asyncio.create_task(load_chat_context())
+
+    # Memory: persists turns as sessions emit them (flushed on job shutdown)
+    conv_ctx = MemoryExtractor()
+    conv_ctx.start()
+    ctx.add_shutdown_callback(conv_ctx.aclose)
+
+    # No-op if prewarm already started it (e.g. when run outside the worker)
+    warm_up(WARM_MODULES)
+
+    # Warm the Groq connection so the first planner call skips the TLS handshake
+    groq_pool = (await asyncio.to_thread(import_module, "src.core.groq_client")).groq_pool
+    asyncio.create_task(groq_pool.warm())
+    ctx.add_shutdown_callback(groq_pool.aclose)
+
+    # Shared keep-alive client for search/weather/geolocation
+    http_pool = (await asyncio.to_thread(import_module, "src.core.http_client")).http_pool
+    ctx.add_shutdown_callback(http_pool.aclose)
+
+    # File index builds/loads in its own threads; folder_file searches it instead of scanning
+    file_index_module = await asyncio.to_thread(import_module, "src.tools.file_index")
+    file_index = await asyncio.to_thread(file_index_module.get_file_index)
+    ctx.add_shutdown_callback(lambda: asyncio.to_thread(file_index.close))
+
+    # Window snapshot poller shared by window tools and the planner
+    registry_module = await asyncio.to_thread(import_module, "src.tools.window_registry")
+    window_registry = await asyncio.to_thread(registry_module.get_window_registry)
+    ctx.add_shutdown_callback(lambda: asyncio.to_thread(window_registry.stop))
+
+    history_ctx = await history_task
+
+    async def log_cache_stats():
+        print(f"📊 Tool cache: {cache_stats()} | HTTP: {http_pool.stats()}")
+        print(f"📊 Prefetch: {speculative.get_speculator().stats()} | "
+              f"Time to answer: {speculative.get_answer_clock().stats()}")
+    ctx.add_shutdown_callback(log_cache_stats)
     
     while True:
         current_api_key = key_manager.get_current_key()
@@ -198,11 +311,13 @@ async def entrypoint(ctx: agents.JobContext):
                 preemptive_generation=False, # Changed to False: Waits for full command to prevent double-processing
                 turn_detection=vad
             )
-            current_ctx = session.history.items 
+            conv_ctx.attach(session)
+            # Realtime searches start from the transcript, while Gemini says "Checking..."
+            speculative.attach(session)
 
             # Correctly Instantiate NativeAssistant
             agent_instance = NativeAssistant(
-                chat_ctx=current_ctx, 
+                chat_ctx=history_ctx.copy(), 
                 instructions=instructions_prompt, 
                 api_key=current_api_key
             )
@@ -215,13 +330,18 @@ async def entrypoint(ctx: agents.JobContext):
                 ),
             )
             
+            # Patch fresh city/weather into the instructions: before the greeting if they
+            # make it in time (session.start above already gave them a head start), else later
+            info = await startup.wait(STARTUP_GREETING_WAIT)
+            if info.fresh:
+                await apply_startup_info(agent_instance, placeholder, info)
+            else:
+                startup.on_ready(lambda info, agent=agent_instance: asyncio.create_task(
+                    apply_startup_info(agent, placeholder, info)))
+
             # Initial Greeting
             await session.generate_reply(instructions=reply_prompts)
             
-            # Memory Loop
-            conv_ctx = MemoryExtractor()
-            asyncio.create_task(conv_ctx.run(current_ctx))
-            
             await ctx.wait_for_participant()
             print("👋 User disconnected.")
             break
@@ -239,5 +359,12 @@ async def entrypoint(ctx: agents.JobContext):
             
             raise e
 
+# Planner first (it pulls in the window/input/media tools), vision last
+WARM_MODULES = list(dict.fromkeys(["src.core.groq_brain", *TOOL_MODULES.values(), "src.vision.screen_capture"]))
+
+def prewarm(proc: agents.JobProcess):
+    """Runs in each job process before it gets a job: tool imports start in the background"""
+    warm_up(WARM_MODULES)
+
 if __name__ == "__main__":
-    agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint))
\ No newline at end of file
+    agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
\ No newline at end of file
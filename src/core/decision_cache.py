@@ -0,0 +1,176 @@
+"""
+PLANNER DECISION CACHE
+Remembers what Groq decided for an utterance so repeated commands
+("open notepad", "volume 50") skip the LLM round-trip.
+"""
+import json
+import os
+import re
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Words that make a command depend on what is on screen ("close THIS")
+DEICTIC_WORDS = {
+    "this", "that", "it", "here", "current", "active",
+    "yo", "tyo", "yaha", "yeh", "ye", "wo", "isko", "usko", "yeslai",
+    "यो", "त्यो", "यहाँ", "यह", "वो", "इसे",
+}
+
+# Decisions whose arguments carry the user's content (a search query, text to type):
+# replaying one for a similar request would answer the wrong question
+NO_CACHE_CALL = re.compile(r"\b(?:google_search|type_text)\s*\(")
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop sentence punctuation, collapse whitespace ("notepad++" keeps its "+")"""
+    query = re.sub(r"[?!.,;:'\"।()\[\]]", " ", query.lower())
+    return " ".join(query.split())
+
+def call_count(decision: str) -> int:
+    """Tool calls in a cached decision (plans are stored one call per line)"""
+    return sum(1 for line in decision.splitlines() if line.strip())
+
+def loose_forms(normalized: str) -> Tuple[str, str]:
+    """(sorted token set, text without spaces): equal only if word order or spacing differ"""
+    return " ".join(sorted(set(normalized.split()))), normalized.replace(" ", "")
+
+def context_signature(normalized: str, active_window: str = "", context: str = "") -> str:
+    """
+    Coarse context for the cache key. Only deictic commands depend on the screen,
+    and for those the app name of the foreground window is enough.
+    """
+    if not DEICTIC_WORDS.intersection(normalized.split()):
+        return ""
+    app = (active_window or "").rsplit(" - ", 1)[-1].strip().lower()
+    return f"{app}|{normalize_query(context)}"
+
+
+class DecisionCache:
+    """
+    Two-layer cache of planner decisions.
+
+    Exact layer: LRU keyed on (normalized query, context signature).
+    Loose layer: a cached query with the same signature and the same words in
+    another spacing, or in another order when the decision is a single call
+    ("notepad kholo" / "kholo notepad"). In a plan, order carries the meaning
+    ("open chrome and close notepad" / "close chrome and open notepad"). Anything
+    closer to a different command ("who won" / "who lost", "notepad" /
+    "notepad++") is a miss: a wrong replay costs more than a Groq call.
+    Search and typing decisions are never cached.
+    Entries expire after ttl seconds; the cache can persist to a JSON file.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 6 * 3600,
+                 persist_path: str = None, save_every: int = 10):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.persist_path = persist_path
+        self.save_every = save_every
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        if persist_path:
+            self.load()
+
+    def _key(self, query: str, active_window: str, context: str) -> Tuple[str, str]:
+        normalized = normalize_query(query)
+        return normalized, context_signature(normalized, active_window, context)
+
+    def _evict_expired(self, now: float):
+        expired = [k for k, (_, expires) in self._entries.items() if expires <= now]
+        for k in expired:
+            del self._entries[k]
+
+    def get(self, query: str, active_window: str = "", context: str = "") -> Optional[str]:
+        key = self._key(query, active_window, context)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            fuzzy = self._fuzzy_lookup(key, now)
+            if fuzzy is not None:
+                self.fuzzy_hits += 1
+                return fuzzy
+
+            self.misses += 1
+            return None
+
+    def _fuzzy_lookup(self, key: Tuple[str, str], now: float) -> Optional[str]:
+        query, signature = key
+        words, compact = loose_forms(query)
+        for candidate, (decision, expires) in self._entries.items():
+            if candidate[1] != signature or expires <= now:
+                continue
+            cand_words, cand_compact = loose_forms(candidate[0])
+            if cand_compact == compact or (cand_words == words and call_count(decision) == 1):
+                self._entries.move_to_end(candidate)
+                logger.info(f"🔁 Loose cache match '{query}' ~ '{candidate[0]}'")
+                return decision
+        return None
+
+    def put(self, query: str, decision: str, active_window: str = "", context: str = ""):
+        if NO_CACHE_CALL.search(decision):
+            return
+        key = self._key(query, active_window, context)
+        with self._lock:
+            self._entries[key] = (decision, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._dirty += 1
+            should_save = self.persist_path and self._dirty >= self.save_every
+        if should_save:
+            self.save()
+
+    def stats(self) -> dict:
+        total = self.hits + self.fuzzy_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.fuzzy_hits) / total if total else 0.0,
+        }
+
+    def save(self):
+        if not self.persist_path:
+            return
+        with self._lock:
+            self._evict_expired(time.time())
+            data = [[q, sig, decision, expires] for (q, sig), (decision, expires) in self._entries.items()]
+            self._dirty = 0
+        try:
+            os.makedirs(os.path.dirname(self.persist_path) or ".", exist_ok=True)
+            tmp_path = self.persist_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.persist_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save planner cache: {e}")
+
+    def load(self):
+        if not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️ Could not load planner cache: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            for q, sig, decision, expires in data[-self.maxsize:]:
+                if expires > now and not NO_CACHE_CALL.search(decision):
+                    self._entries[(q, sig)] = (decision, expires)
+        logger.info(f"📦 Loaded {len(self._entries)} cached planner decisions")
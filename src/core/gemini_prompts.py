@@ -1,35 +1,21 @@
 import os
-import requests
 import logging
 from dotenv import load_dotenv
-from src.tools.google_search import get_current_datetime
-from src.tools.weather import get_weather
+from src.core.startup import STARTUP_GREETING_WAIT, StartupInfo, get_startup
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-async def get_current_city():
-    try:
-        # Note: requests is sync, but we wrap for compatibility
-        response = requests.get("https://ipinfo.io", timeout=5)
-        data = response.json()
-        return data.get("city", "Unknown")
-    except Exception as e:
-        logger.error(f"Error getting city: {e}")
-        return "Unknown"
-
-async def get_system_prompts():
-    current_datetime = await get_current_datetime()
-    city = await get_current_city()
-    # We pass the city to get_weather to avoid double IP lookup if possible
-    # Note: get_weather is a tool so it might return a string result directly
-    # Ideally we should just rely on the tool call during conversation, but for system prompt context 
-    # we can try to fetch it if needed. The original code called it here.
-    try:
-        weather_info = await get_weather(city)
-    except Exception:
-        weather_info = "Weather info unavailable during startup"
+async def get_system_prompts(timeout: float = STARTUP_GREETING_WAIT):
+    """Prompts with fresh city/weather if they arrive within timeout, else from the startup cache"""
+    info = await get_startup().wait(timeout)
+    return build_system_prompts(info)
+
+def build_system_prompts(info: StartupInfo):
+    current_datetime = info.datetime
+    city = info.city
+    weather_info = info.weather or "Weather info unavailable during startup"
     
     user_name = os.getenv("USER_NAME", "User")
     assistant_name = os.getenv("ASSISTANT_NAME", "Jarvis")
@@ -78,6 +64,7 @@ async def get_system_prompts():
 
 **STARTUP INFO:**
 - आज की तारीख है: {current_datetime} और User का current शहर है: {city}।
+- {weather_info}
 
 (Proceed to Decision Protocol...)
 
@@ -1,56 +1,116 @@
 from livekit.agents import function_tool
+import atexit
 import logging
 import os
 import json
 import asyncio
-from groq import Groq
 from dotenv import load_dotenv
-import pygetwindow as gw
 
 # Import the Separated Prompt
 from src.core.groq_prompts import SYSTEM_PROMPT
+from src.core.decision_cache import DecisionCache
+from src.core.intent_router import route_intent
+from src.core.speculative import get_speculator
+from src.core.groq_client import groq_pool
+from src.core.plan_parser import (
+    StreamingCallParser, PlanParseError, parse_plan, strip_markdown, looks_like_call
+)
+from src.core.plan_executor import PlanExecutor, PlanRun, PlanValidationError, ToolSpec, FOREGROUND
 
-# IMPORTS FOR EXECUTION (Must align with tool names)
-from src.tools.google_search import google_search
-from src.tools.window_ctrl import open_app, close_app, minimize_window, maximize_window, open_url
-from src.tools.media import play_youtube_tool
-from src.tools.system_ctrl import system_control_tool
-from src.tools.inputs import type_text_tool  # Added for typing support
+# TOOLS FOR EXECUTION (Must align with tool names); modules import on first call
+from src.tools.registry import lazy_callable
+from src.tools.window_registry import get_window_registry
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-GroqAPIKey = os.getenv("GROQ_API_KEY")
-client = None
-if GroqAPIKey:
-    client = Groq(api_key=GroqAPIKey)
+# Planner calls are short: fail fast and let Gemini answer instead
+PLANNER_TIMEOUT = float(os.getenv("PLANNER_TIMEOUT", "6"))
 
-def groq_inference(query: str, context: str = "", active_windows: list = None):
-    if not client:
-        return "❌ Groq API Key missing."
+# Stream the plan and execute each tool call before the completion finishes
+PLANNER_STREAMING = os.getenv("PLANNER_STREAMING", "1") != "0"
+
+# Local router confidence needed to skip Groq entirely
+ROUTER_THRESHOLD = float(os.getenv("ROUTER_THRESHOLD", "0.9"))
 
+# Repeated intents ("open notepad", "volume 50") skip the LLM round-trip
+decision_cache = None
+if os.getenv("PLANNER_CACHE", "1") != "0":
+    decision_cache = DecisionCache(
+        ttl=float(os.getenv("PLANNER_CACHE_TTL", str(6 * 3600))),
+        persist_path=os.path.join("Data", "planner_cache.json")
+    )
+    atexit.register(decision_cache.save)
+
+def planner_messages(query: str, context: str = "", active_windows: list = None):
     window_context = f"Active Windows: {active_windows}" if active_windows else "Active Windows: [Unknown]"
     full_prompt = f"User Request: '{query}'\nVisual Context: {context}\n{window_context}\n\nExecute Action:"
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": full_prompt}
+    ]
+
+def groq_error_message(e: Exception) -> str:
+    if isinstance(e, asyncio.TimeoutError):
+        logger.warning("⚠️ Groq planner timed out.")
+        return "❌ Groq Planner Timeout."
+    error_str = str(e).lower()
+    if "429" in error_str or "rate limit" in error_str:
+        logger.warning("⚠️ Groq Rate Limit Exceeded.")
+        return "❌ Groq Rate Limit Exceeded. Switching to Basic Logic."
+    
+    logger.error(f"Groq Error: {e}")
+    return f"❌ Groq Brain Error: {e}"
+
+async def groq_inference(query: str, context: str = "", active_windows: list = None):
+    if not groq_pool.available:
+        return "❌ Groq API Key missing."
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": full_prompt}
-            ],
+        completion = await groq_pool.chat(
+            messages=planner_messages(query, context, active_windows),
             temperature=0.1, 
-            max_tokens=200
+            max_tokens=200,
+            timeout=PLANNER_TIMEOUT
         )
-        return completion.choices[0].message.content.strip()
+        return completion.strip()
+    except Exception as e:
+        return groq_error_message(e)
+
+async def groq_stream_inference(plan: PlanRun, query: str, context: str = "", active_windows: list = None):
+    """
+    Streams the plan and submits each tool call the moment it is complete,
+    so the first action starts while later lines are still generating.
+    Once the plan is over (prose or a closing fence after the calls) the
+    stream is closed, which cancels the rest of the generation.
+    Returns the planner text.
+    """
+    if not groq_pool.available:
+        return "❌ Groq API Key missing."
+
+    parser = StreamingCallParser()
+    stream = groq_pool.stream(
+        messages=planner_messages(query, context, active_windows),
+        temperature=0.1,
+        max_tokens=200,
+        timeout=PLANNER_TIMEOUT
+    )
+    try:
+        async for delta in stream:
+            for call in parser.feed(delta):
+                if parser.is_call:
+                    plan.submit(call)
+            if len(plan) and parser.plan_complete:
+                logger.info(f"✂️ Plan complete after {len(plan)} call(s); cancelling the rest of the stream")
+                return "\n".join(plan.sources)
+        return parser.text.strip()
     except Exception as e:
-        error_str = str(e).lower()
-        if "429" in error_str or "rate limit" in error_str:
-            logger.warning("⚠️ Groq Rate Limit Exceeded.")
-            return "❌ Groq Rate Limit Exceeded. Switching to Basic Logic."
-        
-        logger.error(f"Groq Error: {e}")
-        return f"❌ Groq Brain Error: {e}"
+        if len(plan):
+            logger.warning(f"⚠️ Planner stream broke after {len(plan)} step(s): {e}")
+            return parser.text.strip()
+        return groq_error_message(e)
+    finally:
+        await stream.aclose()
 
 @function_tool()
 async def ask_groq_planner(query: str, context: str = ""):
@@ -58,51 +118,88 @@ async def ask_groq_planner(query: str, context: str = ""):
     Decides AND EXECUTES the correct tool based on user query.
     """
     try:
+        # Snapshot from the window registry's poller; no enumeration on this path
+        registry = get_window_registry()
+        active = registry.active()
+        active_title = active.title if active else ""
+
+        # 0. Fast path: deterministic commands never reach the network ("close this" -> active_title)
+        route = route_intent(query, active_title)
+        if route and route.confidence >= ROUTER_THRESHOLD:
+            command_str = route.to_call()
+            print(f"⚡ LOCAL ROUTE: {command_str} ({route.rule}, {route.confidence})")
+            return await execute_command(command_str)
+
+        # Predicted realtime search: start it now, google_search claims it once Groq decides
+        if route and route.tool == "google_search":
+            get_speculator().start(route.args[0], source="planner")
+
         # 1. Get Plan from Groq
         print(f"🧠 GROQ PLANNER: Thinking on '{query}'...")
-        try:
-            current_windows = [w.title for w in gw.getAllWindows() if w.title.strip()]
-        except:
-            current_windows = []
+        current_windows = registry.titles(visible_only=False)
 
-        command_str = await asyncio.to_thread(groq_inference, query, context, current_windows)
+        command_str = decision_cache.get(query, active_title, context) if decision_cache else None
+        if command_str:
+            print(f"⚡ CACHED DECISION: {command_str} {decision_cache.stats()}")
+            return await execute_command(command_str)
+
+        plan = plan_executor.start()
+        if PLANNER_STREAMING:
+            # Each call is dispatched the moment its expression is complete
+            command_str = await groq_stream_inference(plan, query, context, current_windows)
+        else:
+            command_str = await groq_inference(query, context, current_windows)
         print(f"🧠 GROQ DECISION: {command_str}")
 
+        if len(plan):
+            results = await plan.results()
+            # Only tool calls are worth caching (not errors or chat replies)
+            if decision_cache and plan.sources and not any(r.startswith("❌") for r in results if isinstance(r, str)):
+                decision_cache.put(query, "\n".join(plan.sources), active_title, context)
+            return format_results(results)
+
         # 2. Safety Check
         if "❌" in command_str or not command_str:
             return command_str
 
-        # 3. EXECUTE THE COMMAND (The Magic Step)
-        # We allow specific safe functions only
-        safe_globals = {
-            "google_search": google_search,
-            "open_app": open_app,
-            "close_app": close_app,
-            "minimize_window": minimize_window,
-            "maximize_window": maximize_window,
-            "play_youtube_tool": play_youtube_tool,
-            "open_url": open_url,
-            "system_control_tool": system_control_tool,
-            "type_text": type_text_tool # Added this!
-        }
-        
-        # Strip potential markdown code blocks (triples and singles)
-        clean_cmd = command_str.replace("```python", "").replace("```", "").replace("`", "").strip()
-        
-        # Execute async function
-        if "(" in clean_cmd and ")" in clean_cmd:
-            # It's a function call like google_search("query")
-            # We use eval to get the coroutine, then await it
-            coroutine = eval(clean_cmd, safe_globals)
-            if asyncio.iscoroutine(coroutine):
-                result = await coroutine
-                return f"✅ Action Taken: {result}"
-            else:
-                return f"✅ Done: {result}"
-        else:
-            # It might be a chat reply
-            return clean_cmd
+        if decision_cache and looks_like_call(strip_markdown(command_str)):
+            decision_cache.put(query, command_str, active_title, context)
+        return await execute_command(command_str)
 
     except Exception as e:
         logger.error(f"Critical Groq Execution Error: {e}")
         return f"❌ Execution Failed: {e}"
+
+# 3. EXECUTE THE PLAN (The Magic Step)
+# We allow specific safe functions only. Foreground tools run in plan order;
+# the rest (search, volume) run alongside them.
+plan_executor = PlanExecutor([
+    ToolSpec("google_search", lazy_callable("google_search")),
+    ToolSpec("open_app", lazy_callable("open_app"), FOREGROUND),
+    ToolSpec("close_app", lazy_callable("close_app"), FOREGROUND),
+    ToolSpec("minimize_window", lazy_callable("minimize_window"), FOREGROUND),
+    ToolSpec("maximize_window", lazy_callable("maximize_window"), FOREGROUND),
+    ToolSpec("play_youtube_tool", lazy_callable("play_youtube_tool"), FOREGROUND),
+    ToolSpec("open_url", lazy_callable("open_url"), FOREGROUND),
+    ToolSpec("system_control_tool", lazy_callable("system_control_tool")),
+    ToolSpec("folder_file", lazy_callable("folder_file"), FOREGROUND),
+    ToolSpec("type_text", lazy_callable("type_text_tool"), FOREGROUND),
+])
+
+def format_results(results: list) -> str:
+    if len(results) == 1:
+        return f"✅ Action Taken: {results[0]}"
+    return "✅ Actions Taken:\n" + "\n".join(f"{i}. {r}" for i, r in enumerate(results, 1))
+
+async def execute_command(command_str: str):
+    """Runs a planner decision like open_app("Notepad") (one call per line); anything else is a chat reply"""
+    clean_cmd = strip_markdown(command_str)
+    if not looks_like_call(clean_cmd):
+        # It might be a chat reply
+        return clean_cmd
+    try:
+        calls = parse_plan(clean_cmd)
+        return format_results(await plan_executor.run(calls))
+    except (PlanParseError, PlanValidationError) as e:
+        logger.error(f"Plan rejected: {e}")
+        return f"❌ Execution Failed: {e}"
@@ -0,0 +1,187 @@
+"""
+SHARED GROQ CLIENT
+One async, pooled Groq client for the planner and the content generator:
+keep-alive (HTTP/2 when `h2` is installed), per-call deadlines, jittered
+retry on 429/5xx, and key rotation across GROQ_API_KEY, GROQ_API_KEY_1..N.
+"""
+import asyncio
+import os
+import random
+import logging
+from typing import AsyncIterator, List, Dict, Optional
+import httpx
+import groq
+from groq import AsyncGroq
+from dotenv import load_dotenv
+
+try:
+    import h2  # noqa: F401 - only needed for httpx HTTP/2 support
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class GroqKeyManager:
+    """Same rotation scheme as the Google APIKeyManager in agent.py"""
+
+    def __init__(self):
+        self.keys = []
+        # GroqAPIKey is the older name used by the content generator
+        for name in ("GROQ_API_KEY", "GroqAPIKey"):
+            key = os.getenv(name)
+            if key and key not in self.keys:
+                self.keys.append(key)
+        i = 1
+        while True:
+            key = os.getenv(f"GROQ_API_KEY_{i}")
+            if key:
+                if key not in self.keys:
+                    self.keys.append(key)
+            elif i > 10:
+                break
+            i += 1
+        self.current_index = 0
+
+    def get_current_key(self):
+        if not self.keys: return None
+        return self.keys[self.current_index]
+
+    def rotate_key(self):
+        if not self.keys: return None
+        self.current_index = (self.current_index + 1) % len(self.keys)
+        logger.info(f"🔄 Switching to Groq API Key Index: {self.current_index + 1}")
+        return self.get_current_key()
+
+
+class GroqPool:
+    def __init__(self, timeout: float = 10.0, max_retries: int = 3, backoff: float = 0.25):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.key_manager = GroqKeyManager()
+        self._http: Optional[httpx.AsyncClient] = None
+        self._clients: Dict[str, AsyncGroq] = {}
+
+    @property
+    def available(self) -> bool:
+        return bool(self.key_manager.keys)
+
+    def _client(self) -> AsyncGroq:
+        """AsyncGroq for the current key; all keys share one connection pool"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=HTTP2,
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120),
+            )
+            self._clients.clear()
+        key = self.key_manager.get_current_key()
+        if key not in self._clients:
+            # Retries are ours (with key rotation), not the SDK's
+            self._clients[key] = AsyncGroq(api_key=key, http_client=self._http, max_retries=0)
+        return self._clients[key]
+
+    def _retryable(self, error: Exception) -> bool:
+        if isinstance(error, (asyncio.TimeoutError, groq.APIConnectionError, groq.APITimeoutError)):
+            return True
+        return isinstance(error, groq.APIStatusError) and error.status_code in RETRY_STATUS
+
+    async def _sleep_before_retry(self, attempt: int, error: Exception, deadline: float):
+        """Waits out the backoff; re-raises error if a retry can't start before the deadline"""
+        if attempt >= self.max_retries or not self._retryable(error):
+            raise error
+        if isinstance(error, groq.RateLimitError) and len(self.key_manager.keys) > 1:
+            self.key_manager.rotate_key()
+            delay = 0.0  # A fresh key can go straight away
+        else:
+            delay = self.backoff * (2 ** attempt)
+        delay += random.uniform(0, self.backoff)
+        if asyncio.get_running_loop().time() + delay >= deadline:
+            raise error
+        logger.warning(f"⚠️ Groq call failed ({error}); retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    def _deadline(self, timeout: Optional[float]) -> float:
+        """One deadline for the whole call, retries and backoff included"""
+        return asyncio.get_running_loop().time() + (timeout or self.timeout)
+
+    def _remaining(self, deadline: float) -> float:
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        return remaining
+
+    async def chat(self, messages: List[Dict], model: str = DEFAULT_MODEL,
+                   timeout: float = None, **kwargs) -> str:
+        """Complete a chat within `timeout` seconds overall (all attempts); returns the message text"""
+        if not self.available:
+            raise RuntimeError("Groq API Key missing.")
+        deadline = self._deadline(timeout)
+        for attempt in range(self.max_retries + 1):
+            try:
+                completion = await asyncio.wait_for(
+                    self._client().chat.completions.create(model=model, messages=messages, **kwargs),
+                    self._remaining(deadline),
+                )
+                return completion.choices[0].message.content or ""
+            except Exception as e:
+                await self._sleep_before_retry(attempt, e, deadline)
+
+    async def stream(self, messages: List[Dict], model: str = DEFAULT_MODEL,
+                     timeout: float = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Yields text deltas as they arrive. Retries only happen before the first
+        token; the whole stream, chunks included, ends within `timeout` seconds
+        (asyncio.TimeoutError otherwise). Closing the generator early cancels
+        the remaining generation.
+        """
+        if not self.available:
+            raise RuntimeError("Groq API Key missing.")
+        deadline = self._deadline(timeout)
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await asyncio.wait_for(
+                    self._client().chat.completions.create(model=model, messages=messages, stream=True, **kwargs),
+                    self._remaining(deadline),
+                )
+                break
+            except Exception as e:
+                await self._sleep_before_retry(attempt, e, deadline)
+
+        try:
+            chunks = response.__aiter__()
+            while True:
+                # A stalled stream must not outlive the deadline any more than a slow connect
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), self._remaining(deadline))
+                except StopAsyncIteration:
+                    break
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await response.close()
+
+    async def warm(self):
+        """Open the TLS connection ahead of the first real call"""
+        if not self.available:
+            return
+        try:
+            await asyncio.wait_for(self._client().models.list(), self.timeout)
+            logger.info(f"🔥 Groq connection warmed (HTTP/2: {HTTP2})")
+        except Exception as e:
+            logger.warning(f"⚠️ Groq warm-up failed: {e}")
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._clients.clear()
+
+
+groq_pool = GroqPool(timeout=float(os.getenv("GROQ_TIMEOUT", "10")))
@@ -0,0 +1,115 @@
+"""
+SHARED HTTP CLIENT
+One pooled httpx.AsyncClient for tool network calls (search, weather,
+geolocation), same approach as the Groq pool in groq_client.py:
+
+- keep-alive connections (HTTP/2 when `h2` is installed): repeated calls skip
+  DNS, TCP and TLS setup
+- default timeouts, per-call override
+- at most HTTP_PER_HOST concurrent requests per host
+- GET/HEAD retried with jittered backoff on connection errors and 429/5xx
+"""
+import os
+import random
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - only needed for httpx HTTP/2 support
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "8"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "4"))
+HTTP_PER_HOST = int(os.getenv("HTTP_PER_HOST", "4"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+RETRY_STATUS = {429, 500, 502, 503, 504}
+RETRY_METHODS = {"GET", "HEAD"}
+
+
+class HttpPool:
+    def __init__(self, timeout: float = HTTP_TIMEOUT, per_host: int = HTTP_PER_HOST,
+                 max_retries: int = HTTP_RETRIES, backoff: float = 0.25, transport: httpx.AsyncBaseTransport = None):
+        self.timeout = timeout
+        self.per_host = per_host
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.transport = transport  # httpx.MockTransport when testing offline
+        self._client: Optional[httpx.AsyncClient] = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2 and self.transport is None,
+                timeout=httpx.Timeout(self.timeout, connect=HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120),
+                follow_redirects=True,
+                transport=self.transport,
+            )
+        return self._client
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    def _delay(self, attempt: int, response: httpx.Response = None) -> float:
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 5.0)
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    async def request(self, method: str, url: str, timeout: float = None, retries: int = None,
+                      **kwargs) -> httpx.Response:
+        """Sends through the shared client; raises httpx.HTTPError once retries run out"""
+        method = method.upper()
+        retries = self.max_retries if retries is None else retries
+        if method not in RETRY_METHODS:
+            retries = 0
+        limit = self._host_limit(httpx.URL(url).host)
+        if timeout is not None:
+            kwargs["timeout"] = httpx.Timeout(timeout, connect=min(timeout, HTTP_CONNECT_TIMEOUT))
+
+        for attempt in range(retries + 1):
+            self.requests += 1
+            response = None
+            try:
+                async with limit:
+                    response = await self.client().request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUS or attempt >= retries:
+                    return response
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                if attempt >= retries:
+                    self.failures += 1
+                    raise
+                error = repr(e)
+            self.retries += 1
+            delay = self._delay(attempt, response)
+            logger.warning(f"⚠️ {method} {httpx.URL(url).host} failed ({error}); "
+                           f"retry {attempt + 1}/{retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "retries": self.retries, "failures": self.failures}
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_pool = HttpPool()
@@ -0,0 +1,213 @@
+"""
+LOCAL INTENT ROUTER
+Deterministic fast path in front of the Groq planner. Compiled rules map
+unambiguous commands (English, Romanized Nepali/Hindi, Devanagari) straight
+to a tool call; anything else falls through to Groq.
+"""
+import json
+import re
+from typing import Optional
+
+# Known apps get high confidence for "open X"; unknown names fall through to Groq
+KNOWN_APPS = {
+    "notepad", "calculator", "chrome", "vlc", "command prompt", "cmd", "control panel",
+    "settings", "paint", "vs code", "vscode", "visual studio code", "postman", "word",
+    "excel", "powerpoint", "photoshop", "spotify", "whatsapp", "telegram", "discord",
+    "file explorer", "explorer", "task manager", "edge", "firefox", "terminal", "google chrome",
+}
+
+# Sites people "open" that are really URLs
+SITE_URLS = {
+    "youtube": "https://www.youtube.com",
+    "google": "https://www.google.com",
+    "facebook": "https://www.facebook.com",
+    "gmail": "https://mail.google.com",
+    "instagram": "https://www.instagram.com",
+    "github": "https://github.com",
+    "chatgpt": "https://chat.openai.com",
+    "maps": "https://maps.google.com",
+}
+
+THIS_WORDS = r"(?:this|that|it|yo|tyo|yah|yeh|ye|isko|yeslai|यो|त्यो|यह|इसे)"
+FILLER = re.compile(
+    r"\b(?:please|plz|jarvis|kripaya|zara|jara|na|ta|hai|ni|ki|now|ahile|abhi)\b|[?!.,।]",
+    re.IGNORECASE,
+)
+
+OPEN_EN = r"(?:open|launch|start|run)"
+OPEN_NE = r"(?:kholo|khol|kholnu|kholdeu|kholdinu|kholna|khola|khold[eo]|खोल|खोलो|खोल्नुस|खोलदेउ)"
+CLOSE_EN = r"(?:close|quit|exit|kill)"
+CLOSE_NE = r"(?:banda\s*gara|banda\s*gar|band\s*karo|band\s*kar|bandh\s*karo|banda|बन्द\s*गर|बंद\s*करो|बन्द)"
+MIN_EN = r"(?:minimi[sz]e|hide)"
+MIN_NE = r"(?:lukau|lukaideu|chhupao|chupao|minimi[sz]e\s*(?:gara|karo)|लुकाउ|छुपाओ)"
+PLAY_NE = r"(?:bajau|bajao|chalau|chalao|play\s*(?:gara|karo)|बजाउ|बजाओ|चलाउ|चलाओ)"
+SEARCH_NE = r"(?:search\s*(?:gara|karo|gar)|khoja|khojnu|khojdeu|खोज|सर्च\s*गर)"
+# "google chrome", "google maps": a product to open, not a search
+GOOGLE_APPS = (
+    r"(?:chrome|translate|maps|drive|docs|sheets|slides|meet|photos|calendar|"
+    r"lens|earth|classroom|play|keep|gemini|assistant)"
+)
+# Realtime facts the planner answers with google_search. Only nouns that need a lookup:
+# "today"/"current"/"aaj" alone are small talk ("how are you today")
+REALTIME_WORDS = (
+    r"(?:prices?|rates?|news|headlines|weather|forecast|stocks?|share\s+price|"
+    r"net\s*worth|scores?|who\s+won|mausam|khabar|samachar|bhau|"
+    r"मौसम|समाचार|खबर|भाउ)"
+)
+# Actions, and questions answered without a web search (clock, system, memory)
+NOT_REALTIME = (
+    rf"(?:play|type|write|lekha|{PLAY_NE}|{OPEN_EN}|{OPEN_NE}|"
+    r"time|date|samay|baje|volume|brightness|battery|remind|remember|talked|said|yaad|"
+    r"समय|बजे|आवाज)"
+)
+
+RULES = [
+    # Volume: absolute level
+    ("volume_level", re.compile(
+        r"^(?:set\s+)?(?:the\s+)?(?:volume|sound|awaz|aawaj|aawaz|आवाज|भोल्युम)\s*(?:to|lai|ko|ma|)?\s*(?P<n>\d{1,3})\s*(?:%|percent|pratishat)?\s*(?:gara|karo|garnu|kar|गर)?$"
+        r"|^(?P<n2>\d{1,3})\s*(?:%|percent)?\s*(?:volume|awaz|aawaj|आवाज)\s*(?:gara|karo|kar|गर)?$",
+        re.IGNORECASE), 0.97),
+    ("volume_mute", re.compile(
+        r"^(?:(?:volume|sound|awaz|aawaj)\s+)?(?P<m>mute|unmute)(?:\s+(?:gara|karo|kar|the\s+volume|volume))?$",
+        re.IGNORECASE), 0.96),
+    ("volume_up", re.compile(
+        r"^(?:volume|sound|awaz|aawaj|आवाज)\s+(?:up|badhau|badhao|badha|tez\s*karo|thulo\s*gara|बढाउ)$"
+        r"|^(?:increase|raise|turn\s+up)\s+(?:the\s+)?(?:volume|sound)$",
+        re.IGNORECASE), 0.93),
+    ("volume_down", re.compile(
+        r"^(?:volume|sound|awaz|aawaj|आवाज)\s+(?:down|ghatau|ghatao|kam\s*karo|kam\s*gara|sano\s*gara|घटाउ)$"
+        r"|^(?:decrease|lower|turn\s+down)\s+(?:the\s+)?(?:volume|sound)$",
+        re.IGNORECASE), 0.93),
+    # Speed test
+    ("speedtest", re.compile(
+        r"^(?:check\s+)?(?:internet|net|wifi)\s*speed\s*(?:test|check)?\s*(?:gara|karo|kar)?$"
+        r"|^speed\s*test$", re.IGNORECASE), 0.95),
+    # YouTube playback (a play verb is required: "X on youtube" may be a question)
+    ("youtube_play", re.compile(
+        rf"^(?:play|{PLAY_NE})\s+(?P<q>.+?)\s+(?:on|in)\s+youtube$"
+        rf"|^youtube\s+(?:ma|par|pe|mein|मा)\s+(?P<q2>.+?)\s+{PLAY_NE}$"
+        rf"|^(?P<q3>.+?)\s+youtube\s+(?:ma|par|pe|mein|मा)\s+{PLAY_NE}$",
+        re.IGNORECASE), 0.95),
+    # Close / minimize / maximize / open
+    ("close", re.compile(
+        rf"^{CLOSE_EN}\s+(?:the\s+)?(?P<x>.+?)(?:\s+window|\s+app)?$"
+        rf"|^(?P<x2>.+?)\s+{CLOSE_NE}$",
+        re.IGNORECASE), 0.93),
+    ("minimize", re.compile(
+        rf"^{MIN_EN}\s+(?:the\s+)?(?P<x>.+?)(?:\s+window)?$"
+        rf"|^(?P<x2>.+?)\s+{MIN_NE}$",
+        re.IGNORECASE), 0.93),
+    ("maximize", re.compile(
+        r"^(?:maximi[sz]e|restore)\s+(?:the\s+)?(?P<x>.+?)(?:\s+window)?$"
+        r"|^(?P<x2>.+?)\s+(?:maximi[sz]e|thulo)\s*(?:gara|karo)$",
+        re.IGNORECASE), 0.93),
+    ("open", re.compile(
+        rf"^{OPEN_EN}\s+(?:the\s+)?(?P<x>.+?)(?:\s+app)?$"
+        rf"|^(?P<x2>.+?)\s+{OPEN_NE}$",
+        re.IGNORECASE), 0.95),
+    # Explicit search (last, so "google chrome kholo" is an open); "... on youtube" is Groq's call
+    ("search", re.compile(
+        rf"^(?!.*\s(?:on|in)\s+youtube$)(?:search|google(?!\s+{GOOGLE_APPS}(?!\w)))\s+(?:for\s+)?(?P<q>.+)$"
+        rf"|^(?P<q2>.+?)\s+(?:google\s+ma\s+)?{SEARCH_NE}$",
+        re.IGNORECASE), 0.92),
+    # Realtime question: a prediction only (below ROUTER_THRESHOLD, Groq still decides),
+    # used to start the search early (speculative.py)
+    ("realtime", re.compile(
+        rf"^(?!.*(?<!\w){NOT_REALTIME}(?!\w))(?P<q>.*(?<!\w){REALTIME_WORDS}(?!\w).*)$",
+        re.IGNORECASE), 0.6),
+]
+
+
+class RouteMatch:
+    def __init__(self, tool: str, args: list, confidence: float, rule: str):
+        self.tool = tool
+        self.args = args
+        self.confidence = confidence
+        self.rule = rule
+
+    def to_call(self) -> str:
+        """Render as the planner's output format: function_name("arguments")"""
+        return f"{self.tool}({', '.join(json.dumps(a, ensure_ascii=False) for a in self.args)})"
+
+    def __repr__(self):
+        return f"RouteMatch({self.to_call()}, confidence={self.confidence}, rule={self.rule})"
+
+
+def _clean(text: str) -> str:
+    return " ".join(FILLER.sub(" ", text).split())
+
+def _group(match, *names) -> str:
+    for name in names:
+        value = match.group(name) if name in match.re.groupindex else None
+        if value:
+            return value.strip()
+    return ""
+
+def _is_this(name: str) -> bool:
+    return re.fullmatch(THIS_WORDS, name, re.IGNORECASE) is not None
+
+def _window_confidence(name: str, confidence: float) -> float:
+    """Window commands are only trusted for known apps; the rest go to Groq"""
+    lowered = name.lower()
+    if lowered in KNOWN_APPS or lowered in {"youtube", "browser"}:
+        return confidence
+    return 0.7
+
+
+def route_intent(query: str, active_title: str = "") -> Optional[RouteMatch]:
+    """
+    Returns the best local route for the query, or None to fall through to Groq.
+    active_title is the foreground window's title: "close this" targets it.
+    """
+    text = _clean(query)
+    if not text or " and " in f" {text.lower()} " or " ani " in f" {text.lower()} ":
+        return None  # Multi-action requests are left to the planner
+
+    for rule, pattern, confidence in RULES:
+        match = pattern.match(text)
+        if not match:
+            continue
+
+        if rule == "volume_level":
+            level = int(_group(match, "n", "n2"))
+            if level > 100:
+                return None
+            return RouteMatch("system_control_tool", [f"volume {level}"], confidence, rule)
+        if rule == "volume_mute":
+            return RouteMatch("system_control_tool", [_group(match, "m").lower()], confidence, rule)
+        if rule == "volume_up":
+            return RouteMatch("system_control_tool", ["volume up"], confidence, rule)
+        if rule == "volume_down":
+            return RouteMatch("system_control_tool", ["volume down"], confidence, rule)
+        if rule == "speedtest":
+            return RouteMatch("open_url", ["https://fast.com"], confidence, rule)
+        if rule == "youtube_play":
+            return RouteMatch("play_youtube_tool", [_group(match, "q", "q2", "q3")], confidence, rule)
+        if rule in ("search", "realtime"):
+            q = _group(match, "q", "q2")
+            if _is_this(q):
+                return None  # "google it": what "it" is lives in the conversation
+            return RouteMatch("google_search", [q], confidence, rule)
+
+        name = _group(match, "x", "x2")
+        if not name or len(name.split()) > 4:
+            return None
+        if rule in ("close", "minimize", "maximize"):
+            if _is_this(name):
+                if not active_title.strip():
+                    return None
+                # The window tools match titles, so "this" becomes the foreground window's title
+                target, confidence = active_title.strip(), confidence
+            else:
+                target, confidence = name, _window_confidence(name, confidence)
+            tool = {"close": "close_app", "minimize": "minimize_window", "maximize": "maximize_window"}[rule]
+            return RouteMatch(tool, [target], confidence, rule)
+        if rule == "open":
+            lowered = name.lower()
+            if lowered in SITE_URLS:
+                return RouteMatch("open_url", [SITE_URLS[lowered]], confidence, rule)
+            if lowered in KNOWN_APPS:
+                return RouteMatch("open_app", [name.title()], confidence, rule)
+            # Unknown app, folder or website: let Groq decide
+            return RouteMatch("open_app", [name.title()], 0.7, rule)
+    return None
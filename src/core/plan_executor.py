@@ -0,0 +1,138 @@
+"""
+PLAN EXECUTOR
+Validates parsed ToolCalls against each tool's signature and runs a plan.
+Calls that share a resource (the foreground window, keyboard focus) run in
+plan order; everything else runs concurrently with asyncio.gather.
+"""
+import asyncio
+import inspect
+import logging
+import typing
+from typing import Dict, List, Optional
+
+from src.core.plan_parser import ToolCall
+
+logger = logging.getLogger(__name__)
+
+# Tools that move focus or type into it: "open notepad" then "type hello" must not overlap
+FOREGROUND = "foreground"
+
+
+class PlanValidationError(ValueError):
+    pass
+
+
+def _coerce(tool: str, param: str, value, expected):
+    """Checks a literal against the annotation; widens int -> float and numbers -> str"""
+    if expected in (None, inspect.Parameter.empty, typing.Any):
+        return value
+    if expected is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if expected is str and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(expected, type) and not isinstance(value, expected):
+        raise PlanValidationError(
+            f"{tool}(): '{param}' expects {expected.__name__}, got {type(value).__name__}"
+        )
+    return value
+
+
+class ToolSpec:
+    def __init__(self, name: str, fn, resource: Optional[str] = None):
+        self.name = name
+        self.fn = fn
+        self.resource = resource
+        target = inspect.unwrap(fn)
+        self.signature = inspect.signature(target)
+        try:
+            self.hints = typing.get_type_hints(target)
+        except Exception:
+            self.hints = {}
+
+    def bind(self, call: ToolCall) -> inspect.BoundArguments:
+        try:
+            bound = self.signature.bind(*call.args, **call.kwargs)
+        except TypeError as e:
+            raise PlanValidationError(f"{call.name}(): {e}") from e
+        for param, value in bound.arguments.items():
+            bound.arguments[param] = _coerce(call.name, param, value, self.hints.get(param))
+        return bound
+
+
+def _failed(result) -> bool:
+    return isinstance(result, str) and result.lstrip().startswith(("❌", "⏭️"))
+
+
+class PlanRun:
+    """
+    One plan in flight. submit() starts a call right away, chained behind the
+    previous call on the same resource, so a streaming planner can dispatch
+    each call as it arrives. results() waits for all of them in plan order.
+    """
+
+    def __init__(self, executor: "PlanExecutor"):
+        self.executor = executor
+        self.sources: List[str] = []
+        self._tasks: List[asyncio.Task] = []
+        self._tails: Dict[str, asyncio.Task] = {}
+        self._errors: List[str] = []
+
+    def __len__(self):
+        return len(self._tasks) + len(self._errors)
+
+    def submit(self, call: ToolCall) -> bool:
+        try:
+            spec, bound = self.executor.validate_call(call)
+        except PlanValidationError as e:
+            logger.error(f"❌ Rejected plan step {call}: {e}")
+            self._errors.append(f"❌ {e}")
+            return False
+
+        previous = self._tails.get(spec.resource) if spec.resource else None
+        task = asyncio.create_task(self._run_step(spec, bound, call, previous))
+        if spec.resource:
+            self._tails[spec.resource] = task
+        self._tasks.append(task)
+        self.sources.append(call.source or repr(call))
+        return True
+
+    async def _run_step(self, spec: ToolSpec, bound: inspect.BoundArguments, call: ToolCall,
+                        previous: Optional[asyncio.Task]):
+        if previous is not None and _failed(await previous):
+            # Don't type into whatever window happens to be in front
+            return f"⏭️ Skipped {call}: previous step failed"
+        try:
+            return await spec.fn(*bound.args, **bound.kwargs)
+        except Exception as e:
+            logger.error(f"❌ Plan step {call} failed: {e}")
+            return f"❌ {call.name} failed: {e}"
+
+    async def results(self) -> List[str]:
+        results = list(await asyncio.gather(*self._tasks)) if self._tasks else []
+        return results + self._errors
+
+
+class PlanExecutor:
+    def __init__(self, specs: List[ToolSpec]):
+        self.specs = {spec.name: spec for spec in specs}
+
+    def validate_call(self, call: ToolCall):
+        spec = self.specs.get(call.name)
+        if spec is None:
+            raise PlanValidationError(f"Unknown tool: {call.name}")
+        return spec, spec.bind(call)
+
+    def validate(self, calls: List[ToolCall]):
+        """Raises PlanValidationError before anything runs"""
+        for call in calls:
+            self.validate_call(call)
+
+    def start(self) -> PlanRun:
+        return PlanRun(self)
+
+    async def run(self, calls: List[ToolCall]) -> List[str]:
+        self.validate(calls)
+        plan = self.start()
+        for call in calls:
+            plan.submit(call)
+        return await plan.results()
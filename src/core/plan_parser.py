@@ -0,0 +1,168 @@
+"""
+PLAN PARSER
+Turns planner output like `open_app("Notepad")` into ToolCalls without eval().
+A plan may hold several calls, one per line. StreamingCallParser does the same
+incrementally, so each call can be dispatched the moment its closing
+parenthesis arrives.
+"""
+import ast
+import re
+from typing import List, Optional
+
+CALL_START = re.compile(r"^\s*(?:`{1,3}(?:python|py)?\s*)?[A-Za-z_]\w*\s*\(")
+FENCE = re.compile(r"```(?:python|py)?|`")
+
+
+class PlanParseError(ValueError):
+    pass
+
+
+class ToolCall:
+    def __init__(self, name: str, args: list, kwargs: dict, source: str = ""):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.source = source
+
+    def __repr__(self):
+        return self.source or f"{self.name}(*{self.args!r}, **{self.kwargs!r})"
+
+
+def strip_markdown(text: str) -> str:
+    """Strip potential markdown code blocks (triples and singles)"""
+    return FENCE.sub("", text).strip()
+
+
+def looks_like_call(text: str) -> bool:
+    return bool(CALL_START.match(text))
+
+
+def call_from_node(node: ast.AST, source: str = "") -> ToolCall:
+    """ast.Call with a plain name and literal arguments -> ToolCall"""
+    if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name):
+        raise PlanParseError(f"Not a plain function call: {source!r}")
+    try:
+        args = [ast.literal_eval(arg) for arg in node.args]
+        kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in node.keywords if kw.arg}
+    except ValueError as e:
+        raise PlanParseError(f"Only literal arguments are allowed: {source!r}") from e
+    if any(kw.arg is None for kw in node.keywords):
+        raise PlanParseError(f"**kwargs are not allowed: {source!r}")
+    return ToolCall(node.func.id, args, kwargs, source)
+
+
+def parse_call(text: str) -> ToolCall:
+    """Parse one call expression; raises PlanParseError if it is anything else"""
+    source = strip_markdown(text)
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise PlanParseError(f"Invalid call syntax: {source!r}") from e
+    return call_from_node(tree.body, source)
+
+
+def parse_plan(text: str) -> List[ToolCall]:
+    """Parse a plan of one or more calls (newline or ';' separated)"""
+    source = strip_markdown(text)
+    try:
+        tree = ast.parse(source, mode="exec")
+    except SyntaxError as e:
+        raise PlanParseError(f"Invalid plan syntax: {source!r}") from e
+    calls = []
+    for stmt in tree.body:
+        segment = ast.get_source_segment(source, stmt) or ""
+        if not isinstance(stmt, ast.Expr):
+            raise PlanParseError(f"Only calls are allowed in a plan: {segment!r}")
+        calls.append(call_from_node(stmt.value, segment))
+    if not calls:
+        raise PlanParseError("Empty plan")
+    return calls
+
+
+class StreamingCallParser:
+    """
+    Feed token deltas; feed() returns the ToolCalls completed by that delta,
+    so each call of a multi-line plan is available as soon as it closes. Tracks string literals and bracket depth,
+    so parentheses inside arguments don't end the call early.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._start = None     # Index where the current call expression begins
+        self._depth = 0
+        self._quote = None     # Active string delimiter
+        self._escaped = False
+        self._last_end = None  # Index just past the last completed call
+
+    @property
+    def plan_complete(self) -> bool:
+        """
+        True once calls were seen and the text after the last one can't start
+        another call (a closing ``` fence or prose), so the rest of the stream is
+        explanation and can be cancelled.
+        """
+        if self._last_end is None or self._depth:
+            return False
+        tail = self.text[self._last_end:].lstrip()
+        if tail.startswith("```"):
+            return True
+        # List markers and inline-code backticks may come before the next call
+        tail = re.sub(r"^[\s;`]*(?:(?:\d+[.)]|[-*])\s+`?)?", "", tail)
+        if not tail or re.fullmatch(r"(?:\d+[.)]?|[-*])", tail):
+            return False
+        # Still possibly the next call: a name, optionally followed by its "("
+        return not re.match(r"^[A-Za-z_]\w*(?:\s*\(.*)?\s*$", tail, re.DOTALL)
+
+    @property
+    def is_call(self) -> Optional[bool]:
+        """True/False once the output is recognisably a call or chat text, None while unsure"""
+        stripped = strip_markdown(self.text)
+        if looks_like_call(self.text) or looks_like_call(stripped):
+            return True
+        if re.match(r"^\s*[A-Za-z_]\w*\s*$", stripped) or not stripped:
+            return None
+        return False
+
+    def feed(self, delta: str) -> List[ToolCall]:
+        self.text += delta
+        calls = []
+        while self._pos < len(self.text):
+            ch = self.text[self._pos]
+            self._pos += 1
+
+            if self._quote:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == self._quote:
+                    self._quote = None
+                continue
+
+            if self._depth == 0:
+                if ch.isalnum() or ch == "_":
+                    # A new word starts a new candidate name
+                    if self._start is None or self.text[self._pos - 2].isspace():
+                        self._start = self._pos - 1
+                elif ch == "(" and self._start is not None:
+                    self._depth = 1
+                elif not ch.isspace():
+                    self._start = None
+                continue
+
+            if ch in "\"'":
+                self._quote = ch
+            elif ch in "([{":
+                self._depth += 1
+            elif ch in ")]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        calls.append(parse_call(self.text[self._start:self._pos]))
+                        self._last_end = self._pos
+                    except PlanParseError:
+                        # Not a call after all (e.g. prose with brackets); keep scanning
+                        pass
+                    self._start = None
+        return calls
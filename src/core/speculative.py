@@ -0,0 +1,255 @@
+"""
+SPECULATIVE SEARCH
+A realtime question ("bitcoin price today") goes: user stops talking -> Gemini
+says "Checking..." -> ask_groq_planner -> Groq plan -> google_search -> answer.
+The search only needs the question, so it is started early:
+
+- from the final user transcript, when the local router predicts google_search
+- from ask_groq_planner's query, before Groq is asked (same prediction)
+- the streaming planner already dispatches google_search(...) as soon as it's parsed
+
+The formal google_search call then claims the prefetched results if its query
+is the same question (fuzzy match), instead of sending its own request.
+AnswerClock measures transcript -> answer speech for turns that searched.
+"""
+import os
+import re
+import time
+import asyncio
+import logging
+import statistics
+from typing import Awaitable, Callable, List, Optional
+
+from src.core.intent_router import route_intent
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_SEARCH = os.getenv("SPECULATIVE_SEARCH", "1") != "0"
+# How long a prefetch may wait for its formal call
+SPECULATIVE_WINDOW = float(os.getenv("SPECULATIVE_WINDOW", "20"))
+# Ordered similarity (fuzz.ratio) needed to treat the planner's query as the same question:
+# high, so only spelling and spacing may differ ("bit coin" / "bitcoin")
+SPECULATIVE_MATCH = float(os.getenv("SPECULATIVE_MATCH", "90"))
+
+# Question words and freshness words the planner likes to add ("... live 2025")
+STOP_WORDS = {
+    "what", "whats", "is", "are", "was", "the", "a", "an", "of", "in", "on", "for", "to", "me", "tell",
+    "how", "much", "many", "who", "please", "ko", "k", "ke", "kati", "kasto", "cha", "ho", "hai", "kya",
+    "live", "latest", "current", "today", "now", "aaj", "aaja", "ahile", "update", "updates",
+}
+YEAR = re.compile(r"^(?:19|20)\d\d$")
+NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def search_terms(query: str) -> str:
+    """Lowercased content words in order: what two phrasings of one question share"""
+    words = re.sub(r"[^\w\s.]|\.(?!\d)", " ", query.lower()).split()
+    return " ".join(w for w in words if w not in STOP_WORDS and not YEAR.match(w))
+
+
+def same_question(a: str, b: str, threshold: float = SPECULATIVE_MATCH) -> bool:
+    """Word order and numbers must agree: "usd to npr" isn't "npr to usd", "iphone 15" isn't "iphone 16" """
+    terms_a, terms_b = search_terms(a), search_terms(b)
+    if not terms_a or not terms_b:
+        return False
+    if NUMBER.findall(terms_a) != NUMBER.findall(terms_b):
+        return False
+    if fuzz is None:
+        return terms_a == terms_b
+    return fuzz.ratio(terms_a, terms_b) >= threshold
+
+
+def predict_search(text: str) -> Optional[str]:
+    """The search the planner will most likely run for this utterance, or None"""
+    route = route_intent(text)
+    if route and route.tool == "google_search" and route.args and route.args[0]:
+        return route.args[0]
+    return None
+
+
+class Speculation:
+    def __init__(self, query: str, source: str, task: asyncio.Task):
+        self.query = query
+        self.source = source
+        self.task = task
+        self.started = time.perf_counter()
+        self.claimed = False
+
+    def expired(self, window: float) -> bool:
+        return time.perf_counter() - self.started > window
+
+    def failed(self) -> bool:
+        return self.task.done() and (self.task.cancelled() or self.task.exception() is not None)
+
+
+class SearchSpeculator:
+    def __init__(self, fetch: Callable[[str], Awaitable], window: float = SPECULATIVE_WINDOW,
+                 threshold: float = SPECULATIVE_MATCH):
+        self.fetch = fetch
+        self.window = window
+        self.threshold = threshold
+        self._pending: List[Speculation] = []
+        self.started = 0
+        self.claimed = 0
+        self.wasted = 0
+        self.head_starts: List[float] = []
+
+    def _prune(self):
+        live = []
+        for spec in self._pending:
+            if spec.expired(self.window):
+                if not spec.claimed:
+                    self.wasted += 1
+                    logger.debug(f"🗑️ Unused prefetch: '{spec.query}' ({spec.source})")
+            else:
+                live.append(spec)
+        self._pending = live
+
+    def _match(self, query: str) -> Optional[Speculation]:
+        self._prune()
+        for spec in reversed(self._pending):
+            if not spec.failed() and same_question(spec.query, query, self.threshold):
+                return spec
+        return None
+
+    def start(self, query: str, source: str = "router") -> Optional[asyncio.Task]:
+        """Starts fetching results for query unless the same question is already in flight"""
+        if not SPECULATIVE_SEARCH or not query:
+            return None
+        spec = self._match(query)
+        if spec is None:
+            spec = Speculation(query, source, asyncio.create_task(self.fetch(query)))
+            # Nobody may ever await it: don't let a failed prefetch log "exception never retrieved"
+            spec.task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._pending.append(spec)
+            self.started += 1
+            print(f"🔮 Prefetching search ({source}): '{query}'")
+        return spec.task
+
+    def speculate(self, text: str, source: str = "router") -> Optional[str]:
+        """predict_search + start; returns the predicted query"""
+        query = predict_search(text)
+        if query:
+            self.start(query, source)
+        return query
+
+    async def take(self, query: str):
+        """Results prefetched for this question, or None (nothing matched, or the prefetch failed)"""
+        spec = self._match(query)
+        if spec is None:
+            return None
+        if not spec.claimed:
+            spec.claimed = True
+            self.claimed += 1
+            self.head_starts.append(time.perf_counter() - spec.started)
+        try:
+            # Shielded: a cancelled tool call must not cancel a prefetch other calls share
+            results = await asyncio.shield(spec.task)
+        except Exception as e:
+            logger.warning(f"⚠️ Prefetch for '{spec.query}' failed ({e}); searching again")
+            return None
+        print(f"🔮 Using prefetched search '{spec.query}' for '{query}'")
+        return results
+
+    def stats(self) -> dict:
+        self._prune()
+        return {
+            "started": self.started,
+            "claimed": self.claimed,
+            "wasted": self.wasted,
+            # How far ahead of the formal call the prefetch started
+            "head_start_ms": round(statistics.mean(self.head_starts) * 1000) if self.head_starts else 0,
+        }
+
+
+class AnswerClock:
+    """
+    End-to-end time-to-answer for realtime facts: final user transcript ->
+    agent starts speaking after a search result came back.
+    """
+
+    def __init__(self):
+        self._heard_at: Optional[float] = None
+        self._result_at: Optional[float] = None
+        self._prefetched = False
+        self.samples = {True: [], False: []}  # prefetched -> [(result_s, answer_s)]
+
+    def heard(self):
+        self._heard_at = time.perf_counter()
+        self._result_at = None
+        self._prefetched = False
+
+    def result_ready(self, prefetched: bool):
+        if self._heard_at is not None and self._result_at is None:
+            self._result_at = time.perf_counter()
+            self._prefetched = prefetched
+
+    def speaking(self):
+        if self._heard_at is None or self._result_at is None:
+            return  # Filler speech, or a turn without a search
+        now = time.perf_counter()
+        result_s, answer_s = self._result_at - self._heard_at, now - self._heard_at
+        self.samples[self._prefetched].append((result_s, answer_s))
+        print(f"⏱️ Time to answer: {answer_s * 1000:.0f} ms (search result at {result_s * 1000:.0f} ms, "
+              f"{'prefetched' if self._prefetched else 'not prefetched'})")
+        self._heard_at = self._result_at = None
+
+    def stats(self) -> dict:
+        summary = {}
+        for prefetched, samples in self.samples.items():
+            if samples:
+                answers = [a for _, a in samples]
+                summary["prefetched" if prefetched else "direct"] = {
+                    "turns": len(samples),
+                    "result_ms": round(statistics.median(r for r, _ in samples) * 1000),
+                    "answer_ms_p50": round(statistics.median(answers) * 1000),
+                    "answer_ms_max": round(max(answers) * 1000),
+                }
+        return summary
+
+
+def attach(session):
+    """Prefetch from final user transcripts and time answers (call before session.start)"""
+    speculator, clock = get_speculator(), get_answer_clock()
+
+    def on_transcript(event):
+        if event.is_final and event.transcript.strip():
+            clock.heard()
+            speculator.speculate(event.transcript, source="transcript")
+
+    def on_state(event):
+        if event.new_state == "speaking":
+            clock.speaking()
+
+    session.on("user_input_transcribed", on_transcript)
+    session.on("agent_state_changed", on_state)
+
+
+async def _fetch_search(query: str):
+    # Lazy: the search tool module (livekit, dotenv) loads off the event loop
+    from src.tools.registry import import_module
+    module = await asyncio.to_thread(import_module, "src.tools.google_search")
+    return await module.prefetch_items(query)
+
+
+_speculator: Optional[SearchSpeculator] = None
+_clock: Optional[AnswerClock] = None
+
+
+def get_speculator() -> SearchSpeculator:
+    global _speculator
+    if _speculator is None:
+        _speculator = SearchSpeculator(_fetch_search)
+    return _speculator
+
+
+def get_answer_clock() -> AnswerClock:
+    global _clock
+    if _clock is None:
+        _clock = AnswerClock()
+    return _clock
@@ -0,0 +1,207 @@
+"""
+STARTUP CONTEXT
+City and weather for the system prompt, without holding up the first greeting:
+
+- the agent starts with a placeholder built from the disk cache (stale values
+  allowed, no network), and the real values are patched in when they arrive
+- ipinfo / OpenWeather are async with deadlines; a stale cached city lets the
+  weather fetch start at the same time as the city refresh
+- results are cached in Data/startup_cache.json with a TTL (24 h for the city,
+  30 min for the weather)
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Awaitable, Callable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+STARTUP_CACHE_PATH = os.getenv("STARTUP_CACHE_PATH", os.path.join("Data", "startup_cache.json"))
+STARTUP_CITY_TTL = float(os.getenv("STARTUP_CITY_TTL", str(24 * 3600)))
+STARTUP_WEATHER_TTL = float(os.getenv("STARTUP_WEATHER_TTL", "1800"))
+# How long the greeting waits for fresh data before going out with the placeholder
+STARTUP_GREETING_WAIT = float(os.getenv("STARTUP_GREETING_WAIT", "1.0"))
+
+UNKNOWN = "Unknown"
+
+
+class StartupInfo(NamedTuple):
+    datetime: str
+    city: str
+    weather: Optional[str]
+    fresh: bool          # False for the placeholder built from cache only
+
+
+def current_datetime() -> str:
+    return datetime.now().strftime("%d %B %Y, %I:%M %p")  # Example: 31 July 2025, 04:22 PM
+
+
+class DiskTTLCache:
+    """Small JSON key -> (value, expires) store; expired values are still readable as stale"""
+
+    def __init__(self, path: str = STARTUP_CACHE_PATH):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def get(self, key: str, allow_stale: bool = False):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        return value if allow_stale or expires > time.time() else None
+
+    def put(self, key: str, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {k: list(v) for k, v in self._entries.items()}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save startup cache: {e}")
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = {k: (v[0], v[1]) for k, v in data.items()}
+        except (OSError, ValueError, IndexError, TypeError) as e:
+            logger.warning(f"⚠️ Could not load startup cache: {e}")
+
+
+async def default_fetch_city() -> str:
+    from src.tools.weather import fetch_city
+    return await fetch_city()
+
+
+async def default_fetch_weather(city: str) -> Optional[str]:
+    # Same cache as the get_weather tool: asking "weather?" right after startup is free
+    from src.tools.weather import current_weather
+    if not os.getenv("OPENWEATHER_API_KEY"):
+        return None
+    return await current_weather(city)
+
+
+class StartupPipeline:
+    def __init__(self, cache: DiskTTLCache = None,
+                 fetch_city: Callable[[], Awaitable[str]] = default_fetch_city,
+                 fetch_weather: Callable[[str], Awaitable[Optional[str]]] = default_fetch_weather):
+        self.cache = cache if cache is not None else DiskTTLCache()
+        self.fetch_city = fetch_city
+        self.fetch_weather = fetch_weather
+        self._city_task: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[StartupInfo], None]] = []
+
+    def placeholder(self) -> StartupInfo:
+        """Whatever the cache has, however old: never touches the network"""
+        city = self.cache.get("city", allow_stale=True) or UNKNOWN
+        weather = self.cache.get(f"weather:{city.lower()}", allow_stale=True)
+        return StartupInfo(current_datetime(), city, weather, fresh=False)
+
+    async def _refresh_city(self) -> str:
+        try:
+            city = await self.fetch_city()
+        except Exception as e:
+            logger.warning(f"⚠️ City lookup failed: {e}")
+            city = UNKNOWN
+        if city and city != UNKNOWN:
+            self.cache.put("city", city, STARTUP_CITY_TTL)
+        return city or UNKNOWN
+
+    async def city(self) -> str:
+        """Fresh cached city, else one lookup shared by all callers"""
+        cached = self.cache.get("city")
+        if cached:
+            return cached
+        if self._city_task is None or self._city_task.done():
+            self._city_task = asyncio.create_task(self._refresh_city())
+        city = await asyncio.shield(self._city_task)
+        return city if city != UNKNOWN else self.cache.get("city", allow_stale=True) or UNKNOWN
+
+    async def weather(self, city: str) -> Optional[str]:
+        key = f"weather:{city.lower()}"
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+        try:
+            weather = await self.fetch_weather(city)
+        except Exception as e:
+            logger.warning(f"⚠️ Startup weather failed: {e}")
+            weather = None
+        if weather:
+            self.cache.put(key, weather, STARTUP_WEATHER_TTL)
+        return weather or self.cache.get(key, allow_stale=True)
+
+    async def _load(self) -> StartupInfo:
+        started = time.perf_counter()
+        stale_city = self.cache.get("city", allow_stale=True)
+        city_task = asyncio.create_task(self.city())
+        if stale_city and stale_city != UNKNOWN:
+            # City rarely changes: fetch its weather while the city is re-checked
+            weather_task = asyncio.create_task(self.weather(stale_city))
+            city = await city_task
+            weather = await weather_task if city == stale_city else await self.weather(city)
+        else:
+            city = await city_task
+            weather = await self.weather(city) if city != UNKNOWN else None
+
+        info = StartupInfo(current_datetime(), city, weather, fresh=True)
+        logger.info(f"🌆 Startup context ready in {(time.perf_counter() - started) * 1000:.0f} ms "
+                    f"(city: {city}, weather: {'yes' if weather else 'no'})")
+        for listener in list(self._listeners):
+            try:
+                listener(info)
+            except Exception as e:
+                logger.error(f"❌ Startup listener failed: {e}")
+        return info
+
+    def start(self, refresh: bool = False) -> asyncio.Task:
+        """Begins loading in the background; refresh=True starts over once a previous load is done"""
+        if self._task is None or (refresh and self._task.done()):
+            self._task = asyncio.create_task(self._load())
+        return self._task
+
+    async def wait(self, timeout: float) -> StartupInfo:
+        """Fresh info if it arrives within timeout, else the placeholder (loading continues)"""
+        task = self.start()
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            return self.placeholder()
+
+    def on_ready(self, listener: Callable[[StartupInfo], None]):
+        """listener(info) once fresh info is in; called right away if it already is"""
+        if self._task is not None and self._task.done() and not self._task.cancelled() \
+                and self._task.exception() is None:
+            listener(self._task.result())
+        else:
+            self._listeners.append(listener)
+
+
+# Singleton Instance
+_startup: Optional[StartupPipeline] = None
+
+def get_startup() -> StartupPipeline:
+    global _startup
+    if _startup is None:
+        _startup = StartupPipeline()
+    return _startup
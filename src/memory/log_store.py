@@ -0,0 +1,343 @@
+import json
+import os
+import threading
+import time
+import logging
+from typing import List, Dict, Optional, Tuple
+from .records import conversation_key, message_text, timestamp_seconds
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl"
+
+
+class SegmentedLogStore:
+    """
+    Append-only conversation log split into JSONL segments.
+
+    Every save is a single line appended to the active segment, so the cost of a
+    save does not depend on how much history exists. An in-memory key index
+    handles dedup, and replaced records are dropped by compaction. Every append is
+    flushed to the OS; only fsync is batched (every fsync_every records, or
+    fsync_interval seconds after the first unsynced write, by a timer if idle).
+
+    Record format (one JSON object per line):
+        {"op": "put", "conv": {...}}      -> new conversation
+        {"op": "replace", "conv": {...}}  -> replaces the last live conversation
+        {"op": "base", "supersedes": N}   -> first line of a compacted segment;
+                                             segments numbered <= N are obsolete
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 4 * 1024 * 1024,
+                 fsync_every: int = 32, fsync_interval: float = 1.0,
+                 compact_min_dead: int = 500):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_min_dead = compact_min_dead
+
+        self._lock = threading.RLock()
+        self._keys = set()
+        self._last: Optional[Dict] = None
+        self._live = 0
+        self._dead = 0
+        self._pending_sync = 0
+        self._last_sync = time.monotonic()
+        self._sync_timer: Optional[threading.Timer] = None
+        self._file = None
+        self._segment_no = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._rebuild_index()
+        self._open_active_segment()
+
+    # -------------------------
+    # Segment helpers
+    # -------------------------
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{number:06d}{SEGMENT_SUFFIX}")
+
+    def _segment_numbers(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SEGMENT_SUFFIX) and name[:-len(SEGMENT_SUFFIX)].isdigit():
+                numbers.append(int(name[:-len(SEGMENT_SUFFIX)]))
+        return sorted(numbers)
+
+    def _live_segments(self) -> List[int]:
+        """Segments that are not superseded by a compacted base segment"""
+        numbers = self._segment_numbers()
+        for number in reversed(numbers):
+            header = self._read_header(number)
+            if header and header.get("op") == "base":
+                return [n for n in numbers if n >= number]
+        return numbers
+
+    def _read_header(self, number: int) -> Optional[Dict]:
+        try:
+            with open(self._segment_path(number), "r", encoding="utf-8") as f:
+                first = f.readline()
+            return json.loads(first) if first.strip() else None
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _iter_records(self):
+        """Yields (segment_no, record) for every record in live segments, oldest first"""
+        for number in self._live_segments():
+            path = self._segment_path(number)
+            valid_bytes = 0
+            with open(path, "rb") as f:
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # Torn write from a crash
+                    try:
+                        record = json.loads(raw)
+                    except json.JSONDecodeError:
+                        break
+                    valid_bytes += len(raw)
+                    yield number, record
+            # Drop a torn tail so the next append starts on a clean line
+            if valid_bytes < os.path.getsize(path):
+                logger.warning(f"⚠️ Truncating torn tail of memory segment {path}")
+                with open(path, "r+b") as f:
+                    f.truncate(valid_bytes)
+
+    def _rebuild_index(self):
+        for _, record in self._iter_records():
+            op = record.get("op")
+            if op == "base":
+                continue
+            conv = record.get("conv", {})
+            if op == "replace" and self._last is not None:
+                self._keys.discard(conversation_key(self._last))
+                self._dead += 1
+            else:
+                self._live += 1
+            self._keys.add(conversation_key(conv))
+            self._last = conv
+        logger.info(f"📒 Memory log indexed: {self._live} conversations ({self._dead} dead records)")
+
+    def _open_active_segment(self):
+        numbers = self._segment_numbers()
+        self._segment_no = numbers[-1] if numbers else 1
+        self._file = open(self._segment_path(self._segment_no), "ab")
+
+    def _roll_segment(self):
+        self._sync()
+        self._file.close()
+        self._segment_no += 1
+        self._file = open(self._segment_path(self._segment_no), "ab")
+
+    def _sync(self):
+        if self._sync_timer is not None:
+            self._sync_timer.cancel()
+            self._sync_timer = None
+        if self._file and self._pending_sync:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending_sync = 0
+        self._last_sync = time.monotonic()
+
+    def _schedule_sync(self):
+        """fsync the tail later even if no further write comes to trigger it"""
+        if self._sync_timer is None:
+            self._sync_timer = threading.Timer(self.fsync_interval, self.flush)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+
+    def _write(self, records: List[Dict]):
+        data = b"".join(
+            json.dumps(r, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            for r in records
+        )
+        self._file.write(data)
+        # Out of Python's buffer right away: a killed process loses nothing already appended
+        self._file.flush()
+        self._pending_sync += len(records)
+        if (self._pending_sync >= self.fsync_every or
+                time.monotonic() - self._last_sync >= self.fsync_interval):
+            self._sync()
+        else:
+            self._schedule_sync()
+        if self._file.tell() >= self.segment_bytes:
+            self._roll_segment()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def contains(self, conversation: Dict) -> bool:
+        return conversation_key(conversation) in self._keys
+
+    def last(self) -> Optional[Dict]:
+        return self._last
+
+    def count(self) -> int:
+        return self._live
+
+    def append(self, conversation: Dict, replace_last: bool = False) -> bool:
+        """Append one conversation. Returns False if it was already stored."""
+        return self.append_many([(conversation, replace_last)]) > 0
+
+    def append_many(self, items: List[Tuple[Dict, bool]]) -> int:
+        """Append several (conversation, replace_last) pairs with a single write"""
+        with self._lock:
+            records = []
+            for conversation, replace_last in items:
+                key = conversation_key(conversation)
+                if key in self._keys:
+                    continue
+                if replace_last and self._last is not None:
+                    self._keys.discard(conversation_key(self._last))
+                    self._dead += 1
+                    records.append({"op": "replace", "conv": conversation})
+                else:
+                    self._live += 1
+                    records.append({"op": "put", "conv": conversation})
+                self._keys.add(key)
+                self._last = conversation
+
+            if records:
+                self._write(records)
+                if self._dead >= self.compact_min_dead and self._dead > self._live:
+                    self.compact()
+            return len(records)
+
+    def load_all(self) -> List[Dict]:
+        """Materialize every live conversation, oldest first"""
+        with self._lock:
+            self._file.flush()
+            conversations = []
+            for _, record in self._iter_records():
+                op = record.get("op")
+                if op == "base":
+                    continue
+                if op == "replace" and conversations:
+                    conversations[-1] = record.get("conv", {})
+                else:
+                    conversations.append(record.get("conv", {}))
+            return conversations
+
+    def _reverse_records(self, number: int, block_size: int = 64 * 1024):
+        """Yields records of one segment newest first, reading blocks from the end"""
+        with open(self._segment_path(number), "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b""
+            while position > 0:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                lines = (f.read(step) + remainder).split(b"\n")
+                remainder = lines.pop(0)  # May be a partial line; finish it next block
+                for raw in reversed(lines):
+                    if raw.strip():
+                        yield json.loads(raw)
+            if remainder.strip():
+                yield json.loads(remainder)
+
+    def tail(self, max_messages: int) -> List[Dict]:
+        """Last N messages across conversations, in time proportional to N"""
+        with self._lock:
+            self._file.flush()
+            collected = []
+            dead_next = False  # A replace record hides the conversation before it
+            for number in reversed(self._live_segments()):
+                for record in self._reverse_records(number):
+                    op = record.get("op")
+                    if op == "base":
+                        break
+                    if dead_next:
+                        dead_next = op == "replace"
+                        continue
+                    messages = record.get("conv", {}).get("messages", [])
+                    collected.extend(reversed(messages))
+                    dead_next = op == "replace"
+                    if len(collected) >= max_messages:
+                        break
+                if len(collected) >= max_messages:
+                    break
+            return list(reversed(collected[:max_messages]))
+
+    def search(self, query: str, limit: int = 5, since: float = 0.0) -> List[Dict]:
+        """Linear keyword scan (the SQLite engine answers this from its FTS index)"""
+        words = [w for w in query.lower().split() if w]
+        if not words:
+            return []
+        hits = []
+        for conv in self.load_all():
+            if since and timestamp_seconds(conv.get("timestamp")) < since:
+                continue
+            for message in conv.get("messages", []):
+                text = message_text(message) if isinstance(message, dict) else ""
+                lowered = text.lower()
+                score = sum(1 for w in words if w in lowered)
+                if score:
+                    hits.append((score, {
+                        "role": message.get("role"),
+                        "text": text,
+                        "timestamp": timestamp_seconds(conv.get("timestamp")),
+                    }))
+        hits.reverse()  # Newest first among equal scores
+        hits.sort(key=lambda h: h[0], reverse=True)
+        return [hit for _, hit in hits[:limit]]
+
+    def compact(self) -> int:
+        """Rewrite live conversations into one base segment. Returns dropped record count."""
+        with self._lock:
+            return self._compact(self.load_all())
+
+    def _compact(self, conversations: List[Dict]) -> int:
+        with self._lock:
+            old_segments = self._segment_numbers()
+
+            # Write the compacted segment under a new number; the base header makes
+            # older segments obsolete, so a crash mid-compaction never loses data.
+            self._sync()
+            self._file.close()
+            self._segment_no = (old_segments[-1] if old_segments else 0) + 1
+            self._file = open(self._segment_path(self._segment_no), "ab")
+
+            seen = set()
+            records = [{"op": "base", "supersedes": self._segment_no - 1}]
+            for conv in conversations:
+                key = conversation_key(conv)
+                if key in seen:
+                    continue
+                seen.add(key)
+                records.append({"op": "put", "conv": conv})
+            self._write(records)
+            self._sync()
+            dropped = self._dead + len(conversations) - len(seen)
+
+            for number in old_segments:
+                try:
+                    os.remove(self._segment_path(number))
+                except OSError as e:
+                    logger.warning(f"⚠️ Could not remove old memory segment {number}: {e}")
+
+            self._keys = seen
+            self._live = len(seen)
+            self._dead = 0
+            logger.info(f"🗜️ Memory log compacted: {self._live} conversations, dropped {dropped} records")
+            return dropped
+
+    def clear_duplicates(self) -> int:
+        """Drops live conversations whose key repeats (from logs written before dedup); returns how many"""
+        with self._lock:
+            conversations = self.load_all()
+            duplicates = len(conversations) - len({conversation_key(c) for c in conversations})
+            if duplicates:
+                self._compact(conversations)
+            return duplicates
+
+    def flush(self):
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._sync()
+                self._file.close()
+                self._file = None
@@ -1,13 +1,11 @@
 import asyncio
-import hashlib
-import json
 import time
 import logging
 import os
 from dotenv import load_dotenv
-from pydantic import BaseModel
 # Updated import for package structure
-from .store import ConversationMemory
+from .store import get_memory
+from .semantic import get_semantic_memory
 
 # Configure logging
 logging.basicConfig(
@@ -18,63 +16,111 @@ logging.basicConfig(
 load_dotenv()
 
 class MemoryExtractor:
-    def __init__(self):
-        # last_conversation_hash is no longer needed with the new logic
+    """
+    Persists chat turns as the AgentSession emits them.
+
+    Items arrive through the session's "conversation_item_added" event into an
+    asyncio.Queue, so the extractor sleeps until there is something to save.
+    A batch is flushed when it reaches max_batch items or when the oldest item
+    has waited max_latency seconds, whichever comes first.
+    """
+
+    def __init__(self, max_batch: int = None, max_latency: float = None):
+        self.max_batch = max_batch or int(os.getenv("MEMORY_MAX_BATCH", "16"))
+        self.max_latency = max_latency if max_latency is not None else float(os.getenv("MEMORY_MAX_LATENCY", "0.5"))
         self.saved_message_count = 0  # Tracks how many messages have been saved.
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = None
+        self._semantic = None
 
-    def _serialize_for_hash(self, obj):
-        """
-        Recursively converts Pydantic objects or nested data into serializable dicts.
-        This is necessary for consistency.
-        """
-        if isinstance(obj, BaseModel):
-            return obj.model_dump()
-        elif isinstance(obj, dict):
-            return {k: self._serialize_for_hash(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._serialize_for_hash(item) for item in obj]
-        else:
-            return obj  # primitive types
-
-    async def run(self, session):
+    def attach(self, session):
+        """Subscribe to a session's conversation events (call before session.start)"""
+        session.on("conversation_item_added", self._on_item_added)
+
+    def _on_item_added(self, event):
+        self._queue.put_nowait(event.item)
+
+    def _serialize(self, message) -> dict:
+        """ChatMessage -> JSON-safe dict (audio/image frames are dropped)"""
+        try:
+            return message.model_dump(mode="json", exclude_none=True)
+        except Exception:
+            return {
+                "id": getattr(message, "id", None),
+                "type": "message",
+                "role": getattr(message, "role", None),
+                "content": [c for c in getattr(message, "content", []) if isinstance(c, str)],
+            }
+
+    async def _next_batch(self):
+        """Wait for the first item, then collect more until the batch is full or stale"""
+        first = await self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_latency
+        while len(batch) < self.max_batch:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                # Shutdown requested: flush what we have, then stop
+                self._queue.put_nowait(None)
+                break
+            batch.append(item)
+        return batch
+
+    async def _flush(self, memory, batch):
+        conversations = [
+            {
+                "messages": [self._serialize(message)],
+                "timestamp": getattr(message, "created_at", None) or time.time()
+            }
+            for message in batch
+        ]
+        # Errors are logged by the store; a shortfall here is messages it already had (or a failed write)
+        saved = await asyncio.to_thread(memory.save_conversations, conversations)
+        self.saved_message_count += saved
+        logging.debug(f"Saved {saved}/{len(conversations)} message(s), last ID: {getattr(batch[-1], 'id', None)}")
+
+        # Incrementally embed the batch for semantic recall
+        if self._semantic is not None:
+            try:
+                await asyncio.to_thread(self._semantic.remember, conversations)
+            except Exception as e:
+                logging.error(f"Semantic indexing failed: {e}")
+
+    async def run(self, session=None):
         """
-        The main loop that checks for and saves new conversations.
+        The main loop that saves new conversation items as they arrive.
         """
-        user_name = os.getenv("USER_NAME", "User")
-        memory = ConversationMemory(user_name)
+        if session is not None:
+            self.attach(session)
+        memory = await asyncio.to_thread(get_memory)
+        self._semantic = await asyncio.to_thread(get_semantic_memory)
 
         while True:
-            # Check for new messages every 1 second
-            await asyncio.sleep(1)
-
-            # Assuming the conversation history is a list of message objects
-            # within the session object. Adjust 'session.chat_history' if needed.
-            current_chat_history = session
-            
-            # This is the core logic: Compare the current count with the saved count.
-            if len(current_chat_history) > self.saved_message_count:
-                logging.info(f"{len(current_chat_history) - self.saved_message_count} new message(s) detected. Saving...")
-                
-                # Get a "slice" of the new messages that haven't been saved yet.
-                new_messages = current_chat_history[self.saved_message_count:]
-                
-                for message in new_messages:
-                    # Serialize the single message for saving
-                    serialized_message = self._serialize_for_hash(message)
-                    conversation_wrapper = {
-                        "messages": [serialized_message],
-                        "timestamp": time.time()
-                    }
-                    
-                    success = memory.save_conversation(conversation_wrapper)
-                    
-                    if success:
-                        logging.info(f"Saved new message with ID: {message.id}")
-                    else:
-                        logging.error(f"Failed to save message with ID: {message.id}")
-                
-                # After successfully saving all new messages, update the counter.
-                self.saved_message_count = len(current_chat_history)
-            
-            else:
-                logging.info("No new messages to save. Skipping.")
+            batch = await self._next_batch()
+            if batch is None:
+                break
+            try:
+                await self._flush(memory, batch)
+            except Exception as e:
+                logging.error(f"Memory flush failed: {e}")
+
+        await asyncio.to_thread(memory.flush)
+
+    def start(self, session=None):
+        self._task = asyncio.create_task(self.run(session))
+        return self._task
+
+    async def aclose(self):
+        """Flush queued items and stop the loop"""
+        self._queue.put_nowait(None)
+        if self._task:
+            await self._task
@@ -0,0 +1,39 @@
+from typing import Dict, Tuple
+from datetime import datetime
+
+
+def conversation_key(conversation: Dict) -> Tuple:
+    """Dedup key for a conversation: (timestamp, message count, last message id)"""
+    messages = conversation.get("messages", [])
+    last_id = None
+    if messages and isinstance(messages[-1], dict):
+        last_id = messages[-1].get("id")
+    return (str(conversation.get("timestamp")), len(messages), last_id)
+
+
+def message_text(message: Dict) -> str:
+    """Plain text of a serialized ChatMessage (content may be a str or a list of parts)"""
+    content = message.get("content", "")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part for part in content if isinstance(part, str))
+    return ""
+
+
+def timestamp_seconds(timestamp) -> float:
+    """Epoch seconds for either a float timestamp or an ISO string (0.0 if unknown)"""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    try:
+        return datetime.fromisoformat(str(timestamp)).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def format_timestamp(timestamp) -> str:
+    """Local date and time for display ("2025-06-01 14:05"), from either timestamp form"""
+    seconds = timestamp_seconds(timestamp)
+    if not seconds:
+        return "unknown date"
+    return datetime.fromtimestamp(seconds).strftime("%Y-%m-%d %H:%M")
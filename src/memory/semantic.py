@@ -0,0 +1,313 @@
+import json
+import os
+import re
+import shutil
+import threading
+import zlib
+import logging
+from typing import List, Dict, Optional
+from .records import message_text, timestamp_seconds
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Embedders (local, CPU only)
+# -------------------------
+class HashingEmbedder:
+    """
+    Feature-hashing embedder: word unigrams + char trigrams hashed into a fixed
+    number of buckets. Needs only NumPy, so recall works without a model file.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _features(self, text: str):
+        words = re.findall(r"\w+", text.lower(), flags=re.UNICODE)
+        for word in words:
+            yield word, 1.0
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                yield padded[i:i + 3], 0.5
+
+    def embed(self, texts: List[str]):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                h = zlib.crc32(feature.encode("utf-8"))
+                out[row, h % self.dim] += weight if h & 0x80000000 else -weight
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.maximum(norms, 1e-9)
+
+
+class OnnxEmbedder:
+    """
+    Sentence embedder for a BERT-style ONNX model (e.g. all-MiniLM-L6-v2) with its
+    WordPiece vocab.txt. Output is mean-pooled over the attention mask and L2-normalized.
+    """
+
+    def __init__(self, model_path: str, vocab_path: str, max_length: int = 128):
+        with open(vocab_path, "r", encoding="utf-8") as f:
+            self.vocab = {line.rstrip("\n"): i for i, line in enumerate(f)}
+        self.max_length = max_length
+        # "all-MiniLM-L6-v2/model": exported models are usually all called model.onnx
+        model_dir = os.path.basename(os.path.dirname(os.path.abspath(model_path)))
+        self.name = f"{model_dir}/{os.path.splitext(os.path.basename(model_path))[0]}"
+        self.session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.dim = self.session.get_outputs()[0].shape[-1]
+
+    def _tokenize(self, text: str) -> List[int]:
+        unk = self.vocab.get("[UNK]", 0)
+        ids = [self.vocab.get("[CLS]", 101)]
+        for word in re.findall(r"\w+|[^\w\s]", text.lower(), flags=re.UNICODE):
+            start = 0
+            while start < len(word):
+                end, piece_id = len(word), None
+                while start < end:
+                    piece = word[start:end] if start == 0 else "##" + word[start:end]
+                    if piece in self.vocab:
+                        piece_id = self.vocab[piece]
+                        break
+                    end -= 1
+                if piece_id is None:
+                    ids.append(unk)
+                    break
+                ids.append(piece_id)
+                start = end
+        return ids[:self.max_length - 1] + [self.vocab.get("[SEP]", 102)]
+
+    def embed(self, texts: List[str]):
+        tokenized = [self._tokenize(t) for t in texts]
+        width = max(len(t) for t in tokenized)
+        input_ids = np.zeros((len(texts), width), dtype=np.int64)
+        mask = np.zeros((len(texts), width), dtype=np.int64)
+        for row, ids in enumerate(tokenized):
+            input_ids[row, :len(ids)] = ids
+            mask[row, :len(ids)] = 1
+
+        feeds = {"input_ids": input_ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        hidden = self.session.run(None, {k: v for k, v in feeds.items() if k in self.input_names})[0]
+
+        weights = mask[..., None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.maximum(norms, 1e-9)).astype(np.float32)
+
+
+def load_embedder():
+    """ONNX model if EMBEDDING_MODEL/EMBEDDING_VOCAB are set and usable, else hashing"""
+    model_path = os.getenv("EMBEDDING_MODEL")
+    vocab_path = os.getenv("EMBEDDING_VOCAB")
+    if ort and model_path and vocab_path and os.path.exists(model_path):
+        try:
+            return OnnxEmbedder(model_path, vocab_path)
+        except Exception as e:
+            logger.warning(f"⚠️ ONNX embedder unavailable, using hashing embedder: {e}")
+    return HashingEmbedder()
+
+# -------------------------
+# Vector index
+# -------------------------
+class BruteForceIndex:
+    """
+    Vectors in a memory-mapped matrix, metadata in a JSONL sidecar.
+
+    float32 (default) goes straight to BLAS; float16 halves disk and page cache
+    but pays an upcast per chunk. search() is an exact dot product over the matrix
+    in chunks. Anything with the same add()/search()/count() methods (IVF, HNSW)
+    can replace it at scale.
+    """
+
+    CHUNK_ROWS = 65536
+
+    def __init__(self, directory: str, dim: int, dtype: str = None):
+        self.directory = directory
+        self.dim = dim
+        self.dtype = np.dtype(dtype or os.getenv("SEMANTIC_DTYPE", "float32"))
+        self.vectors_path = os.path.join(directory, f"vectors.{self.dtype.name}")
+        self.meta_path = os.path.join(directory, "meta.jsonl")
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+
+        # Metadata is written after vectors, so its line count is the source of truth
+        self.meta: List[Dict] = []
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.endswith("\n"):
+                        self.meta.append(json.loads(line))
+        self._matrix = None
+        self._capacity = 0
+        if os.path.exists(self.vectors_path):
+            self._map(os.path.getsize(self.vectors_path) // (self.dim * self.dtype.itemsize))
+
+    def _map(self, capacity: int):
+        self._matrix = None  # Release the old mapping before resizing
+        if capacity == 0:
+            self._capacity = 0
+            return
+        self._matrix = np.memmap(self.vectors_path, dtype=self.dtype, mode="r+",
+                                 shape=(capacity, self.dim))
+        self._capacity = capacity
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self._capacity:
+            return
+        capacity = max(1024, self._capacity)
+        while capacity < rows:
+            capacity *= 2
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix = None
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim * self.dtype.itemsize)
+        self._map(capacity)
+
+    def count(self) -> int:
+        return len(self.meta)
+
+    def close(self):
+        """Releases the memory map (Windows can't move or delete a mapped file)"""
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+            self._matrix = None
+            self._capacity = 0
+
+    def add(self, vectors, metas: List[Dict]):
+        with self._lock:
+            start = len(self.meta)
+            self._ensure_capacity(start + len(metas))
+            self._matrix[start:start + len(metas)] = vectors.astype(self.dtype)
+            self._matrix.flush()
+            with open(self.meta_path, "a", encoding="utf-8") as f:
+                for meta in metas:
+                    f.write(json.dumps(meta, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self.meta.extend(metas)
+
+    def search(self, query, k: int = 5) -> List[Dict]:
+        with self._lock:
+            total = len(self.meta)
+            if total == 0:
+                return []
+            query = query.astype(np.float32)
+            best_scores = np.empty(0, dtype=np.float32)
+            best_rows = np.empty(0, dtype=np.int64)
+            for start in range(0, total, self.CHUNK_ROWS):
+                chunk = self._matrix[start:min(start + self.CHUNK_ROWS, total)]
+                if chunk.dtype != np.float32:
+                    chunk = chunk.astype(np.float32)
+                scores = chunk @ query
+                top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+                best_scores = np.concatenate([best_scores, scores[top]])
+                best_rows = np.concatenate([best_rows, top + start])
+                if len(best_scores) > k:
+                    keep = np.argpartition(-best_scores, k - 1)[:k]
+                    best_scores, best_rows = best_scores[keep], best_rows[keep]
+            order = np.argsort(-best_scores)
+            return [dict(self.meta[best_rows[i]], score=float(best_scores[i])) for i in order]
+
+# -------------------------
+# Semantic memory
+# -------------------------
+class SemanticMemory:
+    """Embeds persisted messages incrementally and recalls them by meaning"""
+
+    REBUILD_BATCH = 256
+
+    def __init__(self, user_id: str, storage_path: str = "conversations", embedder=None, index=None):
+        self.embedder = embedder or load_embedder()
+        self.index = index or self._open_index(os.path.join(storage_path, f"{user_id}_vectors"))
+        self._seen_ids = {m.get("id") for m in self.index.meta if m.get("id")}
+        logger.info(f"🧠 Semantic memory ready: {self.index.count()} vectors ({type(self.embedder).__name__})")
+
+    def _open_index(self, directory: str) -> BruteForceIndex:
+        """
+        Opens the index, re-embedding it first if another embedder or dimension built it:
+        vectors from two models are not comparable. meta.jsonl keeps the texts to re-embed.
+        """
+        header = {"embedder": self.embedder.name, "dim": self.embedder.dim}
+        header_path = os.path.join(directory, "embedder.json")
+        try:
+            with open(header_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            stored = None  # New index, or one from before the header existed
+
+        index = BruteForceIndex(directory, self.embedder.dim)
+        if stored != header and index.count():
+            logger.info(f"🔄 Re-embedding {index.count()} messages with {header} (index was built with {stored})")
+            rebuild_dir = directory + ".rebuild"
+            shutil.rmtree(rebuild_dir, ignore_errors=True)
+            rebuilt = BruteForceIndex(rebuild_dir, self.embedder.dim)
+            for start in range(0, index.count(), self.REBUILD_BATCH):
+                metas = index.meta[start:start + self.REBUILD_BATCH]
+                rebuilt.add(self.embedder.embed([m.get("text", "") for m in metas]), metas)
+            index.close()
+            rebuilt.close()
+            shutil.rmtree(directory)
+            os.replace(rebuild_dir, directory)
+            index = BruteForceIndex(directory, self.embedder.dim)
+        if stored != header:
+            with open(header_path, "w", encoding="utf-8") as f:
+                json.dump(header, f)
+        return index
+
+    def remember(self, conversations: List[Dict]) -> int:
+        """Index the messages of newly saved conversations; returns how many were added"""
+        texts, metas = [], []
+        for conv in conversations:
+            for message in conv.get("messages", []):
+                if not isinstance(message, dict) or message.get("id") in self._seen_ids:
+                    continue
+                text = message_text(message).strip()
+                if not text:
+                    continue
+                texts.append(text)
+                metas.append({
+                    "id": message.get("id"),
+                    "role": message.get("role"),
+                    "text": text,
+                    "timestamp": timestamp_seconds(conv.get("timestamp")),
+                })
+        if not texts:
+            return 0
+        self.index.add(self.embedder.embed(texts), metas)
+        self._seen_ids.update(m["id"] for m in metas if m["id"])
+        return len(texts)
+
+    def recall(self, query: str, k: int = 5) -> List[Dict]:
+        """Top-k past messages closest in meaning to the query"""
+        if not query.strip():
+            return []
+        return self.index.search(self.embedder.embed([query])[0], k)
+
+
+_semantic_instances: Dict[str, SemanticMemory] = {}
+_semantic_lock = threading.Lock()
+
+
+def get_semantic_memory(user_id: str = None) -> Optional[SemanticMemory]:
+    """Shared SemanticMemory per user, or None when NumPy is missing or SEMANTIC_MEMORY=0"""
+    if np is None or os.getenv("SEMANTIC_MEMORY", "1") == "0":
+        return None
+    user_id = user_id or os.getenv("USER_NAME", "User")
+    with _semantic_lock:
+        if user_id not in _semantic_instances:
+            _semantic_instances[user_id] = SemanticMemory(user_id)
+        return _semantic_instances[user_id]
@@ -0,0 +1,218 @@
+import glob
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import logging
+from typing import List, Dict, Optional, Tuple
+from .records import conversation_key, message_text, timestamp_seconds
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id          INTEGER PRIMARY KEY,
+    ts          TEXT NOT NULL,
+    created     REAL NOT NULL,
+    msg_count   INTEGER NOT NULL,
+    last_msg_id TEXT NOT NULL DEFAULT '',
+    body        TEXT NOT NULL
+);
+-- Dedup lives in the database: same (timestamp, message count, last id) is ignored
+CREATE UNIQUE INDEX IF NOT EXISTS conversations_dedup
+    ON conversations (ts, msg_count, last_msg_id);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id              INTEGER PRIMARY KEY,
+    conversation_id INTEGER NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+    role            TEXT,
+    text            TEXT NOT NULL,
+    created         REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_conversation ON messages (conversation_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    text, content='messages', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an OR query of quoted terms (bm25 ranks the best overlap first)"""
+    words = re.findall(r"\w+", text, flags=re.UNICODE)
+    return " OR ".join(f'"{w}"' for w in words)
+
+
+class SQLiteStore:
+    """
+    SQLite storage engine for ConversationMemory.
+
+    WAL mode keeps writes cheap while readers run, the unique index does dedup,
+    and an FTS5 table over message text answers keyword recall without loading
+    the history into Python.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def _key_params(self, conversation: Dict) -> Tuple:
+        ts, msg_count, last_id = conversation_key(conversation)
+        return ts, msg_count, "" if last_id is None else str(last_id)
+
+    def _insert(self, conversation: Dict) -> Optional[int]:
+        ts, msg_count, last_id = self._key_params(conversation)
+        created = timestamp_seconds(conversation.get("timestamp"))
+        cur = self._conn.execute(
+            "INSERT OR IGNORE INTO conversations (ts, created, msg_count, last_msg_id, body) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (ts, created, msg_count, last_id,
+             json.dumps(conversation, ensure_ascii=False, separators=(",", ":"))),
+        )
+        if cur.rowcount == 0:
+            return None
+        conversation_id = cur.lastrowid
+        rows = []
+        for message in conversation.get("messages", []):
+            if not isinstance(message, dict):
+                continue
+            rows.append((conversation_id, message.get("role"), message_text(message), created))
+        self._conn.executemany(
+            "INSERT INTO messages (conversation_id, role, text, created) VALUES (?, ?, ?, ?)", rows
+        )
+        return conversation_id
+
+    # -------------------------
+    # Public API (same shape as SegmentedLogStore)
+    # -------------------------
+    def contains(self, conversation: Dict) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM conversations WHERE ts = ? AND msg_count = ? AND last_msg_id = ?",
+                self._key_params(conversation),
+            ).fetchone()
+            return row is not None
+
+    def last(self) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM conversations ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+
+    def append(self, conversation: Dict, replace_last: bool = False) -> bool:
+        return self.append_many([(conversation, replace_last)]) > 0
+
+    def append_many(self, items: List[Tuple[Dict, bool]]) -> int:
+        """Insert several (conversation, replace_last) pairs in one transaction"""
+        written = 0
+        with self._lock, self._conn:
+            for conversation, replace_last in items:
+                if self.contains(conversation):
+                    continue
+                if replace_last:
+                    self._conn.execute(
+                        "DELETE FROM conversations WHERE id = (SELECT MAX(id) FROM conversations)"
+                    )
+                if self._insert(conversation) is not None:
+                    written += 1
+        return written
+
+    def load_all(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT body FROM conversations ORDER BY id").fetchall()
+            return [json.loads(body) for (body,) in rows]
+
+    def tail(self, max_messages: int) -> List[Dict]:
+        """Last N messages, walking conversations newest first by primary key"""
+        collected = []
+        with self._lock:
+            cursor = self._conn.execute("SELECT body FROM conversations ORDER BY id DESC")
+            for (body,) in cursor:
+                collected.extend(reversed(json.loads(body).get("messages", [])))
+                if len(collected) >= max_messages:
+                    break
+            cursor.close()
+        return list(reversed(collected[:max_messages]))
+
+    def search(self, query: str, limit: int = 5, since: float = 0.0) -> List[Dict]:
+        """Keyword recall over message text, best bm25 match first"""
+        fts = _fts_query(query)
+        if not fts:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT m.role, m.text, c.created FROM messages_fts "
+                "JOIN messages m ON m.id = messages_fts.rowid "
+                "JOIN conversations c ON c.id = m.conversation_id "
+                "WHERE messages_fts MATCH ? AND m.created >= ? "
+                "ORDER BY bm25(messages_fts), m.id DESC LIMIT ?",
+                (fts, since, limit),
+            ).fetchall()
+        # Epoch seconds (created), not the TEXT key column: same type as SegmentedLogStore
+        return [{"role": role, "text": text, "timestamp": float(created)} for role, text, created in rows]
+
+    def compact(self) -> int:
+        with self._lock:
+            self._conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('optimize')")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+        return 0
+
+    def clear_duplicates(self) -> int:
+        # The unique index never lets a duplicate in
+        return 0
+
+    def flush(self):
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+def migrate_json_files(storage_path: str = "conversations") -> Dict[str, int]:
+    """One-shot import of every conversations/<user>_memory.json into <user>_memory.db"""
+    results = {}
+    for json_path in sorted(glob.glob(os.path.join(storage_path, "*_memory.json"))):
+        user_id = os.path.basename(json_path)[:-len("_memory.json")]
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"❌ Skipping {json_path}: {e}")
+            continue
+
+        store = SQLiteStore(os.path.join(storage_path, f"{user_id}_memory.db"))
+        try:
+            results[user_id] = store.append_many([(conv, False) for conv in data])
+        finally:
+            store.close()
+        logger.info(f"✅ Migrated {results[user_id]}/{len(data)} conversations for {user_id}")
+    return results
+
+
+if __name__ == "__main__":
+    # python -m src.memory.sqlite_store [storage_path]
+    logging.basicConfig(level=logging.INFO)
+    migrate_json_files(sys.argv[1] if len(sys.argv) > 1 else "conversations")
@@ -1,8 +1,12 @@
+import asyncio
 import json
 import os
+import threading
 from datetime import datetime
 from typing import List, Dict, Union
 import logging
+from .log_store import SegmentedLogStore
+from .sqlite_store import SQLiteStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,89 +15,90 @@ logger = logging.getLogger(__name__)
 class ConversationMemory:
     """Handles persistent conversation memory for users"""
     
-    def __init__(self, user_id: str, storage_path: str = "conversations"):
+    def __init__(self, user_id: str, storage_path: str = "conversations", backend: str = None):
         self.user_id = user_id
         self.storage_path = storage_path
         self.memory_file = os.path.join(storage_path, f"{user_id}_memory.json")
+        self.backend = (backend or os.getenv("MEMORY_BACKEND", "log")).lower()
         
         # Create storage directory if it doesn't exist
         os.makedirs(storage_path, exist_ok=True)
-        logger.info(f"ConversationMemory initialized for user: {user_id}")
-        logger.info(f"Memory file path: {os.path.abspath(self.memory_file)}")   
-    
+
+        # "log": append-only JSONL segments, "sqlite": WAL database with FTS5 recall
+        if self.backend == "sqlite":
+            self.store_path = os.path.join(storage_path, f"{user_id}_memory.db")
+            self._store = SQLiteStore(self.store_path)
+        else:
+            self.store_path = os.path.join(storage_path, f"{user_id}_log")
+            self._store = SegmentedLogStore(self.store_path)
+        self._import_legacy_file()
+
+        logger.info(f"ConversationMemory initialized for user: {user_id} ({self.backend})")
+        logger.info(f"Memory store path: {os.path.abspath(self.store_path)}")
+
+    def _import_legacy_file(self):
+        """One-time import of the old <user>_memory.json into an empty log"""
+        if self._store.count() or not os.path.exists(self.memory_file):
+            return
+        try:
+            with open(self.memory_file, 'r', encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Error loading legacy memory file: {e}")
+            return
+        imported = self._store.append_many([(conv, False) for conv in data])
+        self._store.flush()
+        logger.info(f"Imported {imported} conversations from {self.memory_file}")
+
     def load_memory(self) -> List[Dict]:
         """Load all past conversations for this user"""
-        if os.path.exists(self.memory_file):
-            try:
-                with open(self.memory_file, 'r', encoding="utf-8") as f:
-                    data = json.load(f)
-                    logger.info(f"Loaded {len(data)} conversations from memory for user {self.user_id}")
-                    return data
-            except (json.JSONDecodeError, FileNotFoundError) as e:
-                logger.error(f"Error loading memory file: {e}")
-                return []
-        else:
-            logger.info(f"No existing memory file found for user {self.user_id}")
-            return []
-    
-    def _conversation_exists(self, new_conversation: Dict, existing_conversations: List[Dict]) -> bool:
-        """Check if a conversation already exists in memory"""
-        new_conv_data = new_conversation.get('model_dump', lambda: new_conversation)()
-        new_timestamp = new_conv_data.get('timestamp')
-        new_messages = new_conv_data.get('messages', [])
-        
-        for existing_conv in existing_conversations:
-            existing_timestamp = existing_conv.get('timestamp')
-            existing_messages = existing_conv.get('messages', [])
-            
-            # Compare by timestamp and message count
-            if (existing_timestamp == new_timestamp and 
-                len(existing_messages) == len(new_messages)):
-                return True
-        
-        return False
+        data = self._store.load_all()
+        logger.info(f"Loaded {len(data)} conversations from memory for user {self.user_id}")
+        return data
     
     def save_conversation(self, conversation: Union[Dict, object]) -> bool:
-        """Save a conversation to memory - returns True if successful"""
-        logger.info(f"save_conversation called for user {self.user_id}")
-        
+        """Save a conversation to memory - returns True if successful (already stored counts)"""
         try:
-            memory = self.load_memory()
-            
+            self._save([conversation])
+            return True
+        except Exception as e:
+            logger.error(f"Error saving conversation: {e}")
+            return False
+
+    def save_conversations(self, conversations: List[Union[Dict, object]]) -> int:
+        """Save several conversations with one append - returns how many were written (duplicates are skipped)"""
+        try:
+            return self._save(conversations)
+        except Exception as e:
+            logger.error(f"Error saving conversation: {e}")
+            return 0
+
+    def _save(self, conversations: List[Union[Dict, object]]) -> int:
+        items = []
+        last = self._store.last()
+        for conversation in conversations:
             # Convert conversation to dict if it's an object with model_dump method
             if hasattr(conversation, 'model_dump'):
                 conversation_dict = conversation.model_dump()
             else:
                 conversation_dict = conversation
-            
+
             # Add timestamp if not present
             if 'timestamp' not in conversation_dict:
                 conversation_dict['timestamp'] = datetime.now().isoformat()
-            
-            # Check if this conversation already exists
-            if self._conversation_exists(conversation_dict, memory):
-                logger.info("Conversation already exists in memory, skipping save")
-                return True
-            
+
+            # Duplicates are skipped by the store's key index
+            if self._store.contains(conversation_dict):
+                continue
+
             # If this is an update to the last conversation, replace it instead of adding
-            if memory and self._is_conversation_update(conversation_dict, memory[-1]):
-                logger.info("Updating last conversation instead of adding new one")
-                memory[-1] = conversation_dict
-            else:
-                # Add new conversation
-                memory.append(conversation_dict)
-            
-            # Save to file
-            with open(self.memory_file, 'w', encoding='utf-8') as f:
-                json.dump(memory, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"Successfully saved conversation for user {self.user_id}")
-            logger.info(f"File saved at: {os.path.abspath(self.memory_file)}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error saving conversation: {e}")
-            return False
+            replace_last = bool(last) and self._is_conversation_update(conversation_dict, last)
+            items.append((conversation_dict, replace_last))
+            last = conversation_dict
+
+        written = self._store.append_many(items)
+        logger.debug(f"Saved {written}/{len(conversations)} conversations for user {self.user_id}")
+        return written
     
     def _is_conversation_update(self, new_conv: Dict, last_conv: Dict) -> bool:
         """Check if new conversation is an update to the last one"""
@@ -113,40 +118,51 @@ class ConversationMemory:
             return False
     
     def get_recent_context(self, max_messages: int = 30) -> List[Dict]:
-        """Get recent conversation context for the agent"""
-        memory = self.load_memory()
-        all_messages = []
-        
-        # Flatten all conversations into a single message list
-        for conversation in memory:
-            if "messages" in conversation:
-                all_messages.extend(conversation["messages"])
-        
-        # Return the most recent messages
-        recent_messages = all_messages[-max_messages:] if all_messages else []
+        """Get recent conversation context for the agent (reads only the tail of the history)"""
+        recent_messages = self._store.tail(max_messages) if max_messages > 0 else []
         logger.info(f"Retrieved {len(recent_messages)} recent messages for user {self.user_id}")
         return recent_messages
+
+    async def aget_recent_context(self, max_messages: int = 30) -> List[Dict]:
+        """get_recent_context off the event loop, for prefetching at session start"""
+        return await asyncio.to_thread(self.get_recent_context, max_messages)
     
     def get_conversation_count(self) -> int:
         """Get total number of saved conversations"""
-        memory = self.load_memory()
-        return len(memory)
+        return self._store.count()
     
     def clear_duplicates(self) -> int:
         """Remove duplicate conversations and return count of removed duplicates"""
-        memory = self.load_memory()
-        unique_conversations = []
-        removed_count = 0
-        
-        for conv in memory:
-            if not self._conversation_exists(conv, unique_conversations):
-                unique_conversations.append(conv)
-            else:
-                removed_count += 1
-        
+        removed_count = self._store.clear_duplicates()
         if removed_count > 0:
-            with open(self.memory_file, 'w', encoding='utf-8') as f:
-                json.dump(unique_conversations, f, indent=2, ensure_ascii=False)
             logger.info(f"Removed {removed_count} duplicate conversations")
-        
         return removed_count
+
+    def search(self, query: str, limit: int = 5, since: float = 0.0) -> List[Dict]:
+        """Keyword recall over past messages - returns [{"role", "text", "timestamp"}]"""
+        return self._store.search(query, limit=limit, since=since)
+
+    def compact(self) -> int:
+        """Drop replaced records and reclaim space"""
+        return self._store.compact()
+
+    def flush(self):
+        """Force pending writes to disk"""
+        self._store.flush()
+
+    def close(self):
+        """Flush pending writes and release the store"""
+        self._store.close()
+
+
+_instances: Dict[str, ConversationMemory] = {}
+_instances_lock = threading.Lock()
+
+
+def get_memory(user_id: str = None) -> ConversationMemory:
+    """Shared ConversationMemory per user, so every writer goes through one store"""
+    user_id = user_id or os.getenv("USER_NAME", "User")
+    with _instances_lock:
+        if user_id not in _instances:
+            _instances[user_id] = ConversationMemory(user_id)
+        return _instances[user_id]
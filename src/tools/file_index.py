@@ -0,0 +1,381 @@
+"""
+FILE INDEX
+Persistent index of files and folders for folder_file / Play_file.
+
+Built once in a background thread (breadth-first, so top-level items are
+searchable first), stored in SQLite, and kept fresh with watchfiles change
+events instead of rescanning on every command. Lookups go through an
+in-memory token -> ids inverted index and only the candidates are fuzzy
+ranked (src.tools.matcher), so they stay sub-millisecond on a million entries.
+"""
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.tools.matcher import extract
+
+try:
+    from watchfiles import watch, Change, DefaultFilter
+except ImportError:
+    watch = None
+
+logger = logging.getLogger(__name__)
+
+FILE, FOLDER = 0, 1
+KIND_NAMES = {FILE: "file", FOLDER: "folder"}
+
+# How many levels below each root get indexed (0 = only the root's own entries)
+FILE_INDEX_DEPTH = int(os.getenv("FILE_INDEX_DEPTH", "3"))
+# How long the first command after startup waits for the initial build
+FILE_INDEX_WAIT = float(os.getenv("FILE_INDEX_WAIT", "3"))
+# A stored index older than this is reconciled with a background rescan at startup
+FILE_INDEX_MAX_AGE = float(os.getenv("FILE_INDEX_MAX_AGE", str(24 * 3600)))
+
+SKIP_DIRS = {"node_modules", "__pycache__", "appdata", "windows", "program files",
+             "program files (x86)", "programdata", "system volume information"}
+TOKEN_SPLIT = re.compile(r"[^\w]+|_", re.UNICODE)
+MAX_CANDIDATES = 1000
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_SPLIT.split(text.lower()) if t]
+
+
+def default_roots() -> List[str]:
+    user_home = os.path.expanduser("~")
+    return [
+        "D:/",
+        "C:/Users/Public",
+        os.path.join(user_home, "Desktop"),
+        os.path.join(user_home, "Documents"),
+        os.path.join(user_home, "Downloads"),
+    ]
+
+
+class FileIndex:
+    def __init__(self, roots: Iterable[str], db_path: str = None, depth: int = FILE_INDEX_DEPTH):
+        self.roots = [os.path.normpath(r) for r in roots]
+        self.depth = depth
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+        # In-memory side: id -> name/kind, token -> ids. Paths stay in SQLite.
+        self._names: List[Optional[str]] = []
+        self._kinds = bytearray()
+        self._postings: Dict[str, array] = {}
+        self._vocab: List[str] = []
+        self._vocab_dirty = True
+        self._count = 0
+
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, name TEXT NOT NULL, kind INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+    # ---------- in-memory index ----------
+
+    def _remember(self, entry_id: int, name: str, kind: int):
+        if entry_id >= len(self._names):
+            grow = entry_id + 1 - len(self._names)
+            self._names.extend([None] * grow)
+            self._kinds.extend(bytes(grow))
+        if self._names[entry_id] is None:
+            self._count += 1
+        self._names[entry_id] = name
+        self._kinds[entry_id] = kind
+        for token in set(tokenize(name)):
+            posting = self._postings.get(token)
+            if posting is None:
+                self._postings[token] = array("I", [entry_id])
+                self._vocab_dirty = True
+            else:
+                posting.append(entry_id)
+
+    def _forget(self, entry_ids: Iterable[int]):
+        """Drops ids and their postings: SQLite reuses a freed rowid for the next insert"""
+        dropped, tokens = set(), set()
+        for entry_id in entry_ids:
+            if entry_id < len(self._names) and self._names[entry_id] is not None:
+                tokens.update(tokenize(self._names[entry_id]))
+                self._names[entry_id] = None
+                self._count -= 1
+                dropped.add(entry_id)
+        # One pass per affected token, so pruning thousands of rows stays linear
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            kept = array("I", (i for i in posting if i not in dropped))
+            if kept:
+                self._postings[token] = kept
+            else:
+                del self._postings[token]
+                self._vocab_dirty = True
+
+    def _load_from_db(self) -> int:
+        with self._lock:
+            for entry_id, name, kind in self._db.execute("SELECT id, name, kind FROM entries"):
+                self._remember(entry_id, name, kind)
+        return self._count
+
+    def add_many(self, items: Iterable[Tuple[str, str, int]]) -> int:
+        """Insert (path, name, kind) rows; returns how many were new"""
+        added = 0
+        with self._lock:
+            for path, name, kind in items:
+                cur = self._db.execute(
+                    "INSERT OR IGNORE INTO entries (path, name, kind) VALUES (?, ?, ?)", (path, name, kind)
+                )
+                if cur.rowcount:
+                    self._remember(cur.lastrowid, name, kind)
+                    added += 1
+            self._db.commit()
+        return added
+
+    def remove_path(self, path: str) -> int:
+        """Removes a path and, for folders, everything below it"""
+        path = os.path.normpath(path)
+        prefix = path.rstrip("\\/") + os.sep
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM entries WHERE path = ? OR (path >= ? AND path < ?)",
+                (path, prefix, prefix + "\uffff"),
+            ).fetchall()
+            self._forget(entry_id for (entry_id,) in rows)
+            self._db.executemany("DELETE FROM entries WHERE id = ?", rows)
+            self._db.commit()
+        return len(rows)
+
+    def __len__(self):
+        return self._count
+
+    # ---------- scanning ----------
+
+    def _within_depth(self, path: str) -> bool:
+        for root in self.roots:
+            try:
+                rel = os.path.relpath(path, root)
+            except ValueError:
+                continue  # Different drive
+            if not rel.startswith(".."):
+                return rel.count(os.sep) <= self.depth
+        return False
+
+    def _in_skipped_dir(self, path: str) -> bool:
+        """True below a SKIP_DIRS folder, which _scan never descends into"""
+        for root in self.roots:
+            try:
+                rel = os.path.relpath(path, root)
+            except ValueError:
+                continue  # Different drive
+            if not rel.startswith(".."):
+                return any(part.lower() in SKIP_DIRS for part in rel.split(os.sep)[:-1])
+        return False
+
+    def _scan(self, batch_size: int = 5000) -> int:
+        """Breadth-first walk of all roots up to self.depth"""
+        started = time.perf_counter()
+        queue = deque((root, 0) for root in self.roots if os.path.isdir(root))
+        batch, seen = [], 0
+        while queue and not self._stop.is_set():
+            directory, level = queue.popleft()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                            if not is_dir and not entry.is_file(follow_symlinks=False):
+                                continue
+                        except OSError:
+                            continue
+                        if entry.name.startswith((".", "$")):
+                            continue
+                        batch.append((os.path.normpath(entry.path), entry.name, FOLDER if is_dir else FILE))
+                        if is_dir and level < self.depth and entry.name.lower() not in SKIP_DIRS:
+                            queue.append((entry.path, level + 1))
+            except OSError as e:
+                logger.debug(f"Skipping {directory}: {e}")
+            if len(batch) >= batch_size:
+                seen += len(batch)
+                self.add_many(batch)
+                batch = []
+        if batch:
+            seen += len(batch)
+            self.add_many(batch)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('scanned_at', ?)", (str(time.time()),))
+            self._db.commit()
+        logger.info(f"✅ File index: scanned {seen} items in {time.perf_counter() - started:.1f}s ({len(self)} indexed)")
+        return seen
+
+    def _prune_missing(self):
+        """Drops rows whose files disappeared while Jarvis was not running"""
+        with self._lock:
+            rows = self._db.execute("SELECT id, path FROM entries").fetchall()
+        gone = [(entry_id,) for entry_id, path in rows if not os.path.exists(path)]
+        if gone:
+            with self._lock:
+                self._forget(entry_id for (entry_id,) in gone)
+                self._db.executemany("DELETE FROM entries WHERE id = ?", gone)
+                self._db.commit()
+            logger.info(f"🧹 File index: pruned {len(gone)} missing items")
+
+    def _scan_age(self) -> float:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'scanned_at'").fetchone()
+        return time.time() - float(row[0]) if row else float("inf")
+
+    def _build(self):
+        try:
+            loaded = self._load_from_db()
+            if loaded:
+                logger.info(f"📦 File index: loaded {loaded} items from disk")
+                self._ready.set()
+            if not loaded or self._scan_age() > FILE_INDEX_MAX_AGE:
+                self._scan()
+                if loaded:
+                    self._prune_missing()
+        except Exception as e:
+            logger.error(f"❌ File index build failed: {e}")
+        finally:
+            self._ready.set()
+
+    def _watch(self):
+        roots = [r for r in self.roots if os.path.isdir(r)]
+        if watch is None or not roots:
+            if watch is None:
+                logger.warning("⚠️ watchfiles not installed; file index will not track changes")
+            return
+        default_filter = DefaultFilter()
+
+        def watch_filter(change, path: str) -> bool:
+            # node_modules, AppData...: busy trees the scan skips; their events are just noise
+            return default_filter(change, path) and not self._in_skipped_dir(os.path.normpath(path))
+
+        try:
+            for changes in watch(*roots, stop_event=self._stop, recursive=True, debounce=800,
+                                 watch_filter=watch_filter):
+                self.apply_changes(changes)
+        except Exception as e:
+            logger.error(f"❌ File index watcher stopped: {e}")
+
+    def apply_changes(self, changes):
+        """Applies a set of watchfiles (Change, path) events"""
+        added = []
+        for change, path in changes:
+            path = os.path.normpath(path)
+            name = os.path.basename(path)
+            if change == Change.deleted:
+                self.remove_path(path)
+            elif change == Change.added and self._within_depth(path) and not name.startswith((".", "$")):
+                if os.path.isdir(path):
+                    added.append((path, name, FOLDER))
+                elif os.path.isfile(path):
+                    added.append((path, name, FILE))
+        if added:
+            self.add_many(added)
+
+    def start(self):
+        """Builds in the background and starts watching for changes"""
+        if self._threads:
+            return self
+        builder = threading.Thread(target=self._build, name="file-index-build", daemon=True)
+        watcher = threading.Thread(target=self._watch, name="file-index-watch", daemon=True)
+        self._threads = [builder, watcher]
+        builder.start()
+        watcher.start()
+        return self
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def close(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        with self._lock:
+            self._db.close()
+
+    # ---------- lookup ----------
+
+    def _expand(self, token: str) -> List[str]:
+        """Token itself, else vocabulary words it prefixes ("reso" -> "resort", "resources")"""
+        if token in self._postings:
+            return [token]
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+        i = bisect_left(self._vocab, token)
+        expanded = []
+        while i < len(self._vocab) and self._vocab[i].startswith(token) and len(expanded) < 20:
+            expanded.append(self._vocab[i])
+            i += 1
+        return expanded
+
+    def _candidates(self, query: str, kind: Optional[int]) -> Dict[int, str]:
+        tokens = [t for t in tokenize(query) if len(t) > 1 or t.isdigit()]
+        postings = [self._postings[w] for t in tokens for w in self._expand(t)]
+        candidates: Dict[int, str] = {}
+        # Rarest tokens first, so "resume" wins over "my" when the cap is hit
+        for posting in sorted(postings, key=len):
+            for entry_id in posting[:MAX_CANDIDATES]:
+                name = self._names[entry_id]
+                if name is not None and (kind is None or self._kinds[entry_id] == kind):
+                    candidates[entry_id] = name
+            if len(candidates) >= MAX_CANDIDATES:
+                break
+        return candidates
+
+    def search(self, query: str, kind: Optional[int] = None, limit: int = 5,
+               cutoff: float = 0) -> List[Tuple[str, str, int, float]]:
+        """Returns (name, path, kind, score) best matches, highest score first"""
+        with self._lock:
+            candidates = self._candidates(query, kind)
+            if not candidates:
+                return []
+            ids = list(candidates)
+            hits = [(ids[m.index], m.score) for m in extract(query, list(candidates.values()), limit=limit, cutoff=cutoff)]
+
+            results = []
+            for entry_id, score in hits:
+                row = self._db.execute("SELECT path FROM entries WHERE id = ?", (entry_id,)).fetchone()
+                if row:
+                    results.append((self._names[entry_id], row[0], self._kinds[entry_id], score))
+            return results
+
+    def best(self, query: str, item_type: str = None, cutoff: float = 70) -> Optional[dict]:
+        """Same shape as the old search_item() result: {"name", "path", "type"}"""
+        kind = {"file": FILE, "folder": FOLDER}.get(item_type)
+        hits = self.search(query, kind=kind, limit=1, cutoff=cutoff)
+        if not hits:
+            return None
+        name, path, found_kind, score = hits[0]
+        logger.info(f"🔍 Matched '{query}' to '{name}' with score {score:.0f}")
+        return {"name": name, "path": path, "type": KIND_NAMES[found_kind]}
+
+
+_file_index: Optional[FileIndex] = None
+_file_index_lock = threading.Lock()
+
+def get_file_index() -> FileIndex:
+    """Shared, started index over the default roots"""
+    global _file_index
+    with _file_index_lock:
+        if _file_index is None:
+            os.makedirs("Data", exist_ok=True)
+            _file_index = FileIndex(default_roots(), db_path=os.path.join("Data", "file_index.db")).start()
+        return _file_index
@@ -2,13 +2,11 @@ import os
 import subprocess
 import sys
 import logging
-from fuzzywuzzy import process
 from livekit.agents import function_tool
 import asyncio
-try:
-    import pygetwindow as gw
-except ImportError:
-    gw = None
+from src.tools.file_index import get_file_index, FILE_INDEX_WAIT
+from src.tools.window_registry import get_window_registry
+from src.tools.waits import wait_for_window
 
 sys.stdout.reconfigure(encoding='utf-8')
 
@@ -16,60 +14,32 @@ sys.stdout.reconfigure(encoding='utf-8')
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Opened files usually show their window within the old fixed 1.5 s pause
+FILE_FOCUS_TIMEOUT = float(os.getenv("FILE_FOCUS_TIMEOUT", "2"))
+
 async def focus_window(title_keyword: str) -> bool:
-    if not gw:
+    registry = get_window_registry()
+    if not registry.available:
         logger.warning("⚠ pygetwindow")
         return False
 
-    await asyncio.sleep(1.5)
     title_keyword = title_keyword.lower().strip()
 
-    for window in gw.getAllWindows():
-        if title_keyword in window.title.lower():
-            if window.isMinimized:
-                window.restore()
-            window.activate()
-            logger.info(f"🪟 window focus में है: {window.title}")
-            return True
+    # Returns the moment the opened file's window shows up
+    window = await wait_for_window(title_keyword, FILE_FOCUS_TIMEOUT, registry)
+    if window:
+        registry.activate(window)
+        logger.info(f"🪟 window focus में है: {window.title}")
+        return True
     logger.warning("⚠ Focus करने के लिए window नहीं मिली।")
     return False
 
-# Index files more efficiently
-async def index_files(base_dirs):
-    file_index = []
-    for base_dir in base_dirs:
-        if not os.path.exists(base_dir):
-            continue
-        try:
-            with os.scandir(base_dir) as it:
-                for entry in it:
-                    if entry.is_file():
-                        file_index.append({
-                            "name": entry.name,
-                            "path": entry.path,
-                            "type": "file"
-                        })
-                    elif entry.is_dir():
-                        # Optional: scan one level deeper if needed, or just keep top-level
-                        pass
-        except Exception as e:
-            logger.error(f"Error scanning {base_dir}: {e}")
-    logger.info(f"✅ Indexed {len(file_index)} top-level files.")
-    return file_index
-
+# Files come from the shared background FileIndex (no per-call D:/ rescan)
 async def search_file(query, index):
-    choices = [item["name"] for item in index]
-    if not choices:
+    item = index.best(query, "file")
+    if item is None:
         logger.warning("⚠ Match करने के लिए कोई files नहीं हैं।")
-        return None
-
-    best_match, score = process.extractOne(query, choices)
-    logger.info(f"🔍 Matched '{query}' to '{best_match}' (Score: {score})")
-    if score > 70:
-        for item in index:
-            if item["name"] == best_match:
-                return item
-    return None
+    return item
 
 async def open_file(item):
     try:
@@ -96,7 +66,8 @@ async def handle_command(command, index):
 async def Play_file(name: str) -> str:
 
     """
-    Searches for and opens a file by name from the D:/ drive.
+    Finds a file by name in the shared file index and opens it. The index
+    covers D:/, C:/Users/Public and the user's Desktop, Documents and Downloads.
 
     Use this tool when the user wants to open a file like a video, PDF, document, image, etc.
     Example prompts:
@@ -106,7 +77,8 @@ async def Play_file(name: str) -> str:
     """
 
 
-    folders_to_index = ["D:/"]
-    index = await index_files(folders_to_index)
+    index = get_file_index()
+    if not index.wait_ready(0):
+        await asyncio.to_thread(index.wait_ready, FILE_INDEX_WAIT)
     command = name.strip()
     return await handle_command(command, index)
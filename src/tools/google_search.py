@@ -1,9 +1,12 @@
 import os
-import requests
+import httpx
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
 from livekit.agents import function_tool
+from src.tools.tool_cache import async_ttl_cache
+from src.core.http_client import http_pool
+from src.core.speculative import get_answer_clock, get_speculator
 
 # Load environment variables
 load_dotenv()
@@ -12,6 +15,54 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+# Same question within the TTL is answered from memory; SEARCH_CACHE_PATH also keeps it across restarts
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "900"))
+SEARCH_STALE_TTL = float(os.getenv("SEARCH_STALE_TTL", "0"))
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH") or None
+
+
+class SearchError(Exception):
+    pass
+
+
+def search_key(query: str, *args, **kwargs) -> str:
+    return " ".join(query.lower().split())
+
+
+@async_ttl_cache(ttl=SEARCH_CACHE_TTL, stale_ttl=SEARCH_STALE_TTL, maxsize=128, name="google_search",
+                 key=search_key, persist=SEARCH_CACHE_PATH)
+async def search_items(query: str, api_key: str, search_engine_id: str) -> list:
+    """Top 3 results as [{"title", "snippet"}]; raises SearchError on request/API errors"""
+    params = {
+        "key": api_key,
+        "cx": search_engine_id,
+        "q": query,
+        "num": 3
+    }
+    try:
+        logger.info("Google Custom Search API को request भेजी जा रही है... (Async)")
+        # Pooled async client: no thread hop, no new TLS handshake per search
+        response = await http_pool.get(SEARCH_URL, params=params, timeout=10)
+    except httpx.HTTPError as e:
+        logger.error(f"Request failed: {e}")
+        raise SearchError(f"Google Search API request failed: {e}")
+
+    if response.status_code != 200:
+        logger.error(f"Google API error: {response.status_code} - {response.text}")
+        raise SearchError(f"Google Search API में error आया: {response.status_code} - {response.text}")
+
+    return [{"title": item.get("title", "No title"), "snippet": item.get("snippet", "").strip()}
+            for item in response.json().get("items", [])]
+
+async def prefetch_items(query: str) -> list:
+    """search_items with credentials from the environment (speculative prefetch)"""
+    api_key = os.getenv("GOOGLE_SEARCH_API_KEY")
+    search_engine_id = os.getenv("SEARCH_ENGINE_ID")
+    if not api_key or not search_engine_id:
+        raise SearchError("Google Search credentials missing")
+    return await search_items(query, api_key, search_engine_id)
+
 @function_tool()
 async def google_search(query: str) -> str:
     """
@@ -32,29 +83,15 @@ async def google_search(query: str) -> str:
             missing.append("SEARCH_ENGINE_ID")
         return f"Missing environment variables: {', '.join(missing)}"
 
-    url = "https://www.googleapis.com/customsearch/v1"
-    params = {
-        "key": api_key,
-        "cx": search_engine_id,
-        "q": query,
-        "num": 3
-    }
-
-    import asyncio
-    try:
-        logger.info("Google Custom Search API को request भेजी जा रही है... (Async)")
-        # Run blocking request in a separate thread to prevent Audio Stutter
-        response = await asyncio.to_thread(requests.get, url, params=params, timeout=10)
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request failed: {e}")
-        return f"Google Search API request failed: {e}"
-
-    if response.status_code != 200:
-        logger.error(f"Google API error: {response.status_code} - {response.text}")
-        return f"Google Search API में error आया: {response.status_code} - {response.text}"
-
-    data = response.json()
-    results = data.get("items", [])
+    # Started from the transcript while Gemini was still speaking, if it was predicted
+    results = await get_speculator().take(query)
+    prefetched = bool(results)
+    if not prefetched:
+        try:
+            results = await search_items(query, api_key, search_engine_id)
+        except SearchError as e:
+            return str(e)
+    get_answer_clock().result_ready(prefetched)
 
     if not results:
         logger.info("कोई results नहीं मिले।")
@@ -63,8 +100,8 @@ async def google_search(query: str) -> str:
     # Create a natural, speech-friendly summary
     formatted = "Here are the top results:\n"
     for i, item in enumerate(results, start=1):
-        title = item.get("title", "No title")
-        snippet = item.get("snippet", "").strip()
+        title = item["title"]
+        snippet = item["snippet"]
         formatted += f"{i}. {title}. {snippet}\n\n"
 
     # CRITICAL: Add System Hint for Visualization
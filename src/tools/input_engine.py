@@ -0,0 +1,263 @@
+"""
+INPUT ENGINE
+Sends whole strings in one go instead of one awaited keypress per char:
+
+  paste - clipboard + Ctrl+V (large blocks; the old clipboard is restored)
+  bulk  - one SendInput call with KEYEVENTF_UNICODE events (Windows)
+  keys  - pynput's keyboard.type(): per-char events, but no sleeps in between
+  chars - per-char with a delay, only when asked for (apps that drop fast input)
+
+Backends are plain objects with `name`, `available` and send_text(text) /
+hotkey(keys), so RecordingBackend can stand in for all of them headless.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Callable, List, Optional
+
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
+try:
+    from pynput.keyboard import Key, Controller as KeyboardController
+except Exception:  # ImportError, or no display to attach to on Linux
+    Key = KeyboardController = None
+
+logger = logging.getLogger(__name__)
+
+AUTO, PASTE, BULK, KEYS, CHARS = "auto", "paste", "bulk", "keys", "chars"
+MODES = (AUTO, PASTE, BULK, KEYS, CHARS)
+
+# Strings at least this long are pasted instead of typed
+INPUT_PASTE_THRESHOLD = int(os.getenv("INPUT_PASTE_THRESHOLD", "200"))
+# The target app reads the clipboard asynchronously after Ctrl+V
+INPUT_PASTE_RESTORE_DELAY = float(os.getenv("INPUT_PASTE_RESTORE_DELAY", "0.15"))
+INPUT_CHAR_INTERVAL = float(os.getenv("INPUT_CHAR_INTERVAL", "0.01"))
+
+
+class PartialInputError(OSError):
+    """A backend typed only the start of the text; `remaining` is what still needs sending"""
+
+    def __init__(self, message: str, remaining: str):
+        super().__init__(message)
+        self.remaining = remaining
+
+
+def clean_text(text: str) -> str:
+    """Drops control characters except newline/tab; CRLF becomes a single newline"""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return "".join(c for c in text if c.isprintable() or c in "\n\t")
+
+
+class RecordingBackend:
+    """Records what would have been sent; the headless stand-in for every backend"""
+
+    def __init__(self, available: bool = True, name: str = "recording"):
+        self.name = name
+        self.available = available
+        self.events: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def send_text(self, text: str):
+        with self._lock:
+            self.events.append(("text", text))
+
+    def tap(self, char: str):
+        with self._lock:
+            self.events.append(("tap", char))
+
+    def hotkey(self, keys: List):
+        with self._lock:
+            self.events.append(("hotkey", tuple(keys)))
+
+    def typed(self) -> str:
+        return "".join(e[1] for e in self.events if e[0] in ("text", "tap"))
+
+
+class PynputBackend:
+    name = KEYS
+
+    def __init__(self, keyboard=None):
+        if keyboard is None and KeyboardController is not None:
+            keyboard = KeyboardController()
+        self.keyboard = keyboard
+        self.available = keyboard is not None
+
+    def send_text(self, text: str):
+        self.keyboard.type(text)
+
+    def tap(self, char: str):
+        self.keyboard.press(char)
+        self.keyboard.release(char)
+
+    def hotkey(self, keys: List):
+        for k in keys:
+            self.keyboard.press(k)
+        for k in reversed(keys):
+            self.keyboard.release(k)
+
+
+class SendInputBackend:
+    """
+    All key events for the string in one SendInput call per chunk (Windows only).
+    Text only: hotkeys and single taps go through InputEngine.keys.
+    """
+    name = BULK
+    CHUNK = 1000  # Events per call; very large batches can overflow some apps' input queues
+
+    def __init__(self):
+        self.available = os.name == "nt"
+        if self.available:
+            self._setup()
+
+    def _setup(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong))]
+
+        class MOUSEINPUT(ctypes.Structure):
+            # Largest union member: it sets sizeof(INPUT), which SendInput checks
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                        ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                        ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong))]
+
+        class _INPUTUNION(ctypes.Union):
+            _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+        self._ctypes = ctypes
+        self._INPUT = INPUT
+        self._send = ctypes.windll.user32.SendInput
+
+    def _events(self, text: str):
+        """(vk, scan, flags, index of the character in text) for every key event"""
+        KEYUP, UNICODE = 0x0002, 0x0004
+        special = {"\n": 0x0D, "\t": 0x09}  # VK_RETURN, VK_TAB: apps expect key presses, not chars
+        for index, c in enumerate(text):
+            if c in special:
+                vk = special[c]
+                yield vk, 0, 0, index
+                yield vk, 0, KEYUP, index
+                continue
+            # Characters outside the BMP go as two UTF-16 surrogate units
+            data = c.encode("utf-16-le")
+            for i in range(0, len(data), 2):
+                unit = int.from_bytes(data[i:i + 2], "little")
+                yield 0, unit, UNICODE, index
+                yield 0, unit, UNICODE | KEYUP, index
+
+    def send_text(self, text: str):
+        events = list(self._events(text))
+        size = self._ctypes.sizeof(self._INPUT)
+        for start in range(0, len(events), self.CHUNK):
+            chunk = events[start:start + self.CHUNK]
+            inputs = (self._INPUT * len(chunk))()
+            for item, (vk, scan, flags, _) in zip(inputs, chunk):
+                item.type = 1  # INPUT_KEYBOARD
+                item.u.ki.wVk, item.u.ki.wScan, item.u.ki.dwFlags = vk, scan, flags
+            sent = self._send(len(chunk), inputs, size)
+            if sent != len(chunk):
+                # Blocked by UIPI (elevated target window) or the desktop is locked.
+                # Events go in order: everything before the first missing one was typed
+                unsent = chunk[sent][3]
+                if sent and chunk[sent - 1][3] == unsent:
+                    unsent += 1  # Its key-down went in, so the character is already there
+                raise PartialInputError(f"SendInput inserted {sent}/{len(chunk)} events", text[unsent:])
+
+
+class ClipboardBackend:
+    """Copy, Ctrl+V through the keys backend, then put the user's clipboard back"""
+    name = PASTE
+
+    def __init__(self, keys, copy: Callable[[str], None] = None, read: Callable[[], str] = None,
+                 restore_delay: float = INPUT_PASTE_RESTORE_DELAY):
+        self.keys = keys
+        self.copy = copy or (pyperclip.copy if pyperclip else None)
+        self.read = read or (pyperclip.paste if pyperclip else None)
+        self.restore_delay = restore_delay
+        self.available = self.copy is not None and self.read is not None and keys.available
+
+    def send_text(self, text: str):
+        try:
+            previous = self.read()
+        except Exception:
+            previous = None  # Non-text clipboard content: nothing we can restore
+        self.copy(text)
+        ctrl = Key.ctrl if Key is not None else "ctrl"
+        self.keys.hotkey([ctrl, "v"])
+        time.sleep(self.restore_delay)
+        if previous is not None:
+            self.copy(previous)
+
+    def hotkey(self, keys: List):
+        self.keys.hotkey(keys)
+
+
+class InputEngine:
+    def __init__(self, keys=None, bulk=None, clipboard=None,
+                 paste_threshold: int = INPUT_PASTE_THRESHOLD):
+        self.keys = keys or PynputBackend()
+        self.bulk = bulk or SendInputBackend()
+        self.clipboard = clipboard or ClipboardBackend(self.keys)
+        self.paste_threshold = paste_threshold
+
+    def _chain(self, text: str, mode: str) -> list:
+        if mode == PASTE or (mode == AUTO and len(text) >= self.paste_threshold):
+            return [self.clipboard, self.bulk, self.keys]
+        if mode == KEYS:
+            return [self.keys]
+        return [self.bulk, self.keys]
+
+    async def type_text(self, text: str, mode: str = AUTO, interval: float = INPUT_CHAR_INTERVAL) -> Optional[str]:
+        """Sends text to the focused window; returns the backend used, or None if all failed"""
+        text = clean_text(text)
+        if not text:
+            return KEYS
+        if mode == CHARS:
+            for char in text:
+                await asyncio.to_thread(self.keys.tap, char)
+                await asyncio.sleep(interval)
+            return CHARS
+
+        for backend in self._chain(text, mode):
+            if not backend.available:
+                continue
+            try:
+                await asyncio.to_thread(backend.send_text, text)
+                return backend.name
+            except PartialInputError as e:
+                # Only the rest goes to the next backend; what got through must not be typed twice
+                logger.warning(f"⚠️ {backend.name} input stopped early ({e}), falling back for "
+                               f"{len(e.remaining)}/{len(text)} chars")
+                text = e.remaining
+                if not text:
+                    return backend.name
+            except Exception as e:
+                logger.warning(f"⚠️ {backend.name} input failed ({e}), falling back")
+        return None
+
+    async def hotkey(self, keys: List):
+        """Presses keys in order and releases them in reverse, with no delays in between"""
+        await asyncio.to_thread(self.keys.hotkey, keys)
+
+    async def tap(self, key):
+        await asyncio.to_thread(self.keys.tap, key)
+
+
+# Singleton Instance
+_engine: Optional[InputEngine] = None
+
+def get_input_engine() -> InputEngine:
+    global _engine
+    if _engine is None:
+        _engine = InputEngine()
+    return _engine
@@ -1,5 +1,7 @@
 import pyautogui
 import asyncio
+import atexit
+import threading
 import time
 import os
 import logging
@@ -8,18 +10,61 @@ from pynput.keyboard import Key, Controller as KeyboardController
 from pynput.mouse import Button, Controller as MouseController
 from typing import List
 from livekit.agents import function_tool
+from src.vision.rate_control import notify_input
+from src.tools.input_engine import MODES, AUTO, InputEngine, get_input_engine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CONTROL_LOG_PATH = os.getenv("CONTROL_LOG_PATH", "control_log.txt")
+CONTROL_LOG_FLUSH_INTERVAL = float(os.getenv("CONTROL_LOG_FLUSH_INTERVAL", "5"))
+
+# ---------------------
+# Buffered control log
+# ---------------------
+class ControlLog:
+    """Appends to control_log.txt in batches instead of an open/close per action"""
+
+    def __init__(self, path: str = CONTROL_LOG_PATH, flush_interval: float = CONTROL_LOG_FLUSH_INTERVAL,
+                 max_lines: int = 100):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_lines = max_lines
+        self._lines = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def write(self, action: str):
+        with self._lock:
+            self._lines.append(f"{datetime.now()}: {action}\n")
+            due = len(self._lines) >= self.max_lines or \
+                time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            lines, self._lines = self._lines, []
+            self._last_flush = time.monotonic()
+        if not lines:
+            return
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        except Exception:
+            pass
+
 # ---------------------
 # SafeController Class
 # ---------------------
 class SafeController:
-    def __init__(self):
+    def __init__(self, engine: InputEngine = None, control_log: ControlLog = None):
         self.active = False
         self.activation_time = None
+        self.engine = engine or get_input_engine()
+        self.control_log = control_log or ControlLog()
         self.keyboard = KeyboardController()
         self.mouse = MouseController()
         self.valid_keys = set("abcdefghijklmnopqrstuvwxyz1234567890")
@@ -40,11 +85,7 @@ class SafeController:
         # Using standard logging instead of separate file to keep it clean, 
         # but maintaining the method signature if logic depends on it.
         logger.info(f"CONTROL_ACTION: {action}")
-        try:
-             with open("control_log.txt", "a") as f:
-                f.write(f"{datetime.now()}: {action}\n")
-        except Exception:
-            pass
+        self.control_log.write(action)
 
     def activate(self, token=None):
         if token != "my_secret_token":
@@ -101,20 +142,17 @@ class SafeController:
         self.log(f"Mouse scrolled {direction}")
         return f"🖱️ Scrolled {direction}"
 
-    async def type_text(self, text: str):
+    async def type_text(self, text: str, mode: str = AUTO):
         if not self.is_active(): return "🛑 Controller is inactive."
-        for char in text:
-            # Allow common whitespace even if not 'printable' in strict sense
-            if not char.isprintable() and char not in ['\n', '\t', '\r']:
-                continue
-            try:
-                self.keyboard.press(char)
-                self.keyboard.release(char)
-                await asyncio.sleep(0.01) # Faster typing
-            except Exception:
-                continue
-        self.log(f"Typed text: {text}")
-        return f"⌨️ Typed: {text}"
+        if mode not in MODES:
+            return f"❌ Invalid typing mode: {mode}"
+        # Whole string in one batch (paste / SendInput); per-char only when mode="chars"
+        method = await self.engine.type_text(text, mode)
+        if method is None:
+            return f"❌ Typing failed: {text[:50]}"
+        preview = text if len(text) <= 80 else f"{text[:80]}... ({len(text)} chars)"
+        self.log(f"Typed text via {method}: {preview}")
+        return f"⌨️ Typed: {preview}"
 
     async def press_key(self, key: str):
         if not self.is_active(): return "🛑 Controller is inactive."
@@ -122,8 +160,7 @@ class SafeController:
             return f"❌ Invalid key: {key}"
         k = self.resolve_key(key)
         try:
-            self.keyboard.press(k)
-            self.keyboard.release(k)
+            await self.engine.tap(k)
         except Exception as e:
             return f"❌ Failed key: {key} — {e}"
         await asyncio.sleep(0.2)
@@ -138,8 +175,10 @@ class SafeController:
                 return f"❌ Invalid key in hotkey: {k}"
             resolved.append(self.resolve_key(k))
 
-        for k in resolved: self.keyboard.press(k)
-        for k in reversed(resolved): self.keyboard.release(k)
+        try:
+            await self.engine.hotkey(resolved)
+        except Exception as e:
+            return f"❌ Failed hotkey: {' + '.join(keys)} — {e}"
         await asyncio.sleep(0.3)
         self.log(f"Pressed hotkey: {' + '.join(keys)}")
         return f"⌨️ Hotkey {' + '.join(keys)} pressed."
@@ -175,6 +214,7 @@ async def with_temporary_activation(fn, *args, **kwargs):
     # Using the magic token from the class
     controller.activate("my_secret_token")
     result = await fn(*args, **kwargs)
+    notify_input(fn.__name__) # Vision speeds up: the screen is about to change
     await asyncio.sleep(0.1) # Reduced from 2s to 0.1s
     controller.deactivate()
     return result
@@ -249,19 +289,22 @@ async def scroll_cursor_tool(direction: str, amount: int = 10):
     return await with_temporary_activation(controller.scroll_cursor, direction, amount)
 
 @function_tool()
-async def type_text_tool(text: str):
+async def type_text_tool(text: str, mode: str = "auto"):
     """
-    Simulates typing the given text character by character, as if entered manually from a keyboard.
+    Types the given text into the focused window, as if entered from a keyboard.
 
     Useful for commands like "type hello world" or "hello likho".
 
     Args:
         text (str): The full string to type, including spaces, punctuation, and symbols.
+        mode (str, optional): "auto" (default; long text is pasted, short text sent in one batch),
+            "paste", "bulk", "keys", or "chars" (slow per-character typing, only for apps
+            that drop fast input).
 
     Returns:
         str: A message confirming the typed input.
     """
-    return await with_temporary_activation(controller.type_text, text)
+    return await with_temporary_activation(controller.type_text, text, mode)
 
 @function_tool()
 async def press_key_tool(key: str):
@@ -0,0 +1,246 @@
+"""
+APP LAUNCHER
+Resolves an app name to something we can start directly (exe path, Start
+menu shortcut or URI) and launches it with subprocess, so open_app no longer
+has to drive the Start menu with keystrokes.
+
+Resolution runs through a chain of resolvers (APP_MAPPINGS, PATH, App Paths
+registry key, Start menu .lnk scan) and the answers, including misses, are
+cached. Resolvers are plain objects with resolve(name), so the chain can be
+swapped for a StaticResolver when testing on Linux.
+"""
+import os
+import struct
+import shutil
+import logging
+import functools
+import threading
+import subprocess
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from src.tools.matcher import Matcher
+
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+logger = logging.getLogger(__name__)
+
+EXE, SHORTCUT, URI = "exe", "shortcut", "uri"
+
+
+class LaunchTarget(NamedTuple):
+    kind: str        # exe | shortcut | uri
+    target: str      # path or URI
+    source: str      # which resolver found it
+
+
+class LaunchResult(NamedTuple):
+    ok: bool
+    pid: Optional[int]
+    target: Optional[LaunchTarget]
+    error: str = ""
+
+
+class StaticResolver:
+    """name -> LaunchTarget table; also the test double for the other resolvers"""
+
+    def __init__(self, table: Dict[str, LaunchTarget]):
+        self.table = {k.lower(): v for k, v in table.items()}
+
+    def resolve(self, name: str) -> Optional[LaunchTarget]:
+        return self.table.get(name)
+
+
+class PathResolver:
+    """Executables on PATH (notepad.exe, calc.exe, code)"""
+
+    def __init__(self, which: Callable[[str], Optional[str]] = shutil.which):
+        self.which = which
+
+    def resolve(self, name: str) -> Optional[LaunchTarget]:
+        path = self.which(name)
+        if not path and not name.endswith(".exe"):
+            path = self.which(name + ".exe")
+        return LaunchTarget(EXE, path, "path") if path else None
+
+
+class AppPathsResolver:
+    """HKLM/HKCU ...\\CurrentVersion\\App Paths\\<exe>: where chrome.exe, winword.exe etc. register"""
+    KEY = r"Software\Microsoft\Windows\CurrentVersion\App Paths"
+
+    def __init__(self, reader: Callable[[str], Optional[str]] = None):
+        self.reader = reader or self._read_registry
+
+    def _read_registry(self, exe: str) -> Optional[str]:
+        if winreg is None:
+            return None
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(hive, f"{self.KEY}\\{exe}") as key:
+                    value, _ = winreg.QueryValueEx(key, None)
+                    if value:
+                        return os.path.expandvars(value.strip('"'))
+            except OSError:
+                continue
+        return None
+
+    def resolve(self, name: str) -> Optional[LaunchTarget]:
+        exe = name if name.endswith(".exe") else name.replace(" ", "") + ".exe"
+        path = self.reader(exe)
+        return LaunchTarget(EXE, path, "app_paths") if path else None
+
+
+def start_menu_dirs() -> List[str]:
+    return [
+        os.path.join(os.environ.get("PROGRAMDATA", r"C:\ProgramData"), r"Microsoft\Windows\Start Menu\Programs"),
+        os.path.join(os.environ.get("APPDATA", ""), r"Microsoft\Windows\Start Menu\Programs"),
+    ]
+
+
+class StartMenuResolver:
+    """Start menu shortcuts by name: what the old keystroke path found through Windows Search"""
+
+    def __init__(self, directories: Iterable[str] = None, cutoff: float = 85):
+        self.directories = list(directories) if directories is not None else start_menu_dirs()
+        self.cutoff = cutoff
+        self._shortcuts: Optional[Dict[str, str]] = None
+        self._matcher: Optional[Matcher] = None
+        self._lock = threading.Lock()
+
+    def _scan(self):
+        shortcuts = {}
+        for directory in self.directories:
+            for root, _, files in os.walk(directory):
+                for f in files:
+                    stem, ext = os.path.splitext(f)
+                    if ext.lower() == ".lnk" and "uninstall" not in stem.lower():
+                        shortcuts.setdefault(stem.lower(), os.path.join(root, f))
+        self._shortcuts = shortcuts
+        self._matcher = Matcher(list(shortcuts))
+        logger.info(f"📇 Launcher: {len(shortcuts)} Start menu shortcuts")
+
+    def resolve(self, name: str) -> Optional[LaunchTarget]:
+        with self._lock:
+            if self._shortcuts is None:
+                self._scan()
+        path = self._shortcuts.get(name)
+        if path is None:
+            match = self._matcher.best(name, cutoff=self.cutoff)
+            path = self._shortcuts[match.choice] if match else None
+        return LaunchTarget(SHORTCUT, path, "start_menu") if path else None
+
+
+class MappingResolver:
+    """APP_MAPPINGS values ("chrome.exe", "start ms-settings:") resolved through the exe resolvers"""
+
+    def __init__(self, mappings: Dict[str, str], exe_resolvers: List):
+        self.mappings = {k.lower(): v for k, v in mappings.items()}
+        self.exe_resolvers = exe_resolvers
+
+    def resolve(self, name: str) -> Optional[LaunchTarget]:
+        command = self.mappings.get(name)
+        if not command:
+            return None
+        if command.startswith("start "):
+            return LaunchTarget(URI, command[len("start "):].strip(), "mapping")
+        for resolver in self.exe_resolvers:
+            target = resolver.resolve(command)
+            if target:
+                return target._replace(source=f"mapping+{target.source}")
+        return None
+
+
+IMAGE_SUBSYSTEM_WINDOWS_CUI = 3
+
+
+@functools.lru_cache(maxsize=128)
+def is_console_exe(path: str) -> bool:
+    """True for console-subsystem executables (cmd, powershell, python), read from the PE header"""
+    try:
+        with open(path, "rb") as f:
+            if f.read(2) != b"MZ":
+                return False
+            f.seek(0x3C)
+            pe_offset = struct.unpack("<I", f.read(4))[0]
+            f.seek(pe_offset)
+            if f.read(4) != b"PE\0\0":
+                return False
+            # Subsystem: 68 bytes into the optional header, which follows the 20-byte COFF header
+            f.seek(pe_offset + 4 + 20 + 68)
+            return struct.unpack("<H", f.read(2))[0] == IMAGE_SUBSYSTEM_WINDOWS_CUI
+    except (OSError, struct.error):
+        return False
+
+
+def spawn(target: LaunchTarget) -> Optional[int]:
+    """Starts the target detached from Jarvis; returns the pid when there is one"""
+    if target.kind == EXE:
+        if os.name == "nt" and is_console_exe(target.target):
+            # A detached console app gets no console and exits at once: give it its own,
+            # with its std handles left on that console (redirected to DEVNULL it exits too)
+            proc = subprocess.Popen([target.target], close_fds=True,
+                                    creationflags=subprocess.CREATE_NEW_CONSOLE | subprocess.CREATE_NEW_PROCESS_GROUP)
+            return proc.pid
+        flags = 0
+        if os.name == "nt":
+            flags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        proc = subprocess.Popen([target.target], creationflags=flags, close_fds=True,
+                                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return proc.pid
+    # Shortcuts and URIs go through the shell; no pid to report
+    if os.name == "nt":
+        os.startfile(target.target)
+    else:
+        subprocess.Popen(["xdg-open", target.target], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return None
+
+
+class Launcher:
+    def __init__(self, resolvers: List, spawner: Callable[[LaunchTarget], Optional[int]] = spawn):
+        self.resolvers = resolvers
+        self.spawner = spawner
+        self._cache: Dict[str, Optional[LaunchTarget]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, name: str) -> Optional[LaunchTarget]:
+        name = name.lower().strip()
+        with self._lock:
+            if name in self._cache:
+                return self._cache[name]
+        target = None
+        for resolver in self.resolvers:
+            try:
+                target = resolver.resolve(name)
+            except Exception as e:
+                logger.warning(f"⚠️ {type(resolver).__name__} failed for '{name}': {e}")
+                continue
+            if target:
+                break
+        with self._lock:
+            self._cache[name] = target  # Misses are cached too: they go to keystroke mode
+        return target
+
+    def forget(self, name: str):
+        with self._lock:
+            self._cache.pop(name.lower().strip(), None)
+
+    def launch(self, name: str) -> LaunchResult:
+        target = self.resolve(name)
+        if target is None:
+            return LaunchResult(False, None, None, "not resolved")
+        try:
+            pid = self.spawner(target)
+            logger.info(f"🚀 Launched '{name}' via {target.source}: {target.target} (pid {pid})")
+            return LaunchResult(True, pid, target)
+        except OSError as e:
+            # Stale entry (app uninstalled/moved): resolve again next time
+            self.forget(name)
+            logger.warning(f"⚠️ Direct launch of '{name}' failed: {e}")
+            return LaunchResult(False, None, target, str(e))
+
+
+def default_launcher(mappings: Dict[str, str]) -> Launcher:
+    exe_resolvers = [PathResolver(), AppPathsResolver()]
+    return Launcher([MappingResolver(mappings, exe_resolvers), *exe_resolvers, StartMenuResolver()])
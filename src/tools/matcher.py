@@ -0,0 +1,82 @@
+"""
+FUZZY MATCHER
+One RapidFuzz-based matching API for apps, windows and files.
+Choices are normalized once up front; results carry the index of the
+matched choice, so callers never rescan the list to find the item again.
+Large corpora are scored with process.cdist across all cores.
+"""
+import os
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from rapidfuzz import fuzz, process, utils
+
+# Above this many choices (and with enough cores), score with cdist(workers=-1).
+# On 1-2 cores extract() wins thanks to its rising score cutoff.
+PARALLEL_THRESHOLD = 20000
+PARALLEL = (os.cpu_count() or 1) >= 4
+DEFAULT_SCORER = fuzz.WRatio
+
+
+class Match(NamedTuple):
+    choice: str
+    score: float
+    index: int
+
+
+def normalize(text: str) -> str:
+    return utils.default_process(text or "")
+
+
+class Matcher:
+    """Precomputed, normalized choices; reuse it when the choices don't change (APP_MAPPINGS)"""
+
+    def __init__(self, choices: Sequence[str], scorer=DEFAULT_SCORER):
+        self.choices = list(choices)
+        self.normalized = [normalize(c) for c in self.choices]
+        self.scorer = scorer
+
+    def __len__(self):
+        return len(self.choices)
+
+    def extract(self, query: str, limit: int = 5, cutoff: float = 0) -> List[Match]:
+        """Top `limit` matches with score >= cutoff, best first"""
+        if not self.choices:
+            return []
+        query = normalize(query)
+        if PARALLEL and len(self.choices) >= PARALLEL_THRESHOLD:
+            return self._extract_parallel(query, limit, cutoff)
+        if limit == 1:
+            best = process.extractOne(query, self.normalized, scorer=self.scorer, processor=None,
+                                      score_cutoff=cutoff)
+            return [Match(self.choices[best[2]], best[1], best[2])] if best else []
+        ranked = process.extract(query, self.normalized, scorer=self.scorer, processor=None,
+                                 limit=limit, score_cutoff=cutoff)
+        return [Match(self.choices[i], score, i) for _, score, i in ranked]
+
+    def _extract_parallel(self, query: str, limit: int, cutoff: float) -> List[Match]:
+        scores = process.cdist([query], self.normalized, scorer=self.scorer, processor=None,
+                               score_cutoff=cutoff, dtype=np.float32, workers=-1)[0]
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [Match(self.choices[i], float(scores[i]), int(i)) for i in top if scores[i] >= cutoff and scores[i] > 0]
+
+    def best(self, query: str, cutoff: float = 0) -> Optional[Match]:
+        matches = self.extract(query, limit=1, cutoff=cutoff)
+        return matches[0] if matches else None
+
+    def score_matrix(self, queries: Sequence[str]) -> np.ndarray:
+        """len(queries) x len(choices) score matrix, computed in parallel"""
+        return process.cdist([normalize(q) for q in queries], self.normalized, scorer=self.scorer,
+                             processor=None, dtype=np.float32, workers=-1)
+
+
+def extract(query: str, choices: Sequence[str], limit: int = 5, cutoff: float = 0) -> List[Match]:
+    """One-off match against a list that changes every call (e.g. window titles)"""
+    return Matcher(choices).extract(query, limit=limit, cutoff=cutoff)
+
+
+def best_match(query: str, choices: Sequence[str], cutoff: float = 0) -> Optional[Match]:
+    matches = extract(query, choices, limit=1, cutoff=cutoff)
+    return matches[0] if matches else None
@@ -0,0 +1,41 @@
+import asyncio
+import time
+import logging
+from livekit.agents import function_tool
+from src.memory.store import get_memory
+from src.memory.semantic import get_semantic_memory
+from src.memory.records import format_timestamp, timestamp_seconds
+
+logger = logging.getLogger(__name__)
+
+@function_tool()
+async def recall_memory(query: str, days: int = 0) -> str:
+    """
+    Searches past conversations with the user by keyword.
+
+    Use this when the user asks about something said earlier, e.g.
+    - "What did I ask about the Nepal weather last week?"
+    - "Pahile maile k bhaneko thiye music ko barema?"
+
+    Args:
+        query: Keywords to look for (e.g. "Nepal weather").
+        days: Only search the last N days. 0 searches everything.
+    """
+    since = time.time() - days * 86400 if days > 0 else 0.0
+    try:
+        hits = await asyncio.to_thread(get_memory().search, query, 5, since)
+        if not hits:
+            # No keyword overlap: fall back to recall by meaning
+            semantic = await asyncio.to_thread(get_semantic_memory)
+            if semantic is not None:
+                hits = await asyncio.to_thread(semantic.recall, query, 5)
+                hits = [h for h in hits if timestamp_seconds(h.get("timestamp")) >= since]
+    except Exception as e:
+        logger.error(f"Memory recall failed: {e}")
+        return f"❌ Memory recall failed: {e}"
+
+    if not hits:
+        return "No matching past conversation found."
+
+    lines = [f"- [{format_timestamp(hit['timestamp'])}] {hit['role']}: {hit['text']}" for hit in hits]
+    return "Past conversation matches:\n" + "\n".join(lines)
@@ -0,0 +1,188 @@
+"""
+LAZY TOOL REGISTRY
+Tool modules pull in pyautogui, pynput, pywhatkit, pycaw/comtypes, mss, PIL,
+rapidfuzz and the Groq SDK. Importing them all before the worker can take a
+job is most of the cold start, so agent.py and the planner get stand-ins:
+
+- the stand-in's signature and docstring (= the tool schema) are read from the
+  module source with `ast`, without importing it
+- the real module is imported on first call, or earlier by warm_up() in a
+  background thread
+"""
+import ast
+import sys
+import time
+import asyncio
+import typing
+import inspect
+import logging
+import importlib
+import importlib.util
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tool name -> module defining it (as a function_tool)
+TOOL_MODULES: Dict[str, str] = {
+    "ask_groq_planner": "src.core.groq_brain",
+    "open_app": "src.tools.window_ctrl",
+    "close_app": "src.tools.window_ctrl",
+    "folder_file": "src.tools.window_ctrl",
+    "minimize_window": "src.tools.window_ctrl",
+    "maximize_window": "src.tools.window_ctrl",
+    "list_open_windows": "src.tools.window_ctrl",
+    "open_url": "src.tools.window_ctrl",
+    "move_cursor_tool": "src.tools.inputs",
+    "mouse_click_tool": "src.tools.inputs",
+    "scroll_cursor_tool": "src.tools.inputs",
+    "type_text_tool": "src.tools.inputs",
+    "press_key_tool": "src.tools.inputs",
+    "press_hotkey_tool": "src.tools.inputs",
+    "swipe_gesture_tool": "src.tools.inputs",
+    "mouse_move_to_coords": "src.tools.inputs",
+    "system_control_tool": "src.tools.system_ctrl",
+    "get_battery_status": "src.tools.system_ctrl",
+    "play_youtube_tool": "src.tools.media",
+    "search_youtube_tool": "src.tools.media",
+    "google_search": "src.tools.google_search",
+    "get_current_datetime": "src.tools.google_search",
+    "get_weather": "src.tools.weather",
+    "generate_content_tool": "src.tools.content",
+    "recall_memory": "src.tools.memory_search",
+}
+
+# Names annotations may use in tool signatures
+_ANNOTATION_NAMES = {name: getattr(typing, name) for name in typing.__all__}
+_ANNOTATION_NAMES.update({t.__name__: t for t in (str, int, float, bool, list, dict, tuple, type(None))})
+
+_lock = threading.Lock()
+_loaded: Dict[str, Callable] = {}
+_import_ms: Dict[str, float] = {}
+_sources: Dict[str, ast.Module] = {}
+_warm_thread: Optional[threading.Thread] = None
+
+
+def import_module(module: str):
+    """
+    importlib.import_module, timed when it actually imports. A module being
+    imported by another thread is waited for (Python's per-module import lock).
+    """
+    fresh = module not in sys.modules
+    started = time.perf_counter()
+    imported = importlib.import_module(module)
+    if fresh:
+        with _lock:
+            _import_ms.setdefault(module, (time.perf_counter() - started) * 1000)
+    return imported
+
+
+def load(name: str) -> Callable:
+    """The real tool function (imports its module on first use)"""
+    fn = _loaded.get(name)
+    if fn is None:
+        module = TOOL_MODULES[name]
+        fn = getattr(import_module(module), name)
+        _loaded[name] = fn
+        logger.debug(f"🔌 Loaded tool '{name}' from {module}")
+    return fn
+
+
+def _module_ast(module: str) -> ast.Module:
+    if module not in _sources:
+        origin = importlib.util.find_spec(module).origin
+        with open(origin, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=origin)
+        with _lock:
+            _sources[module] = tree
+    return _sources[module]
+
+
+def _annotation(node: Optional[ast.expr]):
+    if node is None:
+        return inspect.Parameter.empty
+    return eval(compile(ast.Expression(node), "<annotation>", "eval"), {"__builtins__": {}}, _ANNOTATION_NAMES)
+
+
+def read_signature(name: str):
+    """(Signature, docstring) of a tool, parsed from its module source without importing it"""
+    for node in _module_ast(TOOL_MODULES[name]).body:
+        if isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef)) and node.name == name:
+            break
+    else:
+        raise LookupError(f"{name} not found in {TOOL_MODULES[name]}")
+
+    args = node.args
+    positional = args.posonlyargs + args.args
+    defaults = [inspect.Parameter.empty] * (len(positional) - len(args.defaults)) + \
+        [ast.literal_eval(d) for d in args.defaults]
+    params = [inspect.Parameter(a.arg, inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                                default=d, annotation=_annotation(a.annotation))
+              for a, d in zip(positional, defaults)]
+    for a, d in zip(args.kwonlyargs, args.kw_defaults):
+        params.append(inspect.Parameter(a.arg, inspect.Parameter.KEYWORD_ONLY,
+                                        default=inspect.Parameter.empty if d is None else ast.literal_eval(d),
+                                        annotation=_annotation(a.annotation)))
+    signature = inspect.Signature(params, return_annotation=_annotation(node.returns))
+    return signature, ast.get_docstring(node, clean=False)
+
+
+def lazy_callable(name: str) -> Callable:
+    """
+    Async stand-in with the tool's name, signature and docstring; imports the
+    real tool on first call. Falls back to the real tool if the source can't be read.
+    """
+    try:
+        signature, doc = read_signature(name)
+    except Exception as e:
+        logger.warning(f"⚠️ No lazy schema for '{name}' ({e}); importing it now")
+        return load(name)
+
+    async def tool(*args, **kwargs):
+        fn = _loaded.get(name)
+        if fn is None:
+            # First call: don't block the event loop on the import
+            fn = await asyncio.to_thread(load, name)
+        return await fn(*args, **kwargs)
+
+    tool.__name__ = tool.__qualname__ = name
+    tool.__doc__ = doc
+    tool.__signature__ = signature
+    tool.__annotations__ = {p.name: p.annotation for p in signature.parameters.values()
+                            if p.annotation is not inspect.Parameter.empty}
+    if signature.return_annotation is not inspect.Signature.empty:
+        tool.__annotations__["return"] = signature.return_annotation
+    return tool
+
+
+def lazy_tools(names: Iterable[str], decorator: Callable = None) -> List[Callable]:
+    """Stand-ins for names, each wrapped by decorator (function_tool() for the agent)"""
+    tools = [lazy_callable(name) for name in names]
+    return [decorator(t) for t in tools] if decorator else tools
+
+
+def warm_up(modules: Iterable[str] = None) -> threading.Thread:
+    """Imports tool modules in a daemon thread so first calls don't pay for it (once per process)"""
+    global _warm_thread
+    if _warm_thread is not None:
+        return _warm_thread
+    if modules is None:
+        modules = list(dict.fromkeys(TOOL_MODULES.values()))
+
+    def run():
+        started = time.perf_counter()
+        for module in modules:
+            try:
+                import_module(module)
+            except Exception as e:
+                logger.warning(f"⚠️ Warm-up import of {module} failed: {e}")
+        logger.info(f"🔥 Tool modules warmed in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    _warm_thread = threading.Thread(target=run, name="tool-warmup", daemon=True)
+    _warm_thread.start()
+    return _warm_thread
+
+
+def import_times() -> Dict[str, float]:
+    """ms spent importing each tool module (by whichever caller got there first)"""
+    return dict(_import_ms)
@@ -0,0 +1,179 @@
+"""
+TOOL RESULT CACHE
+@async_ttl_cache for tools that call remote APIs (weather, geolocation, search):
+
+- fresh for `ttl` seconds: served from memory, no network
+- then stale for `stale_ttl` more: served immediately while one background
+  refresh runs (stale-while-revalidate)
+- concurrent identical calls share one in-flight request
+- failed fetches are not cached; an old value is served instead if there is one
+- optional JSON file backend so entries survive restarts
+- hits / stale hits / misses / coalesced calls per cache: cache_stats()
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import functools
+import threading
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from cachetools import LRUCache
+
+logger = logging.getLogger(__name__)
+
+_caches: Dict[str, "AsyncTTLCache"] = {}
+
+
+def default_key(*args, **kwargs) -> str:
+    return json.dumps([args, kwargs], sort_keys=True, ensure_ascii=False, default=str)
+
+
+class JsonCacheStore:
+    """key -> (value, fetched_at) in one JSON file, written atomically"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Tuple[object, float]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return {k: (v[0], v[1]) for k, v in json.load(f).items()}
+        except (OSError, ValueError, IndexError, TypeError) as e:
+            logger.warning(f"⚠️ Could not load cache {self.path}: {e}")
+            return {}
+
+    def save(self, entries: Dict[str, Tuple[object, float]]):
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({k: list(v) for k, v in entries.items()}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except (OSError, TypeError) as e:
+                logger.warning(f"⚠️ Could not save cache {self.path}: {e}")
+
+
+class AsyncTTLCache:
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0.0, maxsize: int = 256,
+                 store: JsonCacheStore = None, cache_if: Callable[[object], bool] = None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.store = store
+        self.cache_if = cache_if or (lambda value: value is not None)
+        self._entries: LRUCache = LRUCache(maxsize)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        if store is not None:
+            self._entries.update(store.load())
+
+    def _age(self, key: str) -> Optional[float]:
+        entry = self._entries.get(key)
+        return None if entry is None else time.time() - entry[1]
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable]):
+        try:
+            value = await fetch()
+        except Exception:
+            self.errors += 1
+            raise
+        if self.cache_if(value):
+            self._entries[key] = (value, time.time())
+            if self.store is not None:
+                await asyncio.to_thread(self.store.save, dict(self._entries.items()))
+        return value
+
+    def _start_fetch(self, key: str, fetch: Callable[[], Awaitable]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        return task
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Awaitable]):
+        def done(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(f"⚠️ {self.name}: background refresh failed: {task.exception()}")
+        if key not in self._inflight:
+            self._start_fetch(key, fetch).add_done_callback(done)
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable]):
+        age = self._age(key)
+        if age is not None and age < self.ttl:
+            self.hits += 1
+            return self._entries[key][0]
+        if age is not None and age < self.ttl + self.stale_ttl:
+            self.stale_hits += 1
+            self._refresh_in_background(key, fetch)
+            return self._entries[key][0]
+
+        # Same call already on the wire: wait for it instead of sending another
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        try:
+            return await asyncio.shield(self._start_fetch(key, fetch))
+        except Exception as e:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise
+            # Old data beats no data for weather/search answers (the entry may be newer than `age`)
+            logger.warning(f"⚠️ {self.name}: fetch failed ({e}), serving a {time.time() - entry[1]:.0f}s old value")
+            return entry[0]
+
+    def invalidate(self, key: str = None):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            # Share of calls that didn't need their own request
+            "hit_ratio": (self.hits + self.stale_hits + self.coalesced) / total if total else 0.0,
+        }
+
+
+def async_ttl_cache(ttl: float, stale_ttl: float = 0.0, maxsize: int = 256, name: str = None,
+                    key: Callable[..., str] = default_key, persist: str = None,
+                    cache_if: Callable[[object], bool] = None):
+    """
+    Caches an async function's results per key(*args, **kwargs). Exceptions are
+    never cached; use cache_if to also skip results like "Unknown".
+    persist: JSON file path for entries to survive restarts.
+    """
+    def decorator(fn):
+        cache = AsyncTTLCache(name or fn.__name__, ttl, stale_ttl, maxsize,
+                              JsonCacheStore(persist) if persist else None, cache_if)
+        _caches[cache.name] = cache
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await cache.get(key(*args, **kwargs), lambda: fn(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def cache_stats() -> Dict[str, dict]:
+    return {name: cache.stats() for name, cache in _caches.items()}
@@ -0,0 +1,120 @@
+"""
+CONDITION WAITS
+Replace fixed sleeps with "wait until X or deadline": the condition is
+polled with exponential backoff (20 ms, 40 ms, ... capped) and, when a
+WindowRegistry is given, also re-checked as soon as its snapshot version
+moves (a window created, destroyed or changed, or the foreground switched).
+Window checks only read the registry snapshot; enumeration stays on the
+poller thread (or a worker thread without one), never on the event loop.
+"""
+import asyncio
+import os
+import logging
+from typing import Awaitable, Callable, Iterable, Optional, Union
+
+from src.tools.window_registry import WindowInfo, WindowRegistry, get_window_registry
+
+logger = logging.getLogger(__name__)
+
+WAIT_INITIAL_INTERVAL = float(os.getenv("WAIT_INITIAL_INTERVAL", "0.02"))
+WAIT_MAX_INTERVAL = float(os.getenv("WAIT_MAX_INTERVAL", "0.25"))
+
+Predicate = Callable[[], Union[object, Awaitable[object]]]
+
+
+async def wait_for(predicate: Predicate, timeout: float, interval: float = WAIT_INITIAL_INTERVAL,
+                   max_interval: float = WAIT_MAX_INTERVAL, backoff: float = 2.0,
+                   registry: Optional[WindowRegistry] = None):
+    """
+    Returns the first truthy predicate() result, or None once `timeout` seconds pass.
+    The predicate may be sync or async and is always checked at least once.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    version = registry.version if registry is not None else 0
+    while True:
+        if registry is not None and not registry.polling:
+            # No poller to keep the snapshot fresh: enumerate off the event loop
+            await asyncio.to_thread(registry.refresh)
+        result = predicate()
+        if asyncio.iscoroutine(result):
+            result = await result
+        if result:
+            return result
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return None
+        step = min(interval, remaining)
+        if registry is not None and registry.polling:
+            # Woken by the poller's next snapshot change instead of sleeping the whole step
+            version = await asyncio.to_thread(registry.wait_for_change, version, step)
+        else:
+            await asyncio.sleep(step)
+        interval = min(interval * backoff, max_interval)
+
+
+async def wait_for_window(term: str, timeout: float, registry: WindowRegistry = None,
+                          visible_only: bool = False) -> Optional[WindowInfo]:
+    """First window whose title contains term"""
+    registry = registry or get_window_registry()
+
+    def check():
+        return registry.find(term, visible_only=visible_only)
+
+    return await wait_for(check, timeout, registry=registry)
+
+
+async def wait_for_new_window(term: str, known: Iterable[int], timeout: float,
+                              registry: WindowRegistry = None, pid: int = None) -> Optional[WindowInfo]:
+    """
+    A window that was not in `known`: one owned by pid or titled like term,
+    else any new window that took the foreground (titles like "Visual Studio Code"
+    don't always contain what the user said).
+    """
+    registry = registry or get_window_registry()
+    known = set(known)
+    term = term.lower().strip()
+
+    def check():
+        new = [w for w in registry.windows() if w.hwnd not in known]
+        for w in new:
+            if (pid and w.pid == pid) or (term and term in w.title.lower()):
+                return w
+        active = registry.active()
+        if active and active.hwnd not in known:
+            return active
+        return None
+
+    return await wait_for(check, timeout, registry=registry)
+
+
+async def wait_for_window_gone(hwnd: int, timeout: float, registry: WindowRegistry = None) -> bool:
+    registry = registry or get_window_registry()
+
+    def check():
+        return not registry.exists(hwnd)
+
+    return bool(await wait_for(check, timeout, registry=registry))
+
+
+async def wait_for_foreground(hwnd: int, timeout: float, registry: WindowRegistry = None) -> bool:
+    registry = registry or get_window_registry()
+
+    def check():
+        active = registry.active()
+        return active is not None and active.hwnd == hwnd
+
+    return bool(await wait_for(check, timeout, registry=registry))
+
+
+async def wait_for_active_change(before: Optional[WindowInfo], timeout: float,
+                                 registry: WindowRegistry = None) -> Optional[WindowInfo]:
+    """Waits until some other window (e.g. the Start menu) takes the foreground"""
+    registry = registry or get_window_registry()
+    before_hwnd = before.hwnd if before else None
+
+    def check():
+        active = registry.active()
+        return active if active is not None and active.hwnd != before_hwnd else None
+
+    return await wait_for(check, timeout, registry=registry)
@@ -1,22 +1,62 @@
 import os
-import requests
+import httpx
 import logging
 from dotenv import load_dotenv
 from livekit.agents import function_tool
+from src.tools.tool_cache import async_ttl_cache
+from src.core.http_client import http_pool
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def detect_city_by_ip() -> str:
+WEATHER_TIMEOUT = float(os.getenv("WEATHER_TIMEOUT", "4"))
+OPENWEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+# "Weather?" twice in a few minutes is answered from memory
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+WEATHER_STALE_TTL = float(os.getenv("WEATHER_STALE_TTL", "1800"))
+CITY_CACHE_TTL = float(os.getenv("CITY_CACHE_TTL", "3600"))
+
+
+class WeatherError(Exception):
+    pass
+
+
+@async_ttl_cache(ttl=CITY_CACHE_TTL, stale_ttl=24 * 3600, name="city",
+                 key=lambda *args, **kwargs: "ip", cache_if=lambda city: city != "Unknown")
+async def fetch_city(timeout: float = WEATHER_TIMEOUT) -> str:
+    """City from the public IP (ipinfo.io); "Unknown" on any failure"""
     try:
-        response = requests.get("https://ipinfo.io", timeout=5)
-        data = response.json()
-        return data.get("city", "Unknown")
+        response = await http_pool.get("https://ipinfo.io/json", timeout=timeout)
+        return response.json().get("city") or "Unknown"
     except Exception as e:
+        logger.warning(f"⚠️ City lookup failed: {e}")
         return "Unknown"
 
+
+def format_weather(city: str, data: dict) -> str:
+    return (f"Weather in {city}:\n"
+            f"- Condition: {data['weather'][0]['description'].title()}\n"
+            f"- Temperature: {data['main']['temp']}°C\n"
+            f"- Humidity: {data['main']['humidity']}%\n"
+            f"- Wind Speed: {data['wind']['speed']} m/s")
+
+
+async def fetch_weather(city: str, api_key: str = None, timeout: float = WEATHER_TIMEOUT) -> httpx.Response:
+    params = {"q": city, "appid": api_key or os.getenv("OPENWEATHER_API_KEY"), "units": "metric"}
+    return await http_pool.get(OPENWEATHER_URL, params=params, timeout=timeout)
+
+
+@async_ttl_cache(ttl=WEATHER_CACHE_TTL, stale_ttl=WEATHER_STALE_TTL, name="weather",
+                 key=lambda city, *args, **kwargs: city.lower().strip())
+async def current_weather(city: str, api_key: str = None) -> str:
+    """Formatted weather for city; raises WeatherError on an API error"""
+    response = await fetch_weather(city, api_key)
+    if response.status_code != 200:
+        raise WeatherError(f"{response.status_code} - {response.text}")
+    return format_weather(city, response.json())
+
 @function_tool()
 async def get_weather(city: str = "") -> str:
     """
@@ -37,37 +77,21 @@ async def get_weather(city: str = "") -> str:
         return "Environment variables में OpenWeather API key नहीं मिली।"
 
     if not city:
-        city = detect_city_by_ip()
+        # Startup already looked the city up (and cached it on disk)
+        from src.core.startup import get_startup
+        city = await get_startup().city()
 
     logger.info(f"City के लिए weather fetch किया जा रहा है।: {city}")
-    url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {
-        "q": city,
-        "appid": api_key,
-        "units": "metric"
-    }
 
     try:
-        response = requests.get(url, params=params)
-        if response.status_code != 200:
-            logger.error(f"OpenWeather API में error आया।: {response.status_code} - {response.text}")
-            return f"Error: {city} के लिए weather fetch नहीं कर पाए। कृपया city name चेक करें।"
-
-        data = response.json()
-        weather = data["weather"][0]["description"].title()
-        temperature = data["main"]["temp"]
-        humidity = data["main"]["humidity"]
-        wind_speed = data["wind"]["speed"]
-
-        result = (f"Weather in {city}:\n"
-                  f"- Condition: {weather}\n"
-                  f"- Temperature: {temperature}°C\n"
-                  f"- Humidity: {humidity}%\n"
-                  f"- Wind Speed: {wind_speed} m/s")
-
+        result = await current_weather(city, api_key)
         logger.info(f"Weather result: \n{result}")
         return result
 
+    except WeatherError as e:
+        logger.error(f"OpenWeather API में error आया।: {e}")
+        return f"Error: {city} के लिए weather fetch नहीं कर पाए। कृपया city name चेक करें।"
+
     except Exception as e:
         logger.exception(f"Weather fetch करते समय exception आया: {e}")
         return "Weather fetch करते समय एक error आया"
@@ -3,8 +3,12 @@ import subprocess
 import logging
 import sys
 import asyncio
-from fuzzywuzzy import process
 from livekit.agents import function_tool
+from src.tools.matcher import Matcher, best_match
+from src.tools.window_registry import get_window_registry
+from src.tools.launcher import default_launcher
+from src.tools.waits import wait_for_active_change, wait_for_window, wait_for_new_window, wait_for_window_gone, wait_for_foreground
+from src.tools.file_index import get_file_index, FOLDER, FILE_INDEX_WAIT
 
 try:
     import win32gui
@@ -15,11 +19,6 @@ except ImportError:
 
 import webbrowser
 
-try:
-    import pygetwindow as gw
-except ImportError:
-    gw = None
-
 # Setup encoding and logger
 sys.stdout.reconfigure(encoding='utf-8')
 logging.basicConfig(level=logging.INFO)
@@ -46,79 +45,44 @@ APP_MAPPINGS = {
     "telegram": "telegram.exe",
     "discord": "discord.exe"
 }
+APP_MATCHER = Matcher(list(APP_MAPPINGS))
+launcher = default_launcher(APP_MAPPINGS)
+
+# Deadlines for condition waits (seconds); fast machines return long before these
+FOCUS_TIMEOUT = float(os.getenv("FOCUS_TIMEOUT", "8"))
+OPEN_APP_TIMEOUT = float(os.getenv("OPEN_APP_TIMEOUT", "5"))
+CLOSE_TIMEOUT = float(os.getenv("CLOSE_TIMEOUT", "1.5"))
+# Windows Search drops keys typed faster than this
+TYPE_INTERVAL = float(os.getenv("TYPE_INTERVAL", "0.03"))
+START_SEARCH_SETTLE = float(os.getenv("START_SEARCH_SETTLE", "0.5"))
 
 # -------------------------
 # Improved focus utility
 # -------------------------
 async def focus_window(title_keyword: str) -> bool:
-    if not gw:
+    registry = get_window_registry()
+    if not registry.available:
         logger.warning("⚠ pygetwindow not available")
         return False
 
-    await asyncio.sleep(2.5)  # Increased delay for slow apps
     title_keyword = title_keyword.lower().strip()
     
-    # Try multiple times to find the window
-    for attempt in range(5):
-        try:
-            # Method 1: Get windows with title
-            windows = gw.getWindowsWithTitle(title_keyword)
-            if windows:
-                window = windows[0]
-                if window.isMinimized:
-                    window.restore()
-                window.activate()
-                logger.info(f"✅ Window focused: {window.title}")
-                return True
-            
-            # Method 2: Check all windows
-            for window in gw.getAllWindows():
-                if title_keyword in window.title.lower():
-                    if window.isMinimized:
-                        window.restore()
-                    window.activate()
-                    logger.info(f"✅ Window focused: {window.title}")
-                    return True
-                    
-            await asyncio.sleep(1)  # Wait before next attempt
-        except Exception as e:
-            logger.error(f"❌ Focus error: {e}")
-            await asyncio.sleep(1)
+    # Returns as soon as the window shows up; slow apps get until the deadline
+    try:
+        window = await wait_for_window(title_keyword, FOCUS_TIMEOUT, registry)
+        if window:
+            registry.activate(window)
+            logger.info(f"✅ Window focused: {window.title}")
+            return True
+    except Exception as e:
+        logger.error(f"❌ Focus error: {e}")
     
     logger.warning(f"⚠ Could not focus window: {title_keyword}")
     return False
 
-# Index items more efficiently
-async def index_items(base_dirs):
-    item_index = []
-    for base_dir in base_dirs:
-        if not os.path.exists(base_dir):
-            continue
-        try:
-            # Use scandir for speed and avoid deep recursion unless necessary
-            with os.scandir(base_dir) as it:
-                for entry in it:
-                    if entry.is_dir():
-                        item_index.append({"name": entry.name, "path": entry.path, "type": "folder"})
-                    elif entry.is_file():
-                        item_index.append({"name": entry.name, "path": entry.path, "type": "file"})
-        except Exception as e:
-            logger.error(f"Error scanning {base_dir}: {e}")
-    logger.info(f"✅ Indexed {len(item_index)} top-level items.")
-    return item_index
-
+# Items come from the shared background FileIndex (no per-call disk scan)
 async def search_item(query, index, item_type):
-    filtered = [item for item in index if item["type"] == item_type]
-    choices = [item["name"] for item in filtered]
-    if not choices:
-        return None
-    best_match, score = process.extractOne(query, choices)
-    logger.info(f"🔍 Matched '{query}' to '{best_match}' with score {score}")
-    if score > 70:
-        for item in filtered:
-            if item["name"] == best_match:
-                return item
-    return None
+    return index.best(query, item_type)
 
 # File/folder actions
 async def open_folder(path):
@@ -163,8 +127,9 @@ async def delete_item(path):
 @function_tool()
 async def open_app(app_title: str, force_new: bool = False) -> str:
     """
-    Opens a desktop app using realistic keyboard interaction (Win -> Type -> Enter).
-    Mimics a human user searching for the app.
+    Opens a desktop app by starting its exe, Start menu shortcut or URI directly
+    (see launcher.py); only apps that can't be resolved fall back to the Start
+    menu keystrokes (Win -> Type -> Enter).
 
     Args:
         app_title: Name of the app to open (e.g., "Notepad", "Chrome").
@@ -176,25 +141,24 @@ async def open_app(app_title: str, force_new: bool = False) -> str:
     - "Open another Notepad" -> force_new=True
     - "Haan, naya kholo" (Yes, open new) -> force_new=True
     """
-    import pyautogui
-    
     app_title_l = app_title.lower().strip()
     
     # Clean up title for better typing accuracy
-    best_match, score = process.extractOne(app_title_l, APP_MAPPINGS.keys())
-    if score > 80:
-        search_term = best_match # Use known good name
+    app_match = APP_MATCHER.best(app_title_l, cutoff=80)
+    if app_match:
+        search_term = app_match.choice # Use known good name
     else:
         search_term = app_title # Use user input if no match
         
     # Check if already running (to prevent accidental double-opens)
     # Exception: "Settings" is a UWP app and handles single-instance natively. 
     # Checking for it causes false positives due to background processes.
-    if gw and not force_new and search_term.lower() != "settings":
+    registry = get_window_registry()
+    if registry.available and not force_new and search_term.lower() != "settings":
         try:
             # Fuzzy Match against ALL open windows
-            all_titles = [w.title for w in gw.getAllWindows() if w.title.strip()]
-            match_title, match_score = process.extractOne(search_term, all_titles)
+            all_titles = registry.titles(visible_only=False)
+            window_match = best_match(search_term, all_titles)
             
             # Check 1: Direct Substring Match (Most Reliable)
             # SPECIAL CASE: Antigravity (Input might be "Antigravity Agent")
@@ -208,28 +172,44 @@ async def open_app(app_title: str, force_new: bool = False) -> str:
                      return f"⚠️ I found an open window named '{t}'. ASK THE USER: '{t} is already open. Do you want to open a new instance?'"
 
             # Check 2: High Confidence Fuzzy Match (Backup)
-            if match_score > 80: 
-                logger.info(f"ℹ️ '{search_term}' matches '{match_title}' ({match_score}%). Asking confirmation.")
+            if window_match and window_match.score > 80: 
+                match_title = window_match.choice
+                logger.info(f"ℹ️ '{search_term}' matches '{match_title}' ({window_match.score:.0f}%). Asking confirmation.")
                 return f"⚠️ '{search_term}' matches '{match_title}'. ASK THE USER: '{match_title} is already open. Do you want to open a new instance?'"
         except Exception as e:
             logger.warning(f"Could not check existing windows: {e}")
 
+    known = {w.hwnd for w in registry.windows(visible_only=False)}
+
+    # Fast path: start the resolved exe/shortcut directly and confirm by pid
+    launch = await asyncio.to_thread(launcher.launch, search_term)
+    if launch.ok:
+        window = await wait_for_new_window(search_term, known, OPEN_APP_TIMEOUT, registry, pid=launch.pid)
+        if window:
+            return f"✅ Opened '{search_term}' ({window.title})."
+        return f"✅ Launched '{search_term}' (pid {launch.pid}); its window has not appeared yet."
+
     logger.info(f"⌨️  Human-Mode: Opening '{search_term}' via keyboard...")
+    import pyautogui
     
     try:
-        # Step 1: Open Start Menu
+        before = registry.active()
+
+        # Step 1: Open Start Menu (ready once it takes the foreground)
         pyautogui.press('win')
-        await asyncio.sleep(0.3) # Snappy start
+        await wait_for_active_change(before, 0.3, registry)
         
-        # Step 2: Type the app name slowly (Human-like) - RESTORED
-        pyautogui.write(search_term, interval=0.1) 
-        await asyncio.sleep(0.7) # Give Windows Search a moment
+        # Step 2: Type the app name (off the event loop; keys are paced for Windows Search)
+        await asyncio.to_thread(pyautogui.write, search_term, interval=TYPE_INTERVAL)
+        await asyncio.sleep(START_SEARCH_SETTLE) # Search results have no window event to wait on
         
         # Step 3: Launch
         pyautogui.press('enter')
         
-        # Step 4: Return
-        await asyncio.sleep(0.2) 
+        # Step 4: Return as soon as the app's window appears
+        window = await wait_for_new_window(search_term, known, OPEN_APP_TIMEOUT, registry)
+        if window:
+            return f"✅ Opened '{search_term}' ({window.title})."
         return f"✅ Command sent: Opening '{search_term}'..."
             
     except Exception as e:
@@ -251,10 +231,11 @@ async def close_app(window_title: str) -> str:
     logger.info(f"⌨️  Human-Mode: Closing '{window_title}'...")
     
     search_term = window_title.lower().strip()
+    registry = get_window_registry()
     
     # Specific handling for common apps
     if search_term == "youtube":
-        has_youtube = any("youtube" in w.title.lower() for w in gw.getAllWindows() if w.title)
+        has_youtube = registry.find("youtube", visible_only=False) is not None
         if not has_youtube:
             search_term = "chrome" 
     
@@ -279,17 +260,13 @@ async def close_app(window_title: str) -> str:
     if search_term == "notepad":
          pass
 
-    if not gw:
+    if not registry.available:
         return "❌ pygetwindow not available to find window."
 
     # Strategy 1: Find ANY visible window containing the search term
     target_window = None
     try:
-        all_windows = gw.getAllWindows()
-        for w in all_windows:
-            if search_term in w.title.lower() and getattr(w, 'isVisible', True) and w.title.strip():
-                target_window = w
-                break # Close the first matching one
+        target_window = registry.find(search_term) # Close the first matching one
     except Exception as e:
         logger.error(f"Error listing windows: {e}")
 
@@ -299,33 +276,24 @@ async def close_app(window_title: str) -> str:
 
     if target_window:
         original_title = target_window.title
-        target_hwnd = getattr(target_window, '_hWnd', None) # Get Handle (Robust ID)
 
         try:
             # Attempt 1: Focus and Alt+F4 (Human-like)
-            if target_window.isMinimized:
-                target_window.restore()
-            target_window.activate()
-            await asyncio.sleep(0.2) # Fast Focus
+            registry.activate(target_window)
+            # Alt+F4 must land on the target, so wait until it really is in front
+            if not await wait_for_foreground(target_window.hwnd, 0.5, registry):
+                logger.warning(f"⚠️ '{original_title}' did not take focus; sending Alt+F4 anyway")
             pyautogui.hotkey('alt', 'f4')
             
-            # FAST VERIFICATION
-            await asyncio.sleep(0.2) # Quick wait
-            
-            # Check if it's actually gone using HWND (Handle) if available, else Title
-            all_current_windows = gw.getAllWindows()
-            if target_hwnd:
-                still_exists = any(getattr(w, '_hWnd', 0) == target_hwnd for w in all_current_windows)
-            else:
-                still_exists = any(w.title == original_title for w in all_current_windows)
-
-            if not still_exists:
+            # VERIFICATION: returns the moment the handle disappears
+            if await wait_for_window_gone(target_window.hwnd, CLOSE_TIMEOUT, registry):
                 return f"✅ Verified: '{original_title}' is closed."
             else:
                 # Retry: Direct Close
-                target_window.close()
-                await asyncio.sleep(0.1)
-                return f"⚠️ Force Closed '{original_title}'."
+                registry.close(target_window)
+                if await wait_for_window_gone(target_window.hwnd, CLOSE_TIMEOUT, registry):
+                    return f"⚠️ Force Closed '{original_title}'."
+                return f"⚠️ Sent close to '{original_title}' but it is still open (unsaved changes?)."
 
         except Exception as e:
             return f"❌ Failed to close '{target_window.title}': {e}"
@@ -340,35 +308,35 @@ async def minimize_window(window_title: str) -> str:
     """
     print(f"🔧 TOOL: minimize_window called for '{window_title}'") # Debug
     
-    if not gw: return "❌ pygetwindow not available."
+    registry = get_window_registry()
+    if not registry.available: return "❌ pygetwindow not available."
     
     search_term = window_title.lower().strip()
     
     try:
         # 1. Get all visible windows
-        all_windows = [w for w in gw.getAllWindows() if w.title and w.isVisible]
+        all_windows = registry.windows()
         if not all_windows:
             return "❌ No visible windows found."
 
         # 2. Try Exact/Substring Match
-        for w in all_windows:
-            if search_term in w.title.lower():
-                if not w.isMinimized:
-                    w.minimize()
-                    print(f"✅ Minimized (Exact): {w.title}")
-                    return f"✅ Minimized '{w.title}'."
-                return f"ℹ️ '{w.title}' is already minimized."
+        w = registry.find(search_term)
+        if w:
+            if not w.minimized:
+                registry.minimize(w)
+                print(f"✅ Minimized (Exact): {w.title}")
+                return f"✅ Minimized '{w.title}'."
+            return f"ℹ️ '{w.title}' is already minimized."
 
         # 3. Try Fuzzy Match (Best Guess)
         titles = [w.title for w in all_windows]
-        best_match_title, score = process.extractOne(window_title, titles)
+        match = best_match(window_title, titles, cutoff=70)
         
-        if score > 70:
-            for w in all_windows:
-                if w.title == best_match_title:
-                    w.minimize()
-                    print(f"✅ Minimized (Fuzzy {score}%): {w.title}")
-                    return f"✅ Minimized '{w.title}' (Match: {score}%)."
+        if match:
+            w = all_windows[match.index]
+            registry.minimize(w)
+            print(f"✅ Minimized (Fuzzy {match.score:.0f}%): {w.title}")
+            return f"✅ Minimized '{w.title}' (Match: {match.score:.0f}%)."
 
         return f"❌ Could not find window '{window_title}'. Open: {', '.join(titles[:5])}..."
     except Exception as e:
@@ -380,29 +348,21 @@ async def maximize_window(window_title: str) -> str:
     Maximizes/Restores a specific window.
     Example: "Maximize Notepad", "Bring Chrome back"
     """
-    if not gw: return "❌ pygetwindow not available."
+    registry = get_window_registry()
+    if not registry.available: return "❌ pygetwindow not available."
     
     search_term = window_title.lower().strip()
     if search_term in ["code", "vs code", "vscode"]: search_term = "visual studio code"
     
     try:
-        # Strategy 1: Direct Match
-        windows = gw.getWindowsWithTitle(search_term)
-        
-        # Strategy 2: Manual Case-Insensitive Search
-        if not windows:
-            all_wins = gw.getAllWindows()
-            for w in all_wins:
-                if search_term in w.title.lower() and w.title.strip():
-                    windows = [w]
-                    break
-
-        if windows:
-            w = windows[0]
-            if w.isMinimized:
-                w.restore()
-            w.maximize()
-            w.activate()
+        # Case-insensitive substring match against the snapshot
+        w = registry.find(search_term, visible_only=False)
+
+        if w:
+            if w.minimized:
+                registry.restore(w)
+            registry.maximize(w)
+            registry.activate(registry.get(w.hwnd) or w)
             return f"✅ Maximized '{w.title}'."
         return f"❌ Could not find window '{window_title}' to maximize."
     except Exception as e:
@@ -414,12 +374,13 @@ async def list_open_windows() -> str:
     Lists all currently visible open windows.
     Use this BEFORE trying to minimize/maximize if you are unsure of the exact window title.
     """
-    if not gw: return "❌ pygetwindow not available."
+    registry = get_window_registry()
+    if not registry.available: return "❌ pygetwindow not available."
     try:
         # Strict Filtering: Must have title, be visible, and have non-zero area (avoids 1x1 background processes)
         windows = []
-        for w in gw.getAllWindows():
-            if w.title and w.isVisible and w.width > 30 and w.height > 30:
+        for w in registry.windows():
+            if w.width > 30 and w.height > 30:
                  # Exclude common ghost windows
                 if w.title.strip() not in ["Program Manager", "Settings", "Default IME", "MSCTFIME UI"]:
                     windows.append(w.title)
@@ -454,21 +415,19 @@ async def folder_file(command: str) -> str:
     - "Music folder खोलो"
     - "Resume.pdf चलाओ"
     """
-    user_home = os.path.expanduser("~")
-    folders_to_index = [
-        "D:/", 
-        "C:/Users/Public", 
-        os.path.join(user_home, "Desktop"),
-        os.path.join(user_home, "Documents"),
-        os.path.join(user_home, "Downloads")
-    ]
-    index = await index_items(folders_to_index)
+    index = get_file_index()
+    if not index.wait_ready(0):
+        # First command right after startup: give the background build a moment
+        await asyncio.to_thread(index.wait_ready, FILE_INDEX_WAIT)
     command_lower = command.lower()
 
     if "create folder" in command_lower:
         folder_name = command.replace("create folder", "").strip()
         path = os.path.join("D:/", folder_name)
-        return await create_folder(path)
+        result = await create_folder(path)
+        if result.startswith("✅"):
+            index.add_many([(os.path.normpath(path), folder_name, FOLDER)])
+        return result
 
     if "rename" in command_lower:
         parts = command_lower.replace("rename", "").strip().split("to")
@@ -478,13 +437,20 @@ async def folder_file(command: str) -> str:
             item = await search_item(old_name, index, "folder")
             if item:
                 new_path = os.path.join(os.path.dirname(item["path"]), new_name)
-                return await rename_item(item["path"], new_path)
+                result = await rename_item(item["path"], new_path)
+                if result.startswith("✅"):
+                    index.remove_path(item["path"])
+                    index.add_many([(os.path.normpath(new_path), new_name, FOLDER)])
+                return result
         return "❌ Invalid rename command"
 
     if "delete" in command_lower:
         item = await search_item(command, index, "folder") or await search_item(command, index, "file")
         if item:
-            return await delete_item(item["path"])
+            result = await delete_item(item["path"])
+            if result.startswith("🗑️"):
+                index.remove_path(item["path"])
+            return result
         return "❌ Item not found for deletion"
 
     if "folder" in command_lower or "open folder" in command_lower:
@@ -0,0 +1,364 @@
+"""
+WINDOW REGISTRY
+One shared snapshot of the top-level windows (hwnd, title, pid, visible,
+minimized, rect), refreshed by a background poller. After each of our own
+actions only the window acted on is re-read. Tools query the snapshot instead of calling gw.getAllWindows()
+several times per command.
+
+The OS access sits behind a small backend interface: PyGetWindowBackend on
+Windows, FakeWindowBackend anywhere else (and for testing on Linux).
+"""
+import os
+import time
+import logging
+import threading
+from itertools import count
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import pygetwindow as gw
+except ImportError:
+    gw = None
+
+try:
+    import win32process
+except ImportError:
+    win32process = None
+
+try:
+    import win32gui
+except ImportError:
+    win32gui = None
+
+logger = logging.getLogger(__name__)
+
+WINDOW_POLL_INTERVAL = float(os.getenv("WINDOW_POLL_INTERVAL", "0.25"))
+# Without a running poller, snapshots older than this are refreshed on read
+WINDOW_MAX_AGE = float(os.getenv("WINDOW_MAX_AGE", "0.5"))
+
+CREATED, DESTROYED, CHANGED = "created", "destroyed", "changed"
+
+
+class WindowInfo(NamedTuple):
+    hwnd: int
+    title: str
+    pid: int
+    visible: bool
+    minimized: bool
+    rect: Tuple[int, int, int, int]  # left, top, width, height
+
+    @property
+    def width(self) -> int:
+        return self.rect[2]
+
+    @property
+    def height(self) -> int:
+        return self.rect[3]
+
+
+class PyGetWindowBackend:
+    available = True
+
+    def __init__(self):
+        self._handles: Dict[int, object] = {}
+
+    def enumerate(self) -> List[WindowInfo]:
+        windows, handles = [], {}
+        for w in gw.getAllWindows():
+            try:
+                hwnd = getattr(w, "_hWnd", None) or id(w)
+                pid = 0
+                if win32process is not None:
+                    pid = win32process.GetWindowThreadProcessId(hwnd)[1]
+                windows.append(WindowInfo(
+                    hwnd, w.title, pid, bool(getattr(w, "isVisible", True)), bool(w.isMinimized),
+                    (w.left, w.top, w.width, w.height),
+                ))
+                handles[hwnd] = w
+            except Exception:
+                continue  # Window vanished mid-enumeration
+        self._handles = handles
+        return windows
+
+    def active_hwnd(self) -> Optional[int]:
+        w = gw.getActiveWindow()
+        return getattr(w, "_hWnd", None) if w else None
+
+    def info(self, hwnd: int) -> Optional[WindowInfo]:
+        """One window's current state, or None once it is gone"""
+        if win32gui is not None and not win32gui.IsWindow(hwnd):
+            return None
+        try:
+            w = self._window(hwnd)
+            pid = win32process.GetWindowThreadProcessId(hwnd)[1] if win32process is not None else 0
+            return WindowInfo(hwnd, w.title, pid, bool(getattr(w, "isVisible", True)), bool(w.isMinimized),
+                              (w.left, w.top, w.width, w.height))
+        except Exception:
+            return None
+
+    def _window(self, hwnd: int):
+        w = self._handles.get(hwnd)
+        if w is None:
+            w = gw.Win32Window(hwnd)
+        return w
+
+    def activate(self, hwnd: int):
+        self._window(hwnd).activate()
+
+    def minimize(self, hwnd: int):
+        self._window(hwnd).minimize()
+
+    def maximize(self, hwnd: int):
+        self._window(hwnd).maximize()
+
+    def restore(self, hwnd: int):
+        self._window(hwnd).restore()
+
+    def close(self, hwnd: int):
+        self._window(hwnd).close()
+
+
+class FakeWindowBackend:
+    """In-memory windows; add()/remove() simulate apps opening and closing"""
+
+    def __init__(self, available: bool = True):
+        self.available = available
+        self.windows: Dict[int, WindowInfo] = {}
+        self.active: Optional[int] = None
+        self._ids = count(1000)
+
+    def add(self, title: str, pid: int = 0, visible: bool = True, minimized: bool = False,
+            rect: Tuple[int, int, int, int] = (0, 0, 800, 600)) -> int:
+        hwnd = next(self._ids)
+        self.windows[hwnd] = WindowInfo(hwnd, title, pid, visible, minimized, rect)
+        self.active = hwnd
+        return hwnd
+
+    def remove(self, hwnd: int):
+        self.windows.pop(hwnd, None)
+        if self.active == hwnd:
+            self.active = None
+
+    def enumerate(self) -> List[WindowInfo]:
+        return list(self.windows.values())
+
+    def active_hwnd(self) -> Optional[int]:
+        return self.active
+
+    def info(self, hwnd: int) -> Optional[WindowInfo]:
+        return self.windows.get(hwnd)
+
+    def activate(self, hwnd: int):
+        self.active = hwnd
+
+    def minimize(self, hwnd: int):
+        self.windows[hwnd] = self.windows[hwnd]._replace(minimized=True)
+
+    def maximize(self, hwnd: int):
+        self.windows[hwnd] = self.windows[hwnd]._replace(minimized=False)
+
+    def restore(self, hwnd: int):
+        self.windows[hwnd] = self.windows[hwnd]._replace(minimized=False)
+
+    def close(self, hwnd: int):
+        self.remove(hwnd)
+
+
+def default_backend():
+    if gw is not None and hasattr(gw, "getAllWindows"):
+        return PyGetWindowBackend()
+    return FakeWindowBackend(available=False)
+
+
+class WindowRegistry:
+    def __init__(self, backend=None, poll_interval: float = WINDOW_POLL_INTERVAL, max_age: float = WINDOW_MAX_AGE):
+        self.backend = backend or default_backend()
+        self.poll_interval = poll_interval
+        self.max_age = max_age
+        self.version = 0
+        self._windows: Dict[int, WindowInfo] = {}
+        self._order: List[WindowInfo] = []
+        self._lower: List[str] = []
+        self._active: Optional[int] = None
+        self._updated = 0.0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._listeners: List[Callable[[str, WindowInfo], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def available(self) -> bool:
+        return self.backend.available
+
+    @property
+    def polling(self) -> bool:
+        """True while the background poller keeps the snapshot fresh"""
+        return self._thread is not None
+
+    # ---------- snapshot ----------
+
+    def refresh(self) -> List[Tuple[str, WindowInfo]]:
+        """Re-enumerates windows; returns (event, window) changes since the last snapshot"""
+        try:
+            order = self.backend.enumerate()
+            active = self.backend.active_hwnd()
+        except Exception as e:
+            logger.warning(f"⚠️ Window enumeration failed: {e}")
+            return []
+
+        with self._lock:
+            events = self._swap(order, active)
+            self._updated = time.monotonic()
+        self._notify(events)
+        return events
+
+    def _update(self, hwnd: int):
+        """Re-reads only the window we just acted on; a full enumeration takes tens of ms"""
+        try:
+            info = self.backend.info(hwnd)
+            active = self.backend.active_hwnd()
+        except Exception as e:
+            logger.warning(f"⚠️ Window read failed: {e}")
+            return
+        with self._lock:
+            if info is None:
+                order = [w for w in self._order if w.hwnd != hwnd]
+            elif hwnd in self._windows:
+                order = [info if w.hwnd == hwnd else w for w in self._order]
+            else:
+                order = self._order + [info]
+            events = self._swap(order, active)
+        self._notify(events)
+
+    def _swap(self, order: List[WindowInfo], active: Optional[int]) -> List[Tuple[str, WindowInfo]]:
+        """Installs a new snapshot (lock held); returns the changes"""
+        windows = {w.hwnd: w for w in order}
+        previous = self._windows
+        events = [(CREATED, w) for hwnd, w in windows.items() if hwnd not in previous]
+        events += [(DESTROYED, w) for hwnd, w in previous.items() if hwnd not in windows]
+        events += [(CHANGED, w) for hwnd, w in windows.items() if hwnd in previous and previous[hwnd] != w]
+        self._windows = windows
+        self._order = order
+        self._lower = [w.title.lower() for w in order]
+        if events or active != self._active:
+            self._active = active
+            self.version += 1
+            self._changed.notify_all()
+        return events
+
+    def _notify(self, events: List[Tuple[str, WindowInfo]]):
+        for event, window in events:
+            for listener in list(self._listeners):
+                try:
+                    listener(event, window)
+                except Exception as e:
+                    logger.error(f"❌ Window listener failed: {e}")
+
+    def _fresh(self):
+        if self._thread is None and time.monotonic() - self._updated > self.max_age:
+            self.refresh()
+
+    def windows(self, visible_only: bool = True) -> List[WindowInfo]:
+        self._fresh()
+        return [w for w in self._order if w.title.strip() and (w.visible or not visible_only)]
+
+    def titles(self, visible_only: bool = True) -> List[str]:
+        return [w.title for w in self.windows(visible_only)]
+
+    def get(self, hwnd: int) -> Optional[WindowInfo]:
+        self._fresh()
+        return self._windows.get(hwnd)
+
+    def exists(self, hwnd: int) -> bool:
+        return self.get(hwnd) is not None
+
+    def find_all(self, term: str, visible_only: bool = True) -> List[WindowInfo]:
+        """Windows whose title contains term (case-insensitive), in z-order"""
+        self._fresh()
+        term = term.lower().strip()
+        order, lower = self._order, self._lower
+        return [w for w, t in zip(order, lower)
+                if term in t and w.title.strip() and (w.visible or not visible_only)]
+
+    def find(self, term: str, visible_only: bool = True) -> Optional[WindowInfo]:
+        matches = self.find_all(term, visible_only)
+        return matches[0] if matches else None
+
+    def find_pid(self, pid: int) -> List[WindowInfo]:
+        self._fresh()
+        return [w for w in self._order if w.pid == pid and w.title.strip()]
+
+    def active(self) -> Optional[WindowInfo]:
+        self._fresh()
+        return self._windows.get(self._active) if self._active else None
+
+    # ---------- events ----------
+
+    def subscribe(self, listener: Callable[[str, WindowInfo], None]):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, WindowInfo], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """Blocks until the snapshot version moves past `version` (or timeout); returns the new version"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    # ---------- actions (the acted-on window is re-read right after, so the snapshot never lags our own changes) ----------
+
+    def _act(self, action: str, window: WindowInfo):
+        getattr(self.backend, action)(window.hwnd)
+        self._update(window.hwnd)
+
+    def activate(self, window: WindowInfo):
+        if window.minimized:
+            self.backend.restore(window.hwnd)
+        self._act("activate", window)
+
+    def minimize(self, window: WindowInfo):
+        self._act("minimize", window)
+
+    def maximize(self, window: WindowInfo):
+        self._act("maximize", window)
+
+    def restore(self, window: WindowInfo):
+        self._act("restore", window)
+
+    def close(self, window: WindowInfo):
+        self._act("close", window)
+
+    # ---------- poller ----------
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval):
+            self.refresh()
+
+    def start(self):
+        if self._thread is None and self.available:
+            self.refresh()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._poll, name="window-registry", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+
+_registry: Optional[WindowRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_window_registry() -> WindowRegistry:
+    """Shared registry with its poller running"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = WindowRegistry().start()
+        return _registry
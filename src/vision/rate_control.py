@@ -0,0 +1,138 @@
+"""
+ADAPTIVE VISION RATE CONTROL
+Chooses the capture interval, resolution and JPEG quality frame by frame:
+
+- the screen is changing, or an input tool just fired -> speed up (to max_fps)
+- nothing changed                                     -> decay towards min_fps
+- projected bytes/s above the policy budget           -> lower quality, then resolution
+- comfortably under budget                            -> restore quality/resolution
+
+Policies ("on", "burst", "low") are picked per vision_tool call.
+"""
+import time
+import logging
+import threading
+from typing import Callable, List, NamedTuple
+
+from src.vision.frame_diff import SKIP
+
+logger = logging.getLogger(__name__)
+
+
+class VisionPolicy(NamedTuple):
+    name: str
+    min_fps: float
+    max_fps: float
+    byte_budget: int      # Upstream bytes per second
+    duration: float       # Seconds before vision auto-disables
+    max_side: int = 1280
+    min_side: int = 640
+    quality: int = 85
+    min_quality: int = 50
+
+
+POLICIES = {
+    # Default: responsive while things move, near idle on a static screen
+    "on": VisionPolicy("on", min_fps=0.2, max_fps=2.0, byte_budget=150_000, duration=15),
+    # Watching something happen (install progress, animation): short and fast
+    "burst": VisionPolicy("burst", min_fps=1.0, max_fps=4.0, byte_budget=400_000, duration=8),
+    # Keep an eye on the screen cheaply for longer
+    "low": VisionPolicy("low", min_fps=0.2, max_fps=0.5, byte_budget=40_000, duration=30,
+                        max_side=960, quality=70),
+}
+
+# ---------- input activity hook (fired by src.tools.inputs) ----------
+
+_input_listeners: List[Callable[[str], None]] = []
+_listeners_lock = threading.Lock()
+
+def subscribe_input(listener: Callable[[str], None]):
+    with _listeners_lock:
+        _input_listeners.append(listener)
+
+def unsubscribe_input(listener: Callable[[str], None]):
+    with _listeners_lock:
+        if listener in _input_listeners:
+            _input_listeners.remove(listener)
+
+def notify_input(action: str = ""):
+    """Called after a mouse/keyboard tool acts: the screen is about to change"""
+    with _listeners_lock:
+        listeners = list(_input_listeners)
+    for listener in listeners:
+        try:
+            listener(action)
+        except Exception as e:
+            logger.error(f"❌ Input listener failed: {e}")
+
+
+class RateController:
+    def __init__(self, policy: VisionPolicy, boost_seconds: float = 2.0, ema: float = 0.3):
+        self.policy = policy
+        self.boost_seconds = boost_seconds
+        self.ema = ema
+        self.fps = policy.min_fps if policy.name != "burst" else policy.max_fps
+        self.quality = policy.quality
+        self.max_side = policy.max_side
+        self._frame_bytes = 0.0     # EMA of bytes per sent frame
+        self._boost_until = 0.0
+        self._started = time.monotonic()
+        self._bytes_sent = 0
+        self._fps_samples: List[float] = []
+        self._lock = threading.Lock()
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.fps
+
+    def on_input(self, action: str = ""):
+        with self._lock:
+            self._boost_until = time.monotonic() + self.boost_seconds
+            self.fps = self.policy.max_fps
+
+    def on_frame(self, kind: str, size: int = 0):
+        """Feed the outcome of the last capture; updates fps/quality/max_side"""
+        now = time.monotonic()
+        p = self.policy
+        with self._lock:
+            if kind != SKIP:
+                self._bytes_sent += size
+                self._frame_bytes = size if not self._frame_bytes else \
+                    self.ema * size + (1 - self.ema) * self._frame_bytes
+
+            if now < self._boost_until:
+                self.fps = p.max_fps
+            elif kind != SKIP:
+                self.fps = min(p.max_fps, self.fps * 2)
+            else:
+                self.fps = max(p.min_fps, self.fps * 0.5)
+
+            projected = self.fps * self._frame_bytes
+            if projected > p.byte_budget:
+                if self.quality > p.min_quality:
+                    self.quality = max(p.min_quality, self.quality - 10)
+                elif self.max_side > p.min_side:
+                    self.max_side = max(p.min_side, int(self.max_side * 0.75))
+                else:
+                    # Nothing left to shrink: slow down to fit the budget
+                    self.fps = max(p.min_fps, p.byte_budget / self._frame_bytes)
+            elif projected < 0.5 * p.byte_budget:
+                if self.quality < p.quality:
+                    self.quality = min(p.quality, self.quality + 5)
+                elif self.max_side < p.max_side:
+                    self.max_side = min(p.max_side, int(self.max_side / 0.75))
+            self._fps_samples.append(self.fps)
+
+    def metrics(self) -> dict:
+        elapsed = max(time.monotonic() - self._started, 1e-6)
+        samples = self._fps_samples or [self.fps]
+        return {
+            "policy": self.policy.name,
+            "fps_min": round(min(samples), 2),
+            "fps_max": round(max(samples), 2),
+            "fps_avg": round(sum(samples) / len(samples), 2),
+            "quality": self.quality,
+            "max_side": self.max_side,
+            "bytes_per_s": int(self._bytes_sent / elapsed),
+            "budget_per_s": self.policy.byte_budget,
+        }
@@ -0,0 +1,77 @@
+"""
+CAPTURE REGIONS
+What the capture worker grabs each frame: a whole monitor (mss numbering:
+0 = all displays combined, 1 = primary, 2+ = others) or the rect of one
+window, looked up in the WindowRegistry every frame so the region follows
+the window when it moves or resizes.
+"""
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.tools.window_registry import WindowInfo, WindowRegistry
+
+logger = logging.getLogger(__name__)
+
+# Smaller than this (px) is a minimized/off-screen window, not something to look at
+MIN_REGION_SIDE = 32
+
+Monitor = Dict[str, int]  # mss format: left, top, width, height
+
+
+class CaptureTarget(NamedTuple):
+    monitor: int = 1
+    hwnd: Optional[int] = None   # Follow this window instead of the full monitor
+    title: str = ""
+
+    def describe(self) -> str:
+        return f"window '{self.title}'" if self.hwnd is not None else f"monitor {self.monitor}"
+
+
+def clip(rect: Tuple[int, int, int, int], bounds: Monitor) -> Optional[Monitor]:
+    """rect (left, top, width, height) intersected with bounds; None if too small"""
+    left, top, width, height = rect
+    right = min(left + width, bounds["left"] + bounds["width"])
+    bottom = min(top + height, bounds["top"] + bounds["height"])
+    left, top = max(left, bounds["left"]), max(top, bounds["top"])
+    if right - left < MIN_REGION_SIDE or bottom - top < MIN_REGION_SIDE:
+        return None
+    return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+
+def monitor_of(rect: Tuple[int, int, int, int], monitors: List[Monitor]) -> int:
+    """Index of the physical monitor holding most of rect (1 if none)"""
+    best, best_area = 1, 0
+    for index, monitor in enumerate(monitors[1:], start=1):
+        region = clip(rect, monitor)
+        area = region["width"] * region["height"] if region else 0
+        if area > best_area:
+            best, best_area = index, area
+    return best
+
+
+def resolve_window(registry: WindowRegistry, term: str = "") -> Optional[WindowInfo]:
+    """Window by title fragment, or the focused one when term is empty/"focused"/"active" """
+    term = term.lower().strip()
+    if term in ("", "focused", "active", "current"):
+        return registry.active()
+    return registry.find(term)
+
+
+def region_for(target: CaptureTarget, monitors: List[Monitor],
+               registry: Optional[WindowRegistry] = None) -> Monitor:
+    """The rect to grab for target this frame; falls back to its monitor when the window is unusable"""
+    monitor = monitors[target.monitor] if 0 <= target.monitor < len(monitors) else monitors[1]
+    if target.hwnd is None or registry is None:
+        return monitor
+    window = registry.get(target.hwnd)
+    if window is None or window.minimized:
+        return monitor
+    # Clip against the whole desktop: windows may straddle displays or hang off-screen
+    region = clip(window.rect, monitors[0])
+    if region is None:
+        return monitor
+    # Maximized windows overhang their display by the invisible frame (~8 px): keep them on it
+    home = clip(window.rect, monitors[monitor_of(window.rect, monitors)])
+    if home and home["width"] * home["height"] >= 0.95 * region["width"] * region["height"]:
+        return home
+    return region
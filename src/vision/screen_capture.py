@@ -1,54 +1,261 @@
 
 import asyncio
+import threading
+import time
 import mss
 import mss.tools
+import numpy as np
 from PIL import Image
 import io
 import logging
 
+from src.vision.frame_diff import FrameDiffer, VisionStats, SKIP, REGION
+from src.vision.rate_control import RateController
+from src.vision.regions import CaptureTarget, monitor_of, region_for, resolve_window
+from src.tools.window_registry import WindowInfo, WindowRegistry, get_window_registry
+
 logger = logging.getLogger(__name__)
 
+
+class FrameEncoder:
+    """
+    BGRA buffer -> JPEG with as few copies as possible: PIL maps the capture
+    memory directly, integer scale factors use reduce() (box filter), and the
+    JPEG goes into one reused BytesIO.
+    """
+
+    def __init__(self, max_side: int = 1280, quality: int = 85):
+        self.max_side = max_side
+        self.quality = quality
+        self._out = io.BytesIO()
+
+    def _downscale(self, img: Image.Image) -> Image.Image:
+        width, height = img.size
+        scale = max(width, height) / self.max_side
+        if scale <= 1:
+            return img
+        factor = round(scale)
+        if abs(scale - factor) < 0.01:
+            return img.reduce(factor)
+        size = (max(1, round(width / scale)), max(1, round(height / scale)))
+        return img.resize(size, Image.Resampling.BOX)
+
+    def encode(self, bgra: np.ndarray) -> bytes:
+        height, width = bgra.shape[:2]
+        if not bgra.flags.c_contiguous:
+            bgra = np.ascontiguousarray(bgra)  # Cropped regions only; full frames are used in place
+        # Shares the numpy memory (channels are still BGR until after the resize). RGBX, not
+        # RGBA: mss leaves the 4th byte 0, and as alpha it would blacken every resampled pixel
+        img = Image.frombuffer("RGBX", (width, height), bgra, "raw", "RGBX", 0, 1)
+        img = self._downscale(img)
+        # Channel swap on the (small) resized image instead of the full frame
+        rgb = Image.frombuffer("RGB", img.size, img.tobytes(), "raw", "BGRX", 0, 1)
+
+        self._out.seek(0)
+        self._out.truncate()
+        rgb.save(self._out, format='JPEG', quality=self.quality)
+        return self._out.getvalue()
+
+
+class FrameSlot:
+    """One-slot queue: a newer frame replaces one the consumer hasn't taken yet"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._event = asyncio.Event()
+        self._frame = None
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, frame: bytes):
+        with self._lock:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = frame
+        self._loop.call_soon_threadsafe(self._event.set)
+
+    def close(self):
+        self._closed = True
+        self._loop.call_soon_threadsafe(self._event.set)
+
+    async def get(self):
+        """Latest frame, or None once closed"""
+        while True:
+            await self._event.wait()
+            with self._lock:
+                frame, self._frame = self._frame, None
+            self._event.clear()
+            if frame is not None or self._closed:
+                return frame
+
+
+class CaptureWorker(threading.Thread):
+    """Grabs, diffs and encodes on its own thread (not the shared default executor)"""
+
+    def __init__(self, capture: "ScreenCapture", slot: FrameSlot):
+        super().__init__(name="vision-capture", daemon=True)
+        self.capture = capture
+        self.slot = slot
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+
+    def run(self):
+        # mss handles are per-thread (GDI device contexts on Windows)
+        with mss.mss() as sct:
+            while not self.stop_event.is_set():
+                started = time.perf_counter()
+                try:
+                    frame_bytes = self.capture._process_image(sct.grab(self.capture._region(sct.monitors)))
+                    if frame_bytes:
+                        self.slot.put(frame_bytes)
+                except Exception as e:
+                    logger.error(f"❌ Screen Capture Error: {e}")
+                # Interval is re-read every frame so it can be changed while streaming;
+                # wake() cuts the wait short (e.g. right after an input tool fired)
+                self.wake_event.wait(max(0.0, self.capture.interval - (time.perf_counter() - started)))
+                self.wake_event.clear()
+
+    def wake(self):
+        self.wake_event.set()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+
+
 class ScreenCapture:
-    def __init__(self):
+    def __init__(self, differ: FrameDiffer = None, encoder: FrameEncoder = None,
+                 registry: WindowRegistry = None):
         self._streaming = False
         self._sct = mss.mss()
-        self._monitor = self._sct.monitors[1]  # Primary monitor
-        
-    async def start_capture(self, interval=1.0):
+        self.monitors = self._sct.monitors
+        # Primary monitor by default; target_window() narrows capture to one window
+        self.target = CaptureTarget()
+        self.registry = registry
+        # Unchanged frames are dropped; small changes are sent as cropped regions
+        self.differ = differ or FrameDiffer()
+        self.encoder = encoder or FrameEncoder()
+        self.stats = VisionStats()
+        self.interval = 1.0
+        self.controller: RateController = None
+        self._worker = None
+        self._slot = None
+
+    async def start_capture(self, interval=1.0, controller: RateController = None, duration: float = None):
         """
-        Yields screen frames at the specified interval (in seconds).
+        Yields screen frames at the specified interval (in seconds), or at the
+        rate an adaptive RateController picks.
+        Frames identical to the previous one are not yielded; if the consumer
+        falls behind, it gets the newest frame and stale ones are dropped.
+        Ends after `duration` seconds even if the screen never changes.
         """
+        if self._worker is not None:
+            self.stop_capture()
         self._streaming = True
-        logger.info(f"👀 Vision Started: Capturing screen every {interval}s")
-        
-        while self._streaming:
-            try:
-                # Capture the screen
-                sct_img = self._sct.grab(self._monitor)
-                
-                # Resizing and Encoding in Executor to prevent blocking
-                loop = asyncio.get_running_loop()
-                frame_bytes = await loop.run_in_executor(None, self._process_image, sct_img)
-                
+        self.controller = controller
+        self.interval = interval
+        self._apply_controller()
+        self.differ.reset()
+        self.stats = VisionStats()
+        logger.info(f"👀 Vision Started: Capturing {self.target.describe()} every {interval}s")
+
+        slot = FrameSlot(asyncio.get_running_loop())
+        worker = CaptureWorker(self, slot)
+        self._slot, self._worker = slot, worker
+        worker.start()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration if duration is not None else None
+        try:
+            while self._streaming:
+                if deadline is None:
+                    frame_bytes = await slot.get()
+                else:
+                    # A static screen yields nothing: the deadline can't wait for a frame
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        frame_bytes = await asyncio.wait_for(slot.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if frame_bytes is None:
+                    break
                 yield frame_bytes
-                
-                await asyncio.sleep(interval)
-            except Exception as e:
-                logger.error(f"❌ Screen Capture Error: {e}")
-                await asyncio.sleep(interval) # Prevent rapid loop on error
+        finally:
+            worker.stop()
+
+    def select_monitor(self, index: int) -> bool:
+        """Capture a whole display (1 = primary, 2+ = others, 0 = all combined)"""
+        if not 0 <= index < len(self.monitors):
+            logger.warning(f"⚠️ No monitor {index} (have {len(self.monitors) - 1})")
+            return False
+        self._set_target(CaptureTarget(monitor=index))
+        return True
+
+    def target_window(self, term: str = "") -> WindowInfo:
+        """Capture only one window's rect (by title, or the focused one); None if not found"""
+        registry = self.registry or get_window_registry()
+        self.registry = registry
+        window = resolve_window(registry, term)
+        if window is None:
+            logger.warning(f"⚠️ Vision: no window matching '{term or 'focused'}'")
+            return None
+        self._set_target(CaptureTarget(monitor_of(window.rect, self.monitors), window.hwnd, window.title))
+        return window
+
+    def _set_target(self, target: CaptureTarget):
+        self.target = target
+        self.differ.reset()  # Different pixels entirely: start from a keyframe
+        logger.info(f"🎯 Vision target: {target.describe()}")
+
+    def _region(self, monitors) -> dict:
+        return region_for(self.target, monitors, self.registry)
 
     def _process_image(self, sct_img):
-        # Convert to PIL Image
-        img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-        
-        # Improved Resizing: Use LANCZOS for better text readability
-        img.thumbnail((1280, 1280), Image.Resampling.LANCZOS)
-        
-        # Convert to JPEG bytes (Higher Quality for Text)
-        img_byte_arr = io.BytesIO()
-        img.save(img_byte_arr, format='JPEG', quality=85)
-        return img_byte_arr.getvalue()
+        # Diff on the raw BGRA buffer before paying for conversion and JPEG (no copy: a view)
+        bgra = np.frombuffer(sct_img.raw, dtype=np.uint8).reshape(sct_img.height, sct_img.width, 4)
+        delta = self.differ.analyze(bgra)
+        if delta.kind == SKIP:
+            self.stats.record(SKIP)
+            self._apply_controller(SKIP)
+            return None
+
+        if delta.kind == REGION:
+            # Only the dirty area, at native resolution (sharper text than a downscaled full frame)
+            left, top, right, bottom = delta.box
+            bgra = bgra[top:bottom, left:right]
+
+        frame_bytes = self.encoder.encode(bgra)
+        self.stats.record(delta.kind, len(frame_bytes))
+        self._apply_controller(delta.kind, len(frame_bytes))
+        return frame_bytes
+
+    def _apply_controller(self, kind: str = None, size: int = 0):
+        if self.controller is None:
+            return
+        if kind is not None:
+            self.controller.on_frame(kind, size)
+        self.interval = self.controller.interval
+        self.encoder.quality = self.controller.quality
+        self.encoder.max_side = self.controller.max_side
+
+    def wake(self):
+        """Capture the next frame now instead of waiting out the interval"""
+        if self._worker is not None:
+            self._worker.wake()
 
     def stop_capture(self):
+        if self._streaming:
+            summary = self.stats.summary()
+            if self._slot is not None:
+                summary["dropped_stale"] = self._slot.dropped
+            if self.controller is not None:
+                summary.update(self.controller.metrics())
+            logger.info(f"📊 Vision stats: {summary}")
         self._streaming = False
+        if self._worker is not None:
+            self._worker.stop()
+            self._slot.close()
+            self._worker = None
         logger.info("🙈 Vision Stopped.")